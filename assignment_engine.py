@@ -0,0 +1,626 @@
+# assignment_engine.py
+"""
+Matrix scoring engine for batch task assignment (task_assignment_service.py).
+
+Employees and tasks are encoded once as skill incidence matrices (rows are
+employees / tasks, columns the skill_vocabulary ids employees have, so case
+and aliases do not matter), so the number of matching skills for every
+task x employee pair is one matrix multiply. The
+custom_score weights are applied to whole blocks of pairs, the model is asked
+once per distinct (task kind, match count) for every distinct employee
+profile instead of once per task, and each task's winner is an argmax over
+its row.
+
+Scores are the same as the per-task DataFrame loop this replaces:
+
+    custom_score = 0.7 * skill_match% / 100 + 0.2 * success_rate / 100
+                   + 0.1 * experience / 10
+    x 0.8 while the employee already got more than 3 tasks in this batch
+    final_score  = 0.7 * custom_score + 0.3 * max(model.predict_proba)
+
+Tasks are still assigned greedily in input order (the workload penalty
+depends on earlier assignments); ties go to the first employee in input
+order.
+
+assign_tasks_optimal instead solves the whole batch at once as a min-cost
+matching with per-employee capacity and priority weights, so early tasks no
+longer take the best people from later, more important ones.
+"""
+
+from itertools import chain
+
+import numpy as np
+
+from feature_store import FeatureSnapshot
+from skill_vocabulary import VOCABULARY
+
+# Features the model may be trained on, besides the per-batch workload
+STATIC_FEATURES = ('complexity', 'priority', 'skill_match_percentage',
+                   'experience', 'success_rate', 'tasks_completed')
+CANDIDATE_COLUMNS = ('emp_id', 'name') + STATIC_FEATURES + ('current_workload',)
+
+WORKLOAD_PENALTY_ABOVE = 3
+WORKLOAD_PENALTY = 0.8
+
+# Task x employee cells scored per block (bounds memory for large batches)
+BLOCK_CELLS = 4_000_000
+# Optimal mode: per-employee task limit (main.py's 3-active-task rule), the
+# weight of each priority in the objective, and the edges kept per task
+MAX_ACTIVE_TASKS = 3
+DEFAULT_PRIORITY_WEIGHTS = {'Low': 1.0, 'Medium': 2.0, 'High': 3.0}
+OPTIMAL_CANDIDATES = 25
+
+# predict_proba rows x classes per call for scikit-learn models (one class per employee)
+PREDICT_CELLS = 20_000_000
+
+
+def level(value):
+    """Low/Medium/High -> 0/1/2 (anything else counts as High)"""
+    return 0 if value == "Low" else 1 if value == "Medium" else 2
+
+
+def has_model(model_data):
+    return bool(model_data and 'model' in model_data and model_data['model']
+                and 'feature_columns' in model_data)
+
+
+class EmployeeMatrix:
+    """Employees as arrays: skill incidence (E x S) plus numeric attributes.
+
+    employees is a list of employee dicts or a feature_store.FeatureSnapshot,
+    whose columns are used as they are.
+    """
+
+    def __init__(self, employees):
+        if isinstance(employees, FeatureSnapshot):
+            self.emp_ids = employees.emp_ids
+            self.names = employees.names
+            self.experience = np.frombuffer(employees.experience, dtype=np.int64).astype(float)
+            self.success_rate = np.frombuffer(employees.success_rate, dtype=float)
+            self.tasks_completed = np.frombuffer(employees.tasks_completed, dtype=np.int64).astype(float)
+            skill_ids = employees.skill_ids
+        else:
+            employees = [emp for emp in employees if isinstance(emp, dict) and 'emp_id' in emp]
+            self.emp_ids = [emp['emp_id'] for emp in employees]
+            self.names = [emp.get('name', '') for emp in employees]
+            self.experience = np.array([emp.get('experience', 0) for emp in employees], dtype=float)
+            self.success_rate = np.array([emp.get('success_rate', 0) for emp in employees], dtype=float)
+            self.tasks_completed = np.array([emp.get('tasks_completed', 0) for emp in employees], dtype=float)
+            skill_ids = [VOCABULARY.ids(emp.get('skills') if isinstance(emp.get('skills'), list) else [])
+                         for emp in employees]
+
+        # Workload is tracked per emp_id; duplicate rows share one slot
+        slots = {}
+        self.slot = np.array([slots.setdefault(emp_id, len(slots)) for emp_id in self.emp_ids], dtype=np.intp)
+        self.slot_count = len(slots)
+
+        # Columns are vocabulary ids of the skills at least one employee has
+        lengths = [len(ids) for ids in skill_ids]
+        flat = np.fromiter(chain.from_iterable(skill_ids), dtype=np.intp, count=sum(lengths))
+        columns, cols = np.unique(flat, return_inverse=True)
+        self.skill_columns = dict(zip(columns.tolist(), range(len(columns))))
+        self.skills = np.zeros((len(self.emp_ids), len(self.skill_columns)), dtype=np.float32)
+        self.skills[np.repeat(np.arange(len(self.emp_ids)), lengths), cols.reshape(-1)] = 1
+
+        # Employees with identical model features share one prediction;
+        # profile_rows holds the first employee row of each profile
+        attributes = np.column_stack([self.experience, self.success_rate, self.tasks_completed])
+        if len(self.emp_ids):
+            _, self.profile_rows, profile = np.unique(attributes, axis=0, return_index=True, return_inverse=True)
+            self.profile = profile.reshape(-1)
+        else:
+            self.profile_rows = self.profile = np.zeros(0, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.emp_ids)
+
+    def base_scores(self):
+        """Per-employee part of custom_score (success rate and experience terms)"""
+        return 0.2 * self.success_rate / 100, 0.1 * self.experience / 10
+
+
+class TaskMatrix:
+    """Valid (dict) tasks as arrays: skill incidence (T x S) against an EmployeeMatrix"""
+
+    def __init__(self, tasks, employee_matrix):
+        self.tasks = [task for task in tasks if isinstance(task, dict)]
+        self.task_ids = [task.get('task_id', 'unknown') for task in self.tasks]
+        self.complexity = np.array([level(task.get('complexity', '')) for task in self.tasks], dtype=np.intp)
+        self.priority = np.array([level(task.get('priority', '')) for task in self.tasks], dtype=np.intp)
+
+        # Denominator is the full required list; skills no employee has never match
+        columns = employee_matrix.skill_columns
+        self.required = np.zeros(len(self.tasks), dtype=np.intp)
+        rows, cols = [], []
+        for row, task in enumerate(self.tasks):
+            required = task.get('skills', [])
+            if not required:
+                continue
+            self.required[row] = len(required)
+            for skill_id in VOCABULARY.ids(required, add=False):
+                if skill_id in columns:
+                    rows.append(row)
+                    cols.append(columns[skill_id])
+        self.skills = np.zeros((len(self.tasks), len(columns)), dtype=np.float32)
+        self.skills[rows, cols] = 1
+        self.width = int(self.required.max()) + 1 if len(self.tasks) else 1
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+class PredictionCache:
+    """Model scores per (task kind, match count) x employee profile, shared by the blocks of one batch.
+
+    A combo is ((complexity * 3 + priority) * width + required) * width +
+    matched, with width from the batch's TaskMatrix. table has one row of
+    scores (one column per employee profile) per model input key; combos
+    the model cannot tell apart share a key and so a row.
+    """
+
+    def __init__(self, width, profiles):
+        self.width = width
+        self.row = np.full(9 * width * width, -1, dtype=np.intp)   # combo -> row of table, -1 if not predicted
+        self.key_rows = {}                                         # model input key -> row of table
+        self.table = np.zeros((0, profiles))
+
+    def missing(self, combos):
+        """Distinct combos with at least one matching skill among combos that have no scores yet"""
+        seen = np.zeros(len(self.row), dtype=bool)
+        seen[combos] = True
+        present = np.flatnonzero(seen)
+        return present[(self.row[present] < 0) & (present % self.width > 0)]
+
+    def lookup(self, task_parts, matches, profiles):
+        """Scores of task rows x employees, 0 where nothing matches.
+
+        task_parts is each task's combo without the matched count, matches
+        the matched counts and profiles each employee's profile; every combo
+        they form must have been predicted.
+        """
+        parts, inverse = np.unique(task_parts, return_inverse=True)
+        # parts x matched count x profile
+        scores = self.table[self.row[parts[:, None] + np.arange(self.width)]]
+        scores[:, 0] = 0
+        index = (inverse.reshape(-1, 1) * self.width + matches) * scores.shape[2] + profiles
+        return scores.reshape(-1).take(index)
+
+    def add(self, keys, scores):
+        """scores: one row per key, one column per profile"""
+        self.key_rows.update(zip(keys, range(len(self.table), len(self.table) + len(keys))))
+        self.table = np.vstack([self.table, scores])
+
+
+class ScoreBlock:
+    """Scores of tasks [start, stop) against every employee"""
+
+    def __init__(self, start, matches, skill_match, custom, model_scores):
+        self.start = start
+        self.matches = matches            # matching skill counts (int)
+        self.skill_match = skill_match    # skill_match_percentage
+        self.custom = custom              # custom_score before the workload penalty
+        self.model_scores = model_scores  # max predict_proba, None if not available
+
+
+class ScoringEngine:
+    """Scores task blocks against one employee set with one model"""
+
+    def __init__(self, employees, model_data=None, block_cells=BLOCK_CELLS):
+        self.employees = EmployeeMatrix(employees)
+        self.model_data = model_data
+        self.block_cells = block_cells
+        self.use_model = has_model(model_data)
+        self.feature_columns = list(model_data['feature_columns']) if self.use_model else []
+        self.columns_exist = all(col in CANDIDATE_COLUMNS for col in self.feature_columns)
+        # A model trained on current_workload has to be asked task by task
+        self.dynamic_model = 'current_workload' in self.feature_columns
+        self._success_term, self._experience_term = self.employees.base_scores()
+        self._split_points = {}
+
+    def blocks(self, task_matrix):
+        """Yield ScoreBlocks covering every task in task_matrix"""
+        size = max(1, self.block_cells // max(1, len(self.employees)))
+        cache = self.prediction_cache(task_matrix)
+        for start in range(0, len(task_matrix), size):
+            yield self.score_block(task_matrix, start, min(len(task_matrix), start + size), cache)
+
+    def score_block(self, task_matrix, start, stop, cache=None):
+        matches = np.rint(task_matrix.skills[start:stop] @ self.employees.skills.T).astype(np.intp)
+        required = task_matrix.required[start:stop, None]
+        # Tasks without required skills have no matches (0 / 1)
+        skill_match = matches / np.maximum(required, 1) * 100
+        custom = 0.7 * skill_match / 100 + self._success_term + self._experience_term
+
+        model_scores = None
+        if self.use_model and self.columns_exist and not self.dynamic_model:
+            model_scores = self._predict_block(task_matrix, start, matches,
+                                               cache if cache is not None else self.prediction_cache(task_matrix))
+        return ScoreBlock(start, matches, skill_match, custom, model_scores)
+
+    def prediction_cache(self, task_matrix):
+        return PredictionCache(task_matrix.width, len(self.employees.profile_rows))
+
+    def feature_frame(self, complexity, priority, emp_rows, skill_match, workload=None):
+        """Model input for (task, employee) pairs: rows x feature_columns array"""
+        employees = self.employees
+        values = {
+            'complexity': lambda: complexity,
+            'priority': lambda: priority,
+            'skill_match_percentage': lambda: skill_match,
+            'experience': lambda: employees.experience[emp_rows],
+            'success_rate': lambda: employees.success_rate[emp_rows],
+            'tasks_completed': lambda: employees.tasks_completed[emp_rows],
+            'current_workload': lambda: workload,
+        }
+        return np.column_stack([np.asarray(values[col](), dtype=float) for col in self.feature_columns])
+
+    def predict(self, features):
+        """max(predict_proba) per row, None (after logging) if the model fails.
+
+        Compact models (compact_model.py) compute the maximum directly, in
+        one call for all rows; scikit-learn models are asked for the
+        probabilities in chunks, with a DataFrame of the same column names
+        when they were fitted on one.
+        """
+        model = self.model_data['model']
+        step = max(1, PREDICT_CELLS // max(1, len(getattr(model, 'classes_', ()))))
+        try:
+            if hasattr(model, 'max_proba'):
+                return model.max_proba(features)
+            if hasattr(model, 'feature_names_in_'):
+                import pandas as pd
+                features = pd.DataFrame(features, columns=self.feature_columns)
+            return np.concatenate([np.max(model.predict_proba(features[start:start + step]), axis=1)
+                                   for start in range(0, len(features), step)])
+        except Exception as e:
+            print(f"Model prediction error: {str(e)}")
+            return None
+
+    def _predict_block(self, task_matrix, start, matches, cache):
+        # Every (task kind, required, matched) combo is predicted once per batch, for all
+        # employee profiles in one model call; earlier blocks' combos are reused.
+        # Pairs without a matching skill score 0.
+        width = cache.width
+        stop = start + matches.shape[0]
+        task_part = ((task_matrix.complexity[start:stop] * 3 + task_matrix.priority[start:stop]) * width
+                     + task_matrix.required[start:stop]) * width
+        combos = task_part[:, None] + matches
+        new = cache.missing(combos)
+        if len(new) and not self._predict_combos(cache, new):
+            return None
+        if not len(cache.table):
+            return np.zeros(matches.shape)
+        return cache.lookup(task_part, matches, self.employees.profile)
+
+    def _predict_combos(self, cache, combos):
+        """Score new combos against every profile into cache; False if the model failed"""
+        width = cache.width
+        matched, required, kind = combos % width, combos // width % width, combos // (width * width)
+        task_features = {'complexity': kind // 3, 'priority': kind % 3,
+                         'skill_match_percentage': matched / np.maximum(required, 1) * 100}
+        # Combos on the same side of every split of the model give the same prediction
+        keys = [tuple(key) for key in np.column_stack([self.split_bins(name, values)
+                                                       for name, values in task_features.items()]).tolist()]
+        fresh = {}
+        for position, key in enumerate(keys):
+            if key not in cache.key_rows:
+                fresh.setdefault(key, position)
+
+        if fresh:
+            profiles = len(self.employees.profile_rows)
+            new = list(fresh.values())
+            predicted = self.predict(self.feature_frame(
+                *[np.repeat(task_features[name][new], profiles) for name in ('complexity', 'priority')],
+                np.tile(self.employees.profile_rows, len(new)),
+                np.repeat(task_features['skill_match_percentage'][new], profiles)))
+            if predicted is None:
+                return False
+            cache.add(list(fresh), predicted.reshape(len(new), profiles))
+        cache.row[combos] = [cache.key_rows[key] for key in keys]
+        return True
+
+    def split_bins(self, name, values):
+        """Interval between the model's split points on feature name each value falls in.
+
+        Only tree models (compact_model.CompactForest) have split points;
+        for other models the values are returned as they are.
+        """
+        split_points = getattr(self.model_data['model'], 'split_points', None)
+        if split_points is None:
+            return values
+        if name not in self.feature_columns:
+            return np.zeros(len(values))
+        if name not in self._split_points:
+            self._split_points[name] = split_points(name)
+        points = self._split_points[name]
+        # Compared as float32, like the trees do; NaN gets its own interval
+        bins = np.searchsorted(points, np.asarray(values, dtype=np.float32).astype(float), side='left')
+        return np.where(np.isnan(values), len(points) + 1, bins)
+
+    def _predict_row(self, task_matrix, block, row, current):
+        candidates = np.flatnonzero(block.matches[row])
+        task = block.start + row
+        predicted = self.predict(self.feature_frame(
+            np.full(len(candidates), task_matrix.complexity[task]),
+            np.full(len(candidates), task_matrix.priority[task]),
+            candidates, block.skill_match[row, candidates], current[candidates]))
+        if predicted is None:
+            return None
+        scores = np.zeros(len(self.employees))
+        scores[candidates] = predicted
+        return scores
+
+    def final_scores(self, task_matrix, block, row, workload):
+        """final_score of one task row against every employee, given the batch workload so far"""
+        if not self.use_model:
+            return block.custom[row]
+        if not self.columns_exist:
+            print(f"Not all columns exist for model: {self.feature_columns}")
+            return block.skill_match[row] / 100
+
+        custom = block.custom[row].copy()
+        current = workload[self.employees.slot]
+        custom[current > WORKLOAD_PENALTY_ABOVE] *= WORKLOAD_PENALTY
+
+        if self.dynamic_model:
+            model_scores = self._predict_row(task_matrix, block, row, current)
+        else:
+            model_scores = block.model_scores[row] if block.model_scores is not None else None
+        if model_scores is None:
+            return custom
+        return 0.7 * custom + 0.3 * model_scores
+
+    def static_scores(self, task_matrix, block):
+        """final_score of every pair in block, without the batch workload penalty"""
+        if not self.use_model:
+            return block.custom
+        if not self.columns_exist:
+            print(f"Not all columns exist for model: {self.feature_columns}")
+            return block.skill_match / 100
+        if self.dynamic_model:
+            idle = np.zeros(self.employees.slot_count, dtype=np.intp)
+            return np.array([self.final_scores(task_matrix, block, row, idle)
+                             for row in range(block.matches.shape[0])])
+        if block.model_scores is None:
+            return block.custom
+        return 0.7 * block.custom + 0.3 * block.model_scores
+
+    def greedy_choices(self, task_matrix):
+        """Yield (block, row, best employee row or None, scores) for each task in input order"""
+        workload = np.zeros(self.employees.slot_count, dtype=np.intp)
+        for block in self.blocks(task_matrix):
+            yield from self.greedy_block(task_matrix, block, workload)
+
+    def greedy_block(self, task_matrix, block, workload):
+        """Greedy choices for one block; workload (per emp slot) carries over between blocks"""
+        for row in range(block.matches.shape[0]):
+            eligible = block.matches[row] > 0
+            if not eligible.any():
+                yield block, row, None, None
+                continue
+
+            scores = self.final_scores(task_matrix, block, row, workload)
+            best = int(np.argmax(np.where(eligible & ~np.isnan(scores), scores, -np.inf)))
+            if not eligible[best] or np.isnan(scores[best]):
+                # Only NaN scores left: the first eligible employee, as a sort would
+                best = int(np.flatnonzero(eligible)[0])
+            workload[self.employees.slot[best]] += 1
+            yield block, row, best, scores
+
+    def assignment(self, block, row, best, score):
+        return {
+            "emp_id": self.employees.emp_ids[best],
+            "name": self.employees.names[best],
+            "skill_match_percentage": f"{block.skill_match[row, best]:.1f}%",
+            "score": f"{score:.3f}"
+        }
+
+    def assign_greedy(self, tasks):
+        """Assign tasks in input order; returns {task_id: assignment or message}"""
+        task_matrix = TaskMatrix(tasks, self.employees)
+        results = {}
+        for block, row, best, scores in self.greedy_choices(task_matrix):
+            task_id = task_matrix.task_ids[block.start + row]
+            if best is None:
+                results[task_id] = "No eligible employees found for this task"
+            else:
+                results[task_id] = self.assignment(block, row, best, scores[best])
+        return results
+
+    def slot_scores(self, scores):
+        """Best score per emp_id (duplicate employee rows share a slot) and the row it comes from"""
+        employees = self.employees
+        rows = np.broadcast_to(np.arange(len(employees)), scores.shape)
+        if employees.slot_count == len(employees):
+            return scores, rows
+        best = np.full((scores.shape[0], employees.slot_count), -np.inf)
+        best_rows = np.zeros(best.shape, dtype=np.intp)
+        for col, slot in enumerate(employees.slot):
+            better = scores[:, col] > best[:, slot]
+            best[better, slot] = scores[better, col]
+            best_rows[better, slot] = col
+        return best, best_rows
+
+    @staticmethod
+    def candidate_pairs(scores, candidates):
+        """(task row, slot) pairs worth an edge: each task's best slots plus each slot's best tasks.
+
+        Task-side pruning alone would send every task to the same few
+        top-scoring employees; the slot side keeps everyone else reachable.
+        """
+        pairs = []
+        k = min(candidates, scores.shape[1])
+        if k:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            pairs.append(np.ravel(np.arange(scores.shape[0])[:, None] * scores.shape[1] + top))
+        k = min(candidates, scores.shape[0])
+        if k:
+            top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            pairs.append(np.ravel(top * scores.shape[1] + np.arange(scores.shape[1])))
+        pairs = np.unique(np.concatenate(pairs)) if pairs else np.zeros(0, dtype=np.intp)
+        task_rows, slots = np.divmod(pairs, scores.shape[1])
+        keep = np.isfinite(scores[task_rows, slots])
+        return task_rows[keep], slots[keep]
+
+    def assign_optimal(self, tasks, capacities=None, priority_weights=None,
+                       candidates=OPTIMAL_CANDIDATES):
+        """Assign the whole batch at once, maximising the priority-weighted total score.
+
+        Each emp_id takes at most capacities.get(emp_id, MAX_ACTIVE_TASKS)
+        tasks. Solved as a min-cost bipartite matching between tasks and
+        employee capacity slots (scipy.sparse.csgraph). Every task also gets
+        a dummy slot worth 0, so tasks nobody has room for stay unassigned.
+        Pair scores are final_score without the workload penalty (capacity
+        replaces it). Only each task's best `candidates` employees and each
+        employee's best `candidates` tasks per block get edges, which bounds
+        the graph (and the solve time) for batches of thousands of tasks.
+
+        Returns ({task_id: assignment or message}, summary); the summary
+        compares the total with the greedy assignment of the same batch.
+        """
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+        employees = self.employees
+        task_matrix = TaskMatrix(tasks, employees)
+        weights = dict(DEFAULT_PRIORITY_WEIGHTS, **(priority_weights or {}))
+        task_weights = np.array([weights['Low'], weights['Medium'], weights['High']],
+                                dtype=float)[task_matrix.priority]
+        capacities = capacities or {}
+        capacity = np.zeros(employees.slot_count, dtype=np.intp)
+        capacity[employees.slot] = [max(0, int(capacities.get(emp_id, MAX_ACTIVE_TASKS)))
+                                    for emp_id in employees.emp_ids]
+
+        # Candidate edges: (task, emp slot, score, employee row, skill match).
+        # The greedy baseline is scored on the same blocks.
+        edges = {'task': [], 'slot': [], 'score': [], 'row': [], 'match': []}
+        eligible_tasks = np.zeros(len(task_matrix), dtype=bool)
+        workload = np.zeros(employees.slot_count, dtype=np.intp)
+        greedy_total = greedy_within_capacity = 0.0
+        for block in self.blocks(task_matrix):
+            static = self.static_scores(task_matrix, block)
+            for _, row, best, _ in self.greedy_block(task_matrix, block, workload):
+                if best is not None:
+                    value = static[row, best] * task_weights[block.start + row]
+                    greedy_total += value
+                    if workload[employees.slot[best]] <= capacity[employees.slot[best]]:
+                        greedy_within_capacity += value
+
+            scores = np.where((block.matches > 0) & ~np.isnan(static), static, -np.inf)
+            eligible_tasks[block.start:block.start + len(scores)] = np.isfinite(scores).any(axis=1)
+            scores, rows = self.slot_scores(scores)
+            scores[:, capacity == 0] = -np.inf
+
+            task_rows, slots = self.candidate_pairs(scores, candidates)
+            emp_rows = rows[task_rows, slots]
+            edges['task'].append(block.start + task_rows)
+            edges['slot'].append(slots)
+            edges['score'].append(scores[task_rows, slots])
+            edges['row'].append(emp_rows)
+            edges['match'].append(block.skill_match[task_rows, emp_rows])
+
+        edge_tasks, edge_slots, edge_scores, edge_rows, edge_match = (
+            np.concatenate(edges[key]) if edges[key] else np.zeros(0, dtype=np.intp)
+            for key in ('task', 'slot', 'score', 'row', 'match'))
+        edge_values = edge_scores * task_weights[edge_tasks]
+
+        # One column per free capacity slot, then one dummy column per task
+        offsets = np.concatenate([[0], np.cumsum(capacity)])
+        repeats = capacity[edge_slots]
+        expanded = np.repeat(np.arange(len(edge_tasks)), repeats)
+        within = np.arange(len(expanded)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        slot_columns = offsets[edge_slots][expanded] + within
+
+        task_count = len(task_matrix)
+        ceiling = (edge_values.max() if len(edge_values) else 0) + 1
+        graph = csr_matrix(
+            (np.concatenate([ceiling - edge_values[expanded], np.full(task_count, ceiling)]),
+             (np.concatenate([edge_tasks[expanded], np.arange(task_count)]),
+              np.concatenate([slot_columns, offsets[-1] + np.arange(task_count)]))),
+            shape=(task_count, int(offsets[-1]) + task_count))
+        task_index, columns = min_weight_full_bipartite_matching(graph) if task_count else ([], [])
+
+        # Matched column -> capacity slot -> the edge for that (task, slot)
+        task_index, columns = np.asarray(task_index, dtype=np.intp), np.asarray(columns, dtype=np.intp)
+        matched = columns < offsets[-1]
+        column_slots = np.repeat(np.arange(employees.slot_count), capacity)
+        edge_keys = edge_tasks * employees.slot_count + edge_slots
+        order = np.argsort(edge_keys)
+        wanted = task_index[matched] * employees.slot_count + column_slots[columns[matched]]
+        chosen = order[np.searchsorted(edge_keys, wanted, sorter=order)]
+        total = edge_values[chosen].sum()
+
+        edge_of_task = np.full(task_count, -1, dtype=np.intp)
+        edge_of_task[task_index[matched]] = chosen
+
+        results = {}
+        for task, edge in enumerate(edge_of_task.tolist()):
+            task_id = task_matrix.task_ids[task]
+            if edge < 0:
+                results[task_id] = ("No employee with free capacity for this task" if eligible_tasks[task]
+                                    else "No eligible employees found for this task")
+                continue
+            emp_row = edge_rows[edge]
+            results[task_id] = {
+                "emp_id": employees.emp_ids[emp_row],
+                "name": employees.names[emp_row],
+                "skill_match_percentage": f"{edge_match[edge]:.1f}%",
+                "score": f"{edge_scores[edge]:.3f}"
+            }
+
+        summary = {
+            'total_score': round(float(total), 4),
+            'assigned': sum(1 for result in results.values() if isinstance(result, dict)),
+            'greedy_total_score': round(float(greedy_total), 4),
+            'greedy_assigned': int(workload.sum()),
+            # Greedy mode does not enforce capacity: its total counts tasks
+            # beyond an employee's limit, the within-capacity total does not
+            'greedy_over_capacity': int(np.maximum(workload - capacity, 0).sum()),
+            'greedy_within_capacity_score': round(float(greedy_within_capacity), 4),
+            'candidates_per_task': candidates,
+        }
+        return results, summary
+
+
+def assign_tasks_ml(tasks, employees, model_data):
+    """Assign tasks to employees using ML model"""
+    if not employees or not isinstance(employees, (list, FeatureSnapshot)):
+        print(f"Error: Invalid employees data: {type(employees)}")
+        return {"error": "Invalid employees data"}
+
+    if not tasks or not isinstance(tasks, list):
+        print(f"Error: Invalid tasks data: {type(tasks)}")
+        return {"error": "Invalid tasks data"}
+
+    assignments = {}
+    for task in tasks:
+        if not isinstance(task, dict):
+            print(f"Error: Task is not a dictionary: {task}")
+            assignments[str(task)] = "Invalid task format"
+
+    assignments.update(ScoringEngine(employees, model_data).assign_greedy(tasks))
+    return assignments
+
+
+def assign_tasks_optimal(tasks, employees, model_data, capacities=None, priority_weights=None):
+    """Assign a batch of tasks as one optimisation problem (see ScoringEngine.assign_optimal).
+
+    Returns (assignments, summary), or ({"error": ...}, None) for invalid input.
+    """
+    if not employees or not isinstance(employees, (list, FeatureSnapshot)):
+        print(f"Error: Invalid employees data: {type(employees)}")
+        return {"error": "Invalid employees data"}, None
+
+    if not tasks or not isinstance(tasks, list):
+        print(f"Error: Invalid tasks data: {type(tasks)}")
+        return {"error": "Invalid tasks data"}, None
+
+    assignments = {}
+    for task in tasks:
+        if not isinstance(task, dict):
+            print(f"Error: Task is not a dictionary: {task}")
+            assignments[str(task)] = "Invalid task format"
+
+    results, summary = ScoringEngine(employees, model_data).assign_optimal(tasks, capacities, priority_weights)
+    assignments.update(results)
+    return assignments, summary
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Batch assignment benchmark: matrix scoring engine vs. the per-task DataFrame loop
+
+Generates N employees and M tasks drawn from the service's PROJECT_TYPES
+skills, times assignment_engine.assign_tasks_ml on the whole batch, and
+times the previous loop (kept in test_assignment_engine.py) on the first
+--reference-tasks tasks only, since it takes seconds per hundred tasks.
+Both are checked to give the same assignments on that prefix.
+
+With --with-model the engine is timed with the model as the service serves
+it (compact_model.export_model_data, as the registry's serving.pkl); the
+scikit-learn model is timed as well, for reference only.
+
+Usage:
+    python benchmark_assignment_engine.py --employees 2000 --tasks 5000
+    python benchmark_assignment_engine.py --with-model
+    python benchmark_assignment_engine.py --optimal   # also time mode=optimal
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from assignment_engine import assign_tasks_ml, assign_tasks_optimal
+from compact_model import export_model_data
+from project_types import PROJECT_TYPES
+from test_assignment_engine import reference_assign_tasks_ml, train_model
+
+# Project types the generated employees and tasks are drawn from (a fixed subset, so batches stay comparable)
+BENCHMARK_PROJECT_TYPES = ('website_development', 'machine_learning', 'data_engineering', 'devops')
+PROJECT_SKILLS = {project_type: PROJECT_TYPES[project_type] for project_type in BENCHMARK_PROJECT_TYPES}
+LEVELS = ['Low', 'Medium', 'High']
+
+
+def make_batch(employee_count, task_count, rng):
+    employees = []
+    for i in range(employee_count):
+        types = rng.sample(list(PROJECT_SKILLS), 2 if rng.random() < 0.3 else 1)
+        skills = sorted({skill for t in types for skill in rng.sample(PROJECT_SKILLS[t], rng.randint(2, 6))})
+        employees.append({'emp_id': f'EMP{i:05d}', 'name': f'Employee {i}', 'skills': skills,
+                          'experience': rng.randint(0, 15), 'success_rate': rng.choice([0, 60.0, 80.0, 95.0]),
+                          'tasks_completed': rng.randint(0, 40)})
+    tasks = []
+    for i in range(task_count):
+        project_type = rng.choice(list(PROJECT_SKILLS))
+        tasks.append({'task_id': f'TASK{i:05d}', 'project_type': project_type,
+                      'skills': rng.sample(PROJECT_SKILLS[project_type], rng.randint(2, 4)),
+                      'complexity': rng.choice(LEVELS), 'priority': rng.choice(LEVELS)})
+    return employees, tasks
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch assignment benchmark')
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--reference-tasks', type=int, default=50,
+                        help='Tasks timed with the previous per-task loop')
+    parser.add_argument('--with-model', action='store_true',
+                        help='Score with a RandomForest (10 trees) instead of the fallback weights')
+    parser.add_argument('--optimal', action='store_true',
+                        help='Also solve the batch with assign_tasks_optimal (capacity 3 per employee)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    employees, tasks = make_batch(args.employees, args.tasks, rng)
+    model_data = served = None
+    if args.with_model:
+        model_data = train_model(employees, ['complexity', 'priority', 'skill_match_percentage',
+                                             'experience', 'success_rate', 'tasks_completed'])
+        served = export_model_data(model_data)
+
+    assignments, engine_s = timed(assign_tasks_ml, tasks, employees, served)
+    prefix = tasks[:args.reference_tasks]
+    expected, reference_s = timed(reference_assign_tasks_ml, prefix, employees, model_data)
+    assert assign_tasks_ml(prefix, employees, served) == expected
+
+    reference_per_task_ms = reference_s * 1000 / max(1, len(prefix))
+    result = {
+        'employees': args.employees,
+        'tasks': args.tasks,
+        'with_model': args.with_model,
+        'assigned': sum(1 for a in assignments.values() if isinstance(a, dict)),
+        'engine_total_ms': round(engine_s * 1000, 1),
+        'engine_per_task_ms': round(engine_s * 1000 / args.tasks, 4),
+        'reference_tasks': len(prefix),
+        'reference_per_task_ms': round(reference_per_task_ms, 2),
+        'reference_estimated_total_s': round(reference_per_task_ms * args.tasks / 1000, 1),
+    }
+    if args.with_model:
+        sklearn_assignments, sklearn_s = timed(assign_tasks_ml, tasks, employees, model_data)
+        assert sklearn_assignments == assignments
+        result['engine_sklearn_total_ms'] = round(sklearn_s * 1000, 1)
+    if args.optimal:
+        (_, summary), optimal_s = timed(assign_tasks_optimal, tasks, employees, served)
+        result['optimal_total_ms'] = round(optimal_s * 1000, 1)
+        result['optimal_summary'] = summary
+    print(f"engine    {result['engine_total_ms']}ms for {args.tasks} tasks x {args.employees} employees")
+    if args.with_model:
+        print(f"sklearn   {result['engine_sklearn_total_ms']}ms with the unexported model (reference)")
+    print(f"reference {result['reference_per_task_ms']}ms per task "
+          f"(~{result['reference_estimated_total_s']}s for the batch)")
+    if args.optimal:
+        summary = result['optimal_summary']
+        print(f"optimal   {result['optimal_total_ms']}ms: total {summary['total_score']}, "
+              f"greedy {summary['greedy_total_score']} ({summary['greedy_over_capacity']} over capacity, "
+              f"{summary['greedy_within_capacity_score']} within)")
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Model training benchmark: vectorized synthetic history and parallel fit
+
+For each employee count (default 1k, 5k and 20k) this generates employees
+from the service's PROJECT_TYPES skills and 5 synthetic tasks per project
+type (like create_synthetic_tasks), then times:
+
+- training_data.synthetic_history (incidence matrices)
+- the previous nested iterrows() loop (kept in test_training_data.py), up to
+  --reference-max employees since it grows as tasks x employees in Python
+- RandomForestClassifier.fit on the generated rows with n_jobs=1 and
+  n_jobs=-1, up to --fit-max-employees. There is one class per employee and
+  every tree node stores a value per class, so 100 trees at 1k employees
+  already need about 3.5GB; larger counts only time the history.
+
+Usage:
+    python benchmark_model_training.py
+    python benchmark_model_training.py --employees 1000 5000 --trees 100
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_assignment_engine import PROJECT_SKILLS, LEVELS, make_batch
+from test_training_data import reference_history
+from training_data import FEATURE_COLUMNS, synthetic_history
+
+
+def make_tasks(rng):
+    tasks = []
+    for project_type, skills in PROJECT_SKILLS.items():
+        for _ in range(5):
+            tasks.append({'task_id': f'TASK{1000 + len(tasks)}', 'project_type': project_type,
+                          'skills': rng.sample(skills, rng.randint(2, 4)),
+                          'complexity': rng.choice(LEVELS), 'priority': rng.choice(LEVELS)})
+    return pd.DataFrame(tasks)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def fit(history, trees, n_jobs):
+    X_train, _, y_train, _ = train_test_split(history[FEATURE_COLUMNS], history['emp_id'],
+                                              test_size=0.2, random_state=42)
+    model = RandomForestClassifier(n_estimators=trees, random_state=42, n_jobs=n_jobs)
+    model.fit(X_train, y_train)
+    return model
+
+
+def run(employee_count, args):
+    rng = random.Random(args.seed)
+    employees, _ = make_batch(employee_count, 0, rng)
+    employees_df = pd.DataFrame(employees)
+    tasks_df = make_tasks(rng)
+
+    history, vectorized_s = timed(synthetic_history, employees_df, tasks_df)
+    result = {
+        'employees': employee_count,
+        'tasks': len(tasks_df),
+        'rows': len(history),
+        'vectorized_history_ms': round(vectorized_s * 1000, 1),
+    }
+    if employee_count <= args.reference_max:
+        expected, reference_s = timed(reference_history, employees_df, tasks_df)
+        pd.testing.assert_frame_equal(history, expected[list(history.columns)], check_dtype=False)
+        result['reference_history_ms'] = round(reference_s * 1000, 1)
+        result['history_speedup'] = round(reference_s / max(vectorized_s, 1e-9), 1)
+    if employee_count <= args.fit_max_employees:
+        # One forest in memory at a time: each stores a value per class in every node
+        sample = history[FEATURE_COLUMNS].iloc[:200]
+        serial, serial_s = timed(fit, history, args.trees, 1)
+        expected = serial.predict_proba(sample)
+        del serial
+        parallel, parallel_s = timed(fit, history, args.trees, -1)
+        assert np.array_equal(parallel.predict_proba(sample), expected)
+        del parallel
+        result.update(trees=args.trees, cores=os.cpu_count(),
+                      fit_serial_s=round(serial_s, 2), fit_parallel_s=round(parallel_s, 2))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Model training benchmark')
+    parser.add_argument('--employees', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--reference-max', type=int, default=20000,
+                        help='Largest employee count timed with the previous iterrows loop')
+    parser.add_argument('--fit-max-employees', type=int, default=1000,
+                        help='Largest employee count the RandomForest is fitted for')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    results = []
+    for employee_count in args.employees:
+        result = run(employee_count, args)
+        results.append(result)
+        line = (f"{employee_count:>6} employees: {result['rows']} rows, "
+                f"history {result['vectorized_history_ms']}ms")
+        if 'reference_history_ms' in result:
+            line += f" (iterrows {result['reference_history_ms']}ms, {result['history_speedup']}x)"
+        if 'fit_parallel_s' in result:
+            line += (f", fit {result['fit_serial_s']}s on 1 core / "
+                     f"{result['fit_parallel_s']}s on {result['cores']}")
+        print(line)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Recommender benchmark: both recommenders on synthetic rosters, in-process
+
+For each roster size (default 100, 1k, 10k and 50k developers) this
+generates developers whose skills are drawn from the project type skill
+tables (earlier skills of a type are more common, about a third of the
+developers span two types) plus a batch of tasks, then times:
+
+- main.get_task_assignment_recommendation against a scratch copy of
+  task_manager.db (schema only, TASK_MANAGER_DB points main.py at it) seeded
+  with the roster and some active tasks; "cold" clears the recommendation
+  cache before every call, "cached" repeats the same tasks
+- assignment_engine.assign_tasks_ml on the whole task batch, without a model
+  (from employee dicts, and from main.py's feature store snapshot) and (up to --model-max-developers) with the model built below, both as
+  scikit-learn and as its compact_model export
+- training_data.build_assignment_model, up to --model-max-developers since
+  the forest has one class per developer (100 trees at 1k developers need
+  about 3.5GB)
+
+Latencies are p50/p95 over the timed runs. Peak memory is measured in one
+extra run of each under tracemalloc (Python and NumPy allocations), so the
+tracing overhead does not show in the timings. scikit-learn allocates the
+tree nodes outside tracemalloc, so each roster also reports the process's
+max RSS so far. The recommender's own log lines are discarded; the JSON
+report goes to stdout and, with --output, to a file to compare runs.
+
+Usage:
+    python benchmark_recommenders.py
+    python benchmark_recommenders.py --developers 1000 10000 --output before.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import contextlib
+import resource
+import platform
+import statistics
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from benchmark_assignment_engine import PROJECT_SKILLS, LEVELS
+from benchmark_skill_index import percentile
+from migrations import get_engine, upgrade
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'task_manager.db')
+ACTIVE_TASKS_PER_DEVELOPER = [0, 0, 0, 1, 1, 2, 3]  # drawn uniformly; 3 means at the limit
+
+
+def skill_weights(skills):
+    """Zipf-like popularity: the n-th skill of a type is picked with weight 1/n"""
+    return [1 / (rank + 1) for rank in range(len(skills))]
+
+
+def weighted_sample(rng, skills, count):
+    chosen = []
+    remaining = list(skills)
+    weights = skill_weights(remaining)
+    for _ in range(min(count, len(remaining))):
+        index = rng.choices(range(len(remaining)), weights=weights)[0]
+        chosen.append(remaining.pop(index))
+        weights.pop(index)
+    return chosen
+
+
+def make_roster(count, catalogue, rng):
+    developers = []
+    for i in range(count):
+        types = rng.sample(list(catalogue), 2 if rng.random() < 0.3 else 1)
+        skills = sorted({skill for t in types for skill in weighted_sample(rng, catalogue[t], rng.randint(2, 6))})
+        experience = min(int(rng.expovariate(1 / 4)), 25)
+        tasks_completed = rng.randint(0, experience * 4)
+        developers.append({'emp_id': f'BENCH{i:05d}', 'name': f'Bench Developer {i}', 'skills': skills,
+                           'experience': experience, 'tasks_completed': tasks_completed,
+                           'success_rate': round(rng.uniform(40, 100), 1) if tasks_completed else 0.0})
+    return developers
+
+
+def make_tasks(count, catalogue, rng):
+    tasks = []
+    for i in range(count):
+        project_type = rng.choice(list(catalogue))
+        tasks.append({'task_id': f'BENCHTASK{i:05d}', 'project_type': project_type,
+                      'skills': weighted_sample(rng, catalogue[project_type], rng.randint(2, 4)),
+                      'complexity': rng.choice(LEVELS), 'priority': rng.choice(LEVELS)})
+    return tasks
+
+
+def make_training_tasks(catalogue, rng):
+    """5 tasks per project type, like the service's create_synthetic_tasks"""
+    return pd.DataFrame(make_tasks(5 * len(catalogue), catalogue, rng))
+
+
+def scratch_database(directory):
+    """Copy task_manager.db's schema, with no data rows, and bring it up to date"""
+    path = os.path.join(directory, 'task_manager.db')
+    source = sqlite3.connect(SOURCE_DB)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target)
+        tables = [row[0] for row in target.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        for table in tables:
+            if table != 'schema_migrations':
+                target.execute(f'DELETE FROM "{table}"')
+        target.commit()
+    finally:
+        source.close()
+        target.close()
+    engine = get_engine(path)
+    upgrade(engine, verbose=False)
+    engine.dispose()
+    return path
+
+
+def timings_ms(func, runs, before=None):
+    """Run func `runs` times (calling before() untimed first) and return the durations"""
+    timings = []
+    for _ in range(runs):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def peak_mb(func, before=None):
+    """Peak traced allocation of one func() call, in MB"""
+    if before is not None:
+        before()
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def max_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def measure(func, runs, before=None):
+    timings = timings_ms(func, runs, before)
+    return {
+        'runs': runs,
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'peak_mb': peak_mb(func, before),
+    }
+
+
+def seed_database(main, developers, rng):
+    """Replace the scratch database's employees and tasks with the roster"""
+    from skill_vocabulary import canonical_skill
+    from workload import reconcile_workload
+    from recommendation_cache import ROSTER, WORKLOAD, bump_versions
+    from feature_store import refresh_features
+
+    now = datetime.utcnow()
+    with main.app.app_context():
+        with main.db.engine.begin() as conn:
+            for table in ('employee_skills', 'skills', 'employee_workload', 'tasks', 'employees'):
+                conn.execute(main.db.text(f'DELETE FROM {table}'))
+            conn.execute(main.db.text(
+                'INSERT INTO employees (emp_id, name, email, password_hash, is_first_login, role, created_at, '
+                'skills, experience, tasks_completed, success_rate) VALUES (:emp_id, :name, :email, '
+                "'benchmark', 0, 'developer', :now, :skills, :experience, :tasks_completed, :success_rate)"),
+                [{**developer, 'email': f"{developer['emp_id'].lower()}@example.com", 'now': now,
+                  'skills': json.dumps(developer['skills'])} for developer in developers])
+
+            skill_ids = {}
+            links = []
+            for developer in developers:
+                for name in developer['skills']:
+                    key = canonical_skill(name)
+                    if key not in skill_ids:
+                        skill_ids[key] = conn.execute(
+                            main.db.text('INSERT INTO skills (name, name_folded) VALUES (:name, :key)'),
+                            {'name': name, 'key': key}).lastrowid
+                    links.append({'emp_id': developer['emp_id'], 'skill_id': skill_ids[key]})
+            conn.execute(main.db.text('INSERT OR IGNORE INTO employee_skills (emp_id, skill_id) '
+                                      'VALUES (:emp_id, :skill_id)'), links)
+
+            active = []
+            for developer in developers:
+                for _ in range(rng.choice(ACTIVE_TASKS_PER_DEVELOPER)):
+                    active.append({'task_id': f'BENCHACTIVE{len(active):06d}', 'assigned_to': developer['emp_id'],
+                                   'status': rng.choice(['assigned', 'in_progress']), 'now': now})
+            if active:
+                conn.execute(main.db.text(
+                    'INSERT INTO tasks (task_id, title, project_type, complexity, priority, status, '
+                    "assigned_to, assigned_at, created_at) VALUES (:task_id, 'Benchmark task', "
+                    "'website_development', 'Medium', 'Medium', :status, :assigned_to, :now, :now)"), active)
+            reconcile_workload(conn)
+            bump_versions(conn, [ROSTER, WORKLOAD])
+            started = time.perf_counter()
+            refresh_features(conn)
+            feature_refresh_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        main.SKILL_INDEX.build(main.load_developer_skills())
+        index_build_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        main.sync_feature_store()
+        feature_sync_ms = (time.perf_counter() - started) * 1000
+        main.db.session.remove()
+    return {'active_tasks': len(active), 'skill_index_build_ms': round(index_build_ms, 1),
+            'feature_refresh_ms': round(feature_refresh_ms, 1), 'feature_store_sync_ms': round(feature_sync_ms, 1)}
+
+
+def bench_main_recommender(main, tasks, runs):
+    task_iter = iter([])
+
+    def next_task():
+        nonlocal task_iter
+        try:
+            return next(task_iter)
+        except StopIteration:
+            task_iter = iter(tasks)
+            return next(task_iter)
+
+    def recommend():
+        with main.app.app_context():
+            main.get_task_assignment_recommendation(dict(next_task()))
+            main.db.session.remove()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        cold = measure(recommend, runs, before=main.RECOMMENDATION_CACHE.clear)
+        for _ in tasks:  # fill the cache with every task of the batch
+            recommend()
+        cached = measure(recommend, runs)
+    return {'cold': cold, 'cached': cached}
+
+
+def run(count, main, catalogue, args):
+    from assignment_engine import assign_tasks_ml
+    from compact_model import export_model_data
+    from training_data import build_assignment_model
+
+    rng = random.Random(args.seed)
+    developers = make_roster(count, catalogue, rng)
+    tasks = make_tasks(args.tasks, catalogue, rng)
+    result = {'developers': count, 'tasks': len(tasks)}
+
+    result.update(seed_database(main, developers, rng))
+    result['get_task_assignment_recommendation'] = bench_main_recommender(main, tasks, args.requests)
+    result['assign_tasks_ml'] = {'no_model': measure(lambda: assign_tasks_ml(tasks, developers, None), args.repeats)}
+    roster = main.FEATURE_STORE.snapshot()
+    result['assign_tasks_ml']['feature_store'] = measure(lambda: assign_tasks_ml(tasks, roster, None), args.repeats)
+
+    if count <= args.model_max_developers:
+        training_tasks = make_training_tasks(catalogue, rng)
+        model_data = {}
+
+        def build():
+            model_data.update(build_assignment_model(developers, training_tasks.copy(), args.trees, args.jobs))
+
+        result['build_assignment_model'] = {'trees': args.trees, **measure(build, args.model_repeats)}
+        if model_data.get('model') is not None:
+            result['assign_tasks_ml']['with_model'] = measure(
+                lambda: assign_tasks_ml(tasks, developers, model_data), args.repeats)
+            compact_data = export_model_data(model_data)
+            result['assign_tasks_ml']['with_compact_model'] = measure(
+                lambda: assign_tasks_ml(tasks, developers, compact_data), args.repeats)
+            del compact_data
+        del model_data
+    result['max_rss_mb'] = max_rss_mb()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Recommender benchmark (latency and peak memory as JSON)')
+    parser.add_argument('--developers', type=int, nargs='+', default=[100, 1000, 10000, 50000])
+    parser.add_argument('--tasks', type=int, default=100, help='Tasks per batch')
+    parser.add_argument('--requests', type=int, default=200, help='Timed single-task recommendations')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed assign_tasks_ml batches')
+    parser.add_argument('--model-max-developers', type=int, default=300)
+    parser.add_argument('--model-repeats', type=int, default=3)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--jobs', type=int, default=None, help='Model fit cores (default MODEL_TRAINING_JOBS)')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix='recommender-benchmark-')
+    try:
+        os.environ['TASK_MANAGER_DB'] = scratch_database(directory)
+        import main as task_manager
+
+        # Service catalogue plus the project types only main.py knows
+        catalogue = dict(PROJECT_SKILLS)
+        for project_type, skills in task_manager.PROJECT_TYPES.items():
+            catalogue.setdefault(project_type, skills)
+
+        results = []
+        for count in sorted(args.developers):
+            result = run(count, task_manager, catalogue, args)
+            recommendation = result['get_task_assignment_recommendation']
+            print(f"{count:>6} developers: recommend p50={recommendation['cold']['p50_ms']}ms "
+                  f"cached p50={recommendation['cached']['p50_ms']}ms, "
+                  f"assign_tasks_ml p50={result['assign_tasks_ml']['no_model']['p50_ms']}ms"
+                  + (f", build_assignment_model p50={result['build_assignment_model']['p50_ms']}ms"
+                     if 'build_assignment_model' in result else ''), file=sys.stderr)
+            results.append(result)
+
+        with task_manager.app.app_context():
+            task_manager.db.engine.dispose()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    report = {
+        'benchmark': 'recommenders',
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'max_rss_mb': max_rss_mb(),
+        'results': results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
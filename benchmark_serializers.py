@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Serialization throughput benchmark: ORM entities vs. column projections
+
+Seeds a scratch SQLite database with N tasks (and their assignees) using the
+main.py models, then times building the task_management and API payloads
+the old way (full Task entities, assignee joined, dict built by hand) and
+through the serializers.py projections.
+
+Usage:
+    python benchmark_serializers.py --rows 10000 --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from main import db, Employee, Task, TASK_PROJECTIONS
+
+
+def seed(session, rows, developers):
+    now = datetime.utcnow()
+    session.add_all(Employee(emp_id=f'DEV{i:04d}', name=f'Developer {i}', email=f'dev{i}@example.com',
+                             role='developer', password_hash='x') for i in range(developers))
+    session.add_all(Task(
+        task_id=f'TASK{i:06d}', title=f'Benchmark task {i}', description='Long description. ' * 50,
+        project_type='website_development', status=['assigned', 'in_progress', 'submitted', 'completed'][i % 4],
+        assigned_to=f'DEV{i % developers:04d}', assigned_at=now, due_date=now + timedelta(days=7),
+        feedback='Reviewer feedback. ' * 20, created_at=now - timedelta(seconds=i), updated_at=now
+    ) for i in range(rows))
+    session.commit()
+
+
+def management_payload_orm(session):
+    """task_management before projections: entities + joined assignee"""
+    tasks = []
+    for task in session.query(Task).options(joinedload(Task.assignee)).all():
+        employee = task.assignee
+        tasks.append({
+            'task_id': task.task_id,
+            'title': task.title,
+            'description': task.description,
+            'project_type': task.project_type,
+            'complexity': task.complexity,
+            'priority': task.priority,
+            'status': task.status,
+            'assigned_to': task.assigned_to,
+            'assigned_to_name': employee.name if employee else 'Unknown',
+            'assigned_at': task.assigned_at.isoformat() if task.assigned_at else None,
+            'due_date': task.due_date.isoformat() if task.due_date else None,
+            'submitted_at': task.submitted_at.isoformat() if task.submitted_at else None,
+            'completion_date': task.completion_date.isoformat() if task.completion_date else None
+        })
+    return tasks
+
+
+def management_payload_projection(session):
+    projection = TASK_PROJECTIONS['management_list']
+    return projection.serialize(projection.query(session).all())
+
+
+def api_payload_orm(session):
+    return [task.to_dict() for task in session.query(Task).all()]
+
+
+def api_payload_projection(session):
+    projection = TASK_PROJECTIONS['api']
+    return projection.serialize(projection.query(session).all())
+
+
+CASES = [
+    ('management_list', management_payload_orm, management_payload_projection),
+    ('api', api_payload_orm, api_payload_projection),
+]
+
+
+def time_case(engine, build, repeat):
+    """Best wall time over repeat runs, each with a fresh session (cold identity map)"""
+    best = None
+    count = 0
+    for _ in range(repeat):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            count = len(build(session))
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Task serialization benchmark')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--developers', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    engine = create_engine(f'sqlite:///{path}')
+    try:
+        db.metadata.create_all(engine, tables=[Employee.__table__, Task.__table__])
+        with Session(engine) as session:
+            seed(session, args.rows, args.developers)
+
+        results = []
+        for name, orm_build, projection_build in CASES:
+            orm_time, orm_count = time_case(engine, orm_build, args.repeat)
+            projection_time, projection_count = time_case(engine, projection_build, args.repeat)
+            assert orm_count == projection_count == args.rows
+            results.append({
+                'payload': name,
+                'rows': args.rows,
+                'orm_rows_per_sec': round(args.rows / orm_time),
+                'projection_rows_per_sec': round(args.rows / projection_time),
+                'speedup': round(orm_time / projection_time, 2),
+            })
+            print(f"{name:16} orm={results[-1]['orm_rows_per_sec']:>8} rows/s  "
+                  f"projection={results[-1]['projection_rows_per_sec']:>8} rows/s  "
+                  f"speedup={results[-1]['speedup']}x")
+
+        print(json.dumps(results, indent=2))
+    finally:
+        engine.dispose()
+        os.remove(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
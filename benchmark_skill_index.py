@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Skill matching benchmark: full developer scan vs. the inverted skill index
+
+Generates N developers whose skills come from a few project types (50 skills
+each), then times one recommendation's skill filtering the old way (parse
+every developer's skills JSON and compare against the required skills) and
+with SkillIndex.match, which only visits developers sharing a skill.
+
+Usage:
+    python benchmark_skill_index.py --developers 10000 --skills-per-type 50
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from skill_index import SkillIndex
+
+
+def make_developers(count, project_types, skills_per_type, rng):
+    vocabulary = {f'type{t}': [f'Skill{t}_{s}' for s in range(skills_per_type)] for t in range(project_types)}
+    developers = []
+    for i in range(count):
+        # Most developers specialise in one project type, some span two
+        types = rng.sample(list(vocabulary), 2 if rng.random() < 0.3 else 1)
+        skills = {skill for t in types for skill in rng.sample(vocabulary[t], rng.randint(3, 12))}
+        developers.append((f'DEV{i:05d}', json.dumps(sorted(skills))))
+    return vocabulary, developers
+
+
+def scan_match(developers, required_skills, min_match=50):
+    """The pre-index loop: parse every developer's JSON and count matches"""
+    matches = {}
+    for emp_id, skills_json in developers:
+        dev_skills = json.loads(skills_json)
+        matching = len([skill for skill in required_skills if skill in dev_skills])
+        skill_match = (matching / len(required_skills)) * 100
+        if skill_match >= min_match:
+            matches[emp_id] = skill_match
+    return matches
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def time_requests(match, requests):
+    timings = []
+    for required in requests:
+        started = time.perf_counter()
+        match(required)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Skill index benchmark')
+    parser.add_argument('--developers', type=int, default=10000)
+    parser.add_argument('--project-types', type=int, default=6)
+    parser.add_argument('--skills-per-type', type=int, default=50)
+    parser.add_argument('--required', type=int, default=4, help='Required skills per task')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    vocabulary, developers = make_developers(args.developers, args.project_types, args.skills_per_type, rng)
+    requests = [rng.sample(vocabulary[rng.choice(list(vocabulary))], args.required) for _ in range(args.requests)]
+
+    index = SkillIndex(max_age=0)
+    started = time.perf_counter()
+    index.build((emp_id, json.loads(skills)) for emp_id, skills in developers)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # Same answers either way (the index is also case-insensitive, test data is not mixed-case)
+    for required in requests[:20]:
+        assert scan_match(developers, required) == index.match(required)
+
+    scan = time_requests(lambda required: scan_match(developers, required), requests)
+    indexed = time_requests(index.match, requests)
+
+    result = {
+        'developers': args.developers,
+        'skills_per_type': args.skills_per_type,
+        'required_skills': args.required,
+        'index_build_ms': round(build_ms, 1),
+        'scan_p50_ms': round(statistics.median(scan), 3),
+        'scan_p95_ms': round(percentile(scan, 95), 3),
+        'index_p50_ms': round(statistics.median(indexed), 3),
+        'index_p95_ms': round(percentile(indexed, 95), 3),
+        'speedup_p50': round(statistics.median(scan) / statistics.median(indexed), 1),
+    }
+    print(f"scan  p50={result['scan_p50_ms']}ms p95={result['scan_p95_ms']}ms")
+    print(f"index p50={result['index_p50_ms']}ms p95={result['index_p95_ms']}ms "
+          f"(build {result['index_build_ms']}ms, {result['speedup_p50']}x)")
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write benchmark for the SQLite engine profiles in db_engine.py
+
+Runs N reader threads (dashboard-style counts and listings) against M writer
+threads (task status transitions, one commit each) on a scratch copy of the
+tasks table, once per profile, and reports throughput and lock errors.
+
+Usage:
+    python benchmark_sqlite_concurrency.py --readers 8 --writers 2 --duration 5
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import SQLITE_PROFILES, sqlite_engine_options, install_sqlite_pragmas
+
+STATUSES = ['assigned', 'in_progress', 'submitted', 'completed']
+
+READ_QUERIES = [
+    "SELECT count(*) FROM tasks WHERE assigned_to = :emp_id AND status IN ('assigned', 'in_progress')",
+    "SELECT count(*) FROM tasks WHERE assigned_to = :emp_id AND status = 'submitted'",
+    "SELECT task_id, title, status FROM tasks WHERE assigned_to = :emp_id ORDER BY created_at DESC",
+    "SELECT task_id, title, assigned_to FROM tasks WHERE status = 'submitted'",
+]
+
+
+def build_database(path, rows, developers):
+    """Create a tasks table with the hot-path indexes and seed it"""
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        conn.execute(text('''
+            CREATE TABLE tasks (
+                task_id VARCHAR(50) PRIMARY KEY, title VARCHAR(200) NOT NULL,
+                status VARCHAR(30), assigned_to VARCHAR(50), created_at DATETIME, updated_at DATETIME
+            )
+        '''))
+        conn.execute(text('CREATE INDEX idx_tasks_assigned_to_status ON tasks (assigned_to, status)'))
+        conn.execute(text('CREATE INDEX idx_tasks_status ON tasks (status)'))
+        conn.execute(
+            text("INSERT INTO tasks VALUES (:task_id, :title, :status, :assigned_to, datetime('now'), datetime('now'))"),
+            [{
+                'task_id': f'TASK{i:07d}',
+                'title': f'Benchmark task {i}',
+                'status': random.choice(STATUSES),
+                'assigned_to': f'DEV{i % developers:04d}',
+            } for i in range(rows)]
+        )
+    engine.dispose()
+
+
+def run_profile(path, profile, readers, writers, duration, rows, developers):
+    """Run readers and writers against one profile; return throughput stats"""
+    options = sqlite_engine_options(profile)
+    options['pool_size'] = readers + writers
+    engine = create_engine(f'sqlite:///{path}', **options)
+    install_sqlite_pragmas(engine, profile)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0}
+
+    def bump(key):
+        with lock:
+            stats[key] += 1
+
+    def reader():
+        rng = random.Random()
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    sql = rng.choice(READ_QUERIES)
+                    conn.execute(text(sql), {'emp_id': f'DEV{rng.randrange(developers):04d}'}).fetchall()
+                bump('reads')
+            except OperationalError:
+                bump('read_errors')
+
+    def writer():
+        rng = random.Random()
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("UPDATE tasks SET status = :status, updated_at = datetime('now') WHERE task_id = :task_id"),
+                        {'status': rng.choice(STATUSES), 'task_id': f'TASK{rng.randrange(rows):07d}'}
+                    )
+                bump('writes')
+            except OperationalError:
+                bump('write_errors')
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    return {
+        'profile': profile,
+        'readers': readers,
+        'writers': writers,
+        'reads_per_sec': round(stats['reads'] / elapsed, 1),
+        'writes_per_sec': round(stats['writes'] / elapsed, 1),
+        'read_errors': stats['read_errors'],
+        'write_errors': stats['write_errors'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SQLite concurrent read/write benchmark')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--developers', type=int, default=500)
+    parser.add_argument('--profiles', nargs='+', default=list(SQLITE_PROFILES.keys()))
+    args = parser.parse_args(argv)
+
+    results = []
+    for profile in args.profiles:
+        # Fresh file per profile so journal mode and page cache start cold
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        try:
+            build_database(path, args.rows, args.developers)
+            result = run_profile(path, profile, args.readers, args.writers,
+                                 args.duration, args.rows, args.developers)
+            results.append(result)
+            print(f"{profile:12} reads/s={result['reads_per_sec']:>9} writes/s={result['writes_per_sec']:>8} "
+                  f"read_errors={result['read_errors']} write_errors={result['write_errors']}")
+        finally:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
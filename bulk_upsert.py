@@ -0,0 +1,75 @@
+# bulk_upsert.py
+"""
+Batched insert-or-update helpers for large write payloads.
+
+Instead of one SELECT and one INSERT/UPDATE per row, existing keys are
+prefetched with chunked ``IN`` queries and rows are written with multi-row
+``INSERT ... ON CONFLICT (key) DO UPDATE`` statements, so thousands of rows
+take a handful of round trips. Supported on PostgreSQL and SQLite (3.24+).
+"""
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def chunked(items, size):
+    """Yield successive lists of at most size items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def dialect_insert(dialect_name):
+    """The dialect-specific insert() that supports on_conflict_do_update"""
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk upsert is not supported on {dialect_name}")
+    return insert
+
+
+def fetch_existing_keys(session, column, keys, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return the subset of keys already present in column (one IN query per chunk)"""
+    keys = list(dict.fromkeys(keys))
+    existing = set()
+    for chunk in chunked(keys, chunk_size):
+        existing.update(row[0] for row in session.query(column).filter(column.in_(chunk)))
+    return existing
+
+
+def upsert_rows(session, table, rows, key, update_columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Insert rows, or update update_columns of rows whose key already exists.
+
+    rows are dicts with the same keys. Duplicate keys within rows are
+    collapsed (last one wins), since one statement cannot touch a row twice.
+    Returns the number of rows written.
+    """
+    rows = list({row[key]: row for row in rows}.values())
+    if not rows:
+        return 0
+
+    insert = dialect_insert(session.get_bind().dialect.name)
+    for chunk in chunked(rows, chunk_size):
+        stmt = insert(table).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[key]],
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+        session.execute(stmt)
+    return len(rows)
+
+
+def upsert_rows_one_by_one(session, table, rows, key, update_columns):
+    """upsert_rows for each row in its own savepoint; returns {key: error} for rows that failed.
+
+    For retrying a batch that failed as a whole: the good rows are written
+    and only the bad ones are reported.
+    """
+    errors = {}
+    for row in {row[key]: row for row in rows}.values():
+        try:
+            with session.begin_nested():
+                upsert_rows(session, table, [row], key, update_columns)
+        except Exception as e:
+            errors[row[key]] = str(e)
+    return errors
@@ -0,0 +1,252 @@
+# compact_model.py
+"""
+Array-backed copies of the trained assignment models for serving.
+
+scikit-learn's predict_proba validates its input and walks each tree
+separately, which costs far more than the arithmetic when the engine asks
+about a few dozen candidates, and importing scikit-learn dominates service
+start-up. export_model_data() flattens a published model into plain NumPy
+arrays once, and the classes here evaluate them with NumPy alone; this
+module never imports scikit-learn (the exporters only read attributes of
+the fitted objects).
+
+- CompactForest: a RandomForestClassifier. All trees share one set of node
+  arrays (feature, threshold, left child, missing_left), indexed from each
+  tree's root offset. Nodes are renumbered so a right child directly
+  follows its left sibling, and all (row, tree) pairs still above a leaf
+  move down one level per step: child = left + (x > threshold). Leaf class
+  probabilities are stored sparsely (CSR: leaf_ptr, leaf_classes,
+  leaf_probs), since with one class per employee nearly all are zero.
+- CompactLogistic: an outcome_model.OutcomeModel (binary logistic SGD),
+  returning P(completed) as its only column like the original.
+
+Both match the original predict_proba to floating-point rounding: inputs
+are compared as float32, as scikit-learn's trees do.
+"""
+
+import numpy as np
+
+# Sample x tree pairs advanced together (bounds the traversal's temporaries)
+TRAVERSAL_CELLS = 500_000
+
+
+def feature_array(features, feature_columns):
+    """2-D float array of features in feature_columns order (DataFrame or array input)"""
+    if hasattr(features, 'columns'):
+        features = features[list(feature_columns)].to_numpy(dtype=float)
+    return np.atleast_2d(np.asarray(features, dtype=float))
+
+
+class CompactForest:
+    """Flattened RandomForestClassifier with a NumPy predict_proba"""
+
+    def __init__(self, classes, feature_columns, roots, feature, threshold, left, missing_left,
+                 leaf_ptr, leaf_classes, leaf_probs):
+        self.classes_ = classes
+        self.feature_columns = list(feature_columns)
+        self.roots = roots                  # root node of each tree
+        self.feature = feature              # split feature (0 at leaves)
+        self.threshold = threshold          # go left when x <= threshold
+        self.left = left                    # left child (right is left + 1); a leaf's is itself
+        self.missing_left = missing_left    # NaN goes left (None: never)
+        self.leaf_ptr = leaf_ptr            # node -> its slice of leaf_classes / leaf_probs
+        self.leaf_classes = leaf_classes
+        self.leaf_probs = leaf_probs
+        self.is_leaf = left == np.arange(len(left))
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def split_points(self, column):
+        """Sorted thresholds the trees compare feature column with.
+
+        Values between the same two split points take the same path through
+        every tree, so they get the same prediction.
+        """
+        index = self.feature_columns.index(column)
+        return np.unique(self.threshold[(self.feature == index) & ~self.is_leaf])
+
+    def apply(self, X):
+        """Leaf node of every tree for each row of X (rows x trees)"""
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        values_of = X.reshape(-1)
+        nodes = np.tile(self.roots, n_rows)
+        row_offsets = np.repeat(np.arange(n_rows) * n_features, self.n_trees)
+        # Only (row, tree) pairs that have not reached a leaf are advanced
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while len(active):
+            current = nodes[active]
+            values = values_of[row_offsets[active] + self.feature[current]]
+            go_right = ~(values <= self.threshold[current])
+            if self.missing_left is not None:
+                go_right &= ~(np.isnan(values) & self.missing_left[current])
+            current = self.left[current] + go_right
+            nodes[active] = current
+            active = active[~self.is_leaf[current]]
+        return nodes.reshape(n_rows, self.n_trees)
+
+    def predict_proba(self, features):
+        X = feature_array(features, self.feature_columns)
+        proba = np.zeros((len(X), len(self.classes_)))
+        step = max(1, TRAVERSAL_CELLS // max(1, self.n_trees))
+        for start in range(0, len(X), step):
+            leaves = self.apply(X[start:start + step])
+            proba[start:start + len(leaves)] = self._leaf_average(leaves)
+        return proba
+
+    def max_proba(self, features):
+        """max(predict_proba) per row, without building the rows x classes matrix"""
+        X = feature_array(features, self.feature_columns)
+        best = np.zeros(len(X))
+        step = max(1, TRAVERSAL_CELLS // max(1, self.n_trees))
+        for start in range(0, len(X), step):
+            leaves = self.apply(X[start:start + step])
+            best[start:start + len(leaves)] = self._leaf_max(leaves)
+        return best
+
+    def _leaf_entries(self, leaves):
+        """(row, class, probability) of every sparse entry of the rows' leaves"""
+        leaves = leaves.reshape(-1)
+        starts = self.leaf_ptr[leaves]
+        lengths = self.leaf_ptr[leaves + 1] - starts
+        # Entries of every selected leaf, concatenated
+        offsets = np.cumsum(lengths) - lengths
+        entries = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+        rows = np.repeat(np.arange(len(leaves)) // self.n_trees, lengths)
+        return rows, self.leaf_classes[entries], self.leaf_probs[entries]
+
+    def _leaf_average(self, leaves):
+        """Mean of the leaves' class distributions, per row"""
+        n_rows, n_classes = leaves.shape[0], len(self.classes_)
+        rows, classes, probs = self._leaf_entries(leaves)
+        sums = np.bincount(rows * n_classes + classes, weights=probs, minlength=n_rows * n_classes)
+        return sums.reshape(n_rows, n_classes) / self.n_trees
+
+    def _leaf_max(self, leaves):
+        """Largest class probability of the leaves' mean distribution, per row"""
+        n_classes = len(self.classes_)
+        rows, classes, probs = self._leaf_entries(leaves)
+        # Sum per (row, class) present, then the maximum over each row's cells (cells are sorted by row)
+        cells, inverse = np.unique(rows * n_classes + classes, return_inverse=True)
+        best = np.zeros(leaves.shape[0])
+        if not len(cells):
+            return best
+        sums = np.bincount(inverse.reshape(-1), weights=probs, minlength=len(cells))
+        cell_rows = cells // n_classes
+        firsts = np.flatnonzero(np.r_[True, cell_rows[1:] != cell_rows[:-1]])
+        best[cell_rows[firsts]] = np.maximum.reduceat(sums, firsts)
+        return best / self.n_trees
+
+
+class CompactLogistic:
+    """Binary logistic model: P(positive) = sigmoid(x / scale . coef + intercept)"""
+
+    def __init__(self, classes, feature_columns, scale, coef, intercept, **attributes):
+        self.classes_ = classes
+        self.feature_columns = list(feature_columns)
+        self.scale = scale
+        self.coef = coef
+        self.intercept = intercept
+        # Bookkeeping of the exported model (e.g. outcomes, last_outcome_id)
+        self.__dict__.update(attributes)
+
+    def predict_proba(self, features):
+        X = np.nan_to_num(feature_array(features, self.feature_columns)) / self.scale
+        margin = X @ self.coef + self.intercept
+        return np.exp(-np.logaddexp(0.0, -margin))[:, None]
+
+    def max_proba(self, features):
+        """max(predict_proba) per row: the only column"""
+        return self.predict_proba(features)[:, 0]
+
+
+def sibling_order(children_left, children_right):
+    """Breadth-first node order in which every right child directly follows its left sibling"""
+    order = [np.zeros(1, dtype=np.intp)]
+    frontier = order[0]
+    while len(frontier):
+        parents = frontier[children_left[frontier] >= 0]
+        frontier = np.column_stack([children_left[parents], children_right[parents]]).reshape(-1)
+        order.append(frontier)
+    return np.concatenate(order)
+
+
+def export_forest(model, feature_columns):
+    """CompactForest of a fitted single-output RandomForestClassifier, or None"""
+    estimators = getattr(model, 'estimators_', None)
+    if not estimators or getattr(model, 'n_outputs_', 1) != 1:
+        return None
+    classes = np.asarray(model.classes_)
+    n_classes = len(classes)
+
+    roots, feature, threshold, left, missing_left = [], [], [], [], []
+    leaf_counts, leaf_classes, leaf_probs = [], [], []
+    offset = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        if tree.value.shape[1] != 1 or tree.value.shape[2] != n_classes:
+            return None
+        # Renumber nodes so that right = left + 1
+        order = sibling_order(tree.children_left, tree.children_right)
+        position = np.empty(tree.node_count, dtype=np.intp)
+        position[order] = np.arange(tree.node_count)
+        children = tree.children_left[order]
+        is_leaf = children < 0
+
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, tree.feature[order]))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+        left.append(np.where(is_leaf, np.arange(tree.node_count), position[np.maximum(children, 0)]) + offset)
+        missing = getattr(tree, 'missing_go_to_left', None)
+        missing_left.append(np.zeros(tree.node_count, dtype=bool) if missing is None
+                            else np.asarray(missing, dtype=bool)[order] & ~is_leaf)
+
+        # Normalized like DecisionTreeClassifier.predict_proba; only leaves are kept
+        values = tree.value[order, 0, :]
+        totals = values.sum(axis=1, keepdims=True)
+        values = values / np.where(totals == 0, 1.0, totals)
+        values[~is_leaf] = 0
+        node_rows, node_classes = np.nonzero(values)
+        leaf_counts.append(np.bincount(node_rows, minlength=tree.node_count))
+        leaf_classes.append(node_classes)
+        leaf_probs.append(values[node_rows, node_classes])
+        offset += tree.node_count
+
+    any_missing = any(flags.any() for flags in missing_left)
+    return CompactForest(
+        classes, feature_columns,
+        roots=np.array(roots, dtype=np.intp),
+        feature=np.concatenate(feature).astype(np.intp),
+        threshold=np.concatenate(threshold).astype(np.float64),
+        left=np.concatenate(left).astype(np.intp),
+        missing_left=np.concatenate(missing_left) if any_missing else None,
+        leaf_ptr=np.concatenate([[0], np.cumsum(np.concatenate(leaf_counts))]).astype(np.intp),
+        leaf_classes=np.concatenate(leaf_classes).astype(np.intp),
+        leaf_probs=np.concatenate(leaf_probs).astype(np.float64),
+    )
+
+
+def export_model_data(model_data):
+    """Copy of model_data with the model replaced by its compact form.
+
+    Models that know how to export themselves provide compact(); random
+    forests are flattened here. Returns None when the model has no compact
+    form (the caller keeps using the original).
+    """
+    if not model_data or model_data.get('model') is None:
+        return None
+    model = model_data['model']
+    feature_columns = list(model_data.get('feature_columns') or [])
+    if hasattr(model, 'compact'):
+        compact = model.compact()
+    else:
+        compact = export_forest(model, feature_columns)
+    if compact is None:
+        return None
+    return dict(model_data, model=compact)
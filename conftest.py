@@ -0,0 +1,13 @@
+"""
+pytest setup: run the suite against a scratch copy of task_manager.db so
+tests that import main never write the tracked database.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()
@@ -0,0 +1,119 @@
+# db_engine.py
+"""
+SQLite engine profiles for the Task Manager app.
+
+A profile is a set of PRAGMAs applied to every new DBAPI connection plus the
+SQLAlchemy pool options used to build the engine. The ``concurrent`` profile
+(WAL journal, busy timeout, relaxed fsync, mmap and a larger page cache) lets
+dashboard readers run while approve/start/submit writes are committing,
+instead of failing with "database is locked".
+
+Configuration (environment variables):
+    SQLITE_PROFILE       default | concurrent   (default: concurrent)
+    SQLITE_BUSY_TIMEOUT  busy timeout in milliseconds, overrides the profile
+    DB_POOL_SIZE         pooled connections kept open (default: 5)
+    DB_MAX_OVERFLOW      extra connections allowed under load (default: 10)
+    DB_POOL_TIMEOUT      seconds to wait for a pooled connection (default: 30)
+
+Read-only routing for dashboard/listing routes is configured in db_routing.py.
+
+use_scratch_database() points main.py (TASK_MANAGER_DB) at a temporary copy
+of task_manager.db; tests call it before importing main so they never write
+the tracked database.
+"""
+
+import os
+import atexit
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+
+from sqlalchemy import event
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'task_manager.db')
+
+SQLITE_PROFILES = {
+    # Plain SQLite defaults: rollback journal, no busy timeout
+    'default': {},
+    # Multi-worker deployment: readers never block on the single writer
+    'concurrent': {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,          # milliseconds
+        'synchronous': 'NORMAL',       # safe with WAL, fsync only at checkpoints
+        'mmap_size': 268435456,        # 256 MB of memory-mapped I/O
+        'cache_size': -65536,          # negative = KiB, i.e. 64 MB page cache
+        'temp_store': 'MEMORY',
+    },
+}
+
+# Order matters: journal_mode must be switched before the other settings
+PRAGMA_ORDER = ['journal_mode', 'busy_timeout', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'query_only']
+
+
+def get_sqlite_profile(name=None):
+    """Return the PRAGMA settings for a profile name (or SQLITE_PROFILE)"""
+    name = name or os.environ.get('SQLITE_PROFILE', 'concurrent')
+    if name not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {name}")
+
+    pragmas = dict(SQLITE_PROFILES[name])
+    busy_timeout = os.environ.get('SQLITE_BUSY_TIMEOUT')
+    if busy_timeout:
+        pragmas['busy_timeout'] = int(busy_timeout)
+    return pragmas
+
+
+def sqlite_engine_options(profile=None):
+    """SQLAlchemy engine options (pool sizing) for a SQLite profile"""
+    pragmas = get_sqlite_profile(profile)
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'connect_args': {
+            # sqlite3's own lock wait, in seconds; the busy_timeout PRAGMA below wins
+            'timeout': pragmas.get('busy_timeout', 5000) / 1000,
+            # Pooled connections are handed between request threads
+            'check_same_thread': False,
+        },
+    }
+
+
+def install_sqlite_pragmas(engine, profile=None, read_only=False):
+    """Apply the profile's PRAGMAs on every new connection of a SQLite engine.
+
+    With read_only=True the journal mode is left alone (a read-only
+    connection cannot change it) and query_only is switched on.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = get_sqlite_profile(profile)
+    if read_only:
+        pragmas.pop('journal_mode', None)
+        pragmas['query_only'] = 1
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for key in PRAGMA_ORDER:
+            if key in pragmas:
+                cursor.execute(f"PRAGMA {key}={pragmas[key]}")
+        cursor.close()
+
+
+def use_scratch_database(source=DEFAULT_DB_PATH):
+    """Set TASK_MANAGER_DB to a temporary copy of source, unless it is set already; returns its path.
+
+    The copy goes through SQLite's backup API, so committed pages still in
+    the -wal file are included. It is deleted when the process exits.
+    """
+    if not os.environ.get('TASK_MANAGER_DB'):
+        directory = tempfile.mkdtemp(prefix='task_manager_')
+        atexit.register(shutil.rmtree, directory, True)
+        path = os.path.join(directory, 'task_manager.db')
+        with closing(sqlite3.connect(source)) as original, closing(sqlite3.connect(path)) as copy:
+            original.backup(copy)
+        os.environ['TASK_MANAGER_DB'] = path
+    return os.environ['TASK_MANAGER_DB']
@@ -0,0 +1,128 @@
+# db_routing.py
+"""
+Read-only connection routing for GET-heavy routes.
+
+Views decorated with ``@read_only_route`` run their queries on a separate
+read-only SQLite engine instead of the primary one, so dashboard and listing
+reads never queue behind (or hold locks against) task submissions and
+approvals. Flushes and anything outside a decorated view keep using the
+primary engine.
+
+Modes (environment variable SQLITE_READ_ROUTING):
+    off        every query goes to the primary engine
+    readonly   a second engine on the same file, opened with mode=ro and
+               PRAGMA query_only (default); with WAL it sees every commit
+    snapshot   reads go to a copy of the database refreshed at most every
+               SQLITE_SNAPSHOT_INTERVAL seconds (default: 60); heavy reports
+               then never touch the primary file at all, at the cost of
+               slightly stale data
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from functools import wraps
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+
+from db_engine import sqlite_engine_options, install_sqlite_pragmas
+
+READ_ROUTING_MODES = ('off', 'readonly', 'snapshot')
+DEFAULT_SNAPSHOT_INTERVAL = 60
+
+
+def read_only_route(view):
+    """Route decorator: run this view's queries on the read-only engine"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        try:
+            return view(*args, **kwargs)
+        finally:
+            g.db_read_only = False
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends reads in read-only routes to the read engine"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('db_read_only'):
+            router = current_app.extensions.get('read_router')
+            if router is not None and router.enabled:
+                return router.get_engine()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadRouter:
+    """Owns the read-only (or snapshot) engine for one SQLite database file"""
+
+    def __init__(self, db_path, mode=None, snapshot_interval=None, profile=None):
+        self.db_path = db_path
+        self.mode = mode or os.environ.get('SQLITE_READ_ROUTING', 'readonly')
+        if self.mode not in READ_ROUTING_MODES:
+            raise ValueError(f"Unknown read routing mode: {self.mode}")
+        self.snapshot_interval = float(
+            snapshot_interval if snapshot_interval is not None
+            else os.environ.get('SQLITE_SNAPSHOT_INTERVAL', DEFAULT_SNAPSHOT_INTERVAL)
+        )
+        self.snapshot_path = os.path.splitext(db_path)[0] + '.snapshot.db'
+        self.profile = profile
+        self.engine = None
+        self.refreshed_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.mode != 'off'
+
+    def _create_engine(self, path):
+        # mode=ro: the connection cannot write even if query_only is bypassed
+        engine = create_engine(f'sqlite:///file:{path}?mode=ro&uri=true',
+                               **sqlite_engine_options(self.profile))
+        install_sqlite_pragmas(engine, self.profile, read_only=True)
+        return engine
+
+    def refresh_snapshot(self):
+        """Copy the primary database to the snapshot file (online backup, consistent)"""
+        tmp_path = self.snapshot_path + '.tmp'
+        source = sqlite3.connect(self.db_path)
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, self.snapshot_path)
+        self.refreshed_at = time.monotonic()
+        if self.engine is not None:
+            # Pooled connections still point at the replaced file
+            self.engine.dispose()
+
+    def get_engine(self):
+        """Engine for read-only routes, refreshing the snapshot when it is due"""
+        if self.mode == 'snapshot':
+            with self._lock:
+                if self.refreshed_at is None or time.monotonic() - self.refreshed_at >= self.snapshot_interval:
+                    self.refresh_snapshot()
+                if self.engine is None:
+                    self.engine = self._create_engine(self.snapshot_path)
+        elif self.engine is None:
+            with self._lock:
+                if self.engine is None:
+                    self.engine = self._create_engine(self.db_path)
+        return self.engine
+
+    def dispose(self):
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+def init_read_routing(app, db_path, **options):
+    """Register a ReadRouter for app; views opt in with @read_only_route"""
+    router = ReadRouter(db_path, **options)
+    app.extensions['read_router'] = router
+    return router
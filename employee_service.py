@@ -13,6 +13,7 @@ from datetime import datetime
 import os
 import string
 import random
+import requests
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -28,6 +29,10 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev_secret_key_for_api'
 # Initialize SQLAlchemy
 db = SQLAlchemy(app)
 
+# Task service, told about employee changes so its scoring features stay current
+TASK_SERVICE_URL = os.environ.get('TASK_SERVICE_URL', 'http://localhost:5002/api')
+TASK_SERVICE_TIMEOUT = float(os.environ.get('TASK_SERVICE_TIMEOUT', 2))
+
 
 # Updated Employee Model with all fields referenced in main_app.py
 class Employee(db.Model):
@@ -124,6 +129,24 @@ def get_next_employee_id():
         print(f"Falling back to timestamp ID: {timestamp_id}")
         return timestamp_id
     
+def notify_task_service(emp_id, employee=None):
+    """Push one employee's new data (None: deleted) to the task service's feature store.
+
+    Called after the commit. If the task service cannot be reached it
+    picks the change up with its next roster reload.
+    """
+    try:
+        url = f'{TASK_SERVICE_URL}/task-service/feature-store/employees/{emp_id}'
+        headers = {'X-API-KEY': os.environ.get('API_KEY', 'dev_api_key'), 'Content-Type': 'application/json'}
+        if employee is None:
+            response = requests.delete(url, headers=headers, timeout=TASK_SERVICE_TIMEOUT)
+        else:
+            response = requests.put(url, json=employee, headers=headers, timeout=TASK_SERVICE_TIMEOUT)
+        if response.status_code != 200:
+            print(f"Task service did not take the update of employee {emp_id}: {response.status_code}")
+    except Exception as e:
+        print(f"Could not notify the task service about employee {emp_id}: {str(e)}")
+
 # API Authentication - Simple API key check
 def authenticate_request():
     api_key = request.headers.get('X-API-KEY')
@@ -194,6 +217,7 @@ def create_employee():
                 
                 db.session.add(new_employee)
                 db.session.commit()
+                notify_task_service(emp_id, new_employee.to_dict())
                 
                 # Send email with credentials
                 send_credentials_email(
@@ -244,6 +268,7 @@ def create_employee():
             
             db.session.add(new_employee)
             db.session.commit()
+            notify_task_service(emp_id, new_employee.to_dict())
             
             # Send email with credentials
             success = send_credentials_email(
@@ -307,6 +332,7 @@ def update_employee(emp_id):
     
     try:
         db.session.commit()
+        notify_task_service(emp_id, employee.to_dict())
         return jsonify(employee.to_dict()), 200
     except Exception as e:
         db.session.rollback()
@@ -314,7 +340,11 @@ def update_employee(emp_id):
 
 @app.route('/api/employees/<emp_id>/metrics', methods=['PUT'])
 def update_metrics(emp_id):
-    """Update only the metrics of an employee"""
+    """Update only the metrics of an employee.
+    
+    ?notify=false skips the push to the task service (it sends that when
+    it stores the same values itself).
+    """
     if not authenticate_request():
         return jsonify({'error': 'Unauthorized'}), 401
     
@@ -332,6 +362,8 @@ def update_metrics(emp_id):
     
     try:
         db.session.commit()
+        if request.args.get('notify', '').lower() != 'false':
+            notify_task_service(emp_id, employee.to_dict())
         return jsonify({'success': True, 'employee': employee.to_dict()}), 200
     except Exception as e:
         db.session.rollback()
@@ -349,6 +381,7 @@ def delete_employee(emp_id):
     try:
         db.session.delete(employee)
         db.session.commit()
+        notify_task_service(emp_id)
         return jsonify({'message': f'Employee {emp_id} deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,391 @@
+# feature_store.py
+"""
+Precomputed per-employee scoring features (the ``employee_features`` table)
+and FeatureStore, an in-memory columnar copy of them.
+
+Both recommenders score an employee from the same few values: skills,
+experience, success_rate, tasks_completed and the number of active
+(assigned / in progress) tasks. Without the table these come from an
+Employee query plus a workload query (main.py), or from a call to the
+employee service plus a COUNT over tasks (task service), on every request.
+The table keeps one ready-to-score row per employee:
+
+- main.py rewrites the rows of the employees a flush touched from
+  employees and employee_workload (refresh_features), in the same
+  transaction, from its after_flush hook; update_metrics, approve_task,
+  skill edits and task status changes all go through it.
+- the task service has no employees table. It loads the rows from the
+  employee service roster (replace_features), takes the row of an
+  employee the employee service just created, edited or deleted from its
+  push (write_features), and updates single columns as it changes them
+  (update_features): metrics after a review, active_tasks after an
+  assignment or status change.
+
+Every write stamps the rows it changes with the next ``revision``, and a
+deleted employee keeps its row with removed = 1. A FeatureStore therefore
+catches up with the commits of any process with one indexed query for the
+rows above the last revision it applied; there is no periodic rebuild.
+Revisions are allocated under the writer's lock (SQLite's database write
+lock, LOCK TABLE on PostgreSQL), so they become visible in increasing order.
+
+The numeric columns are array.array buffers that NumPy wraps without
+copying (FeatureSnapshot, used by assignment_engine). This module needs
+only the standard library and SQLAlchemy, since main.py does not install
+numpy.
+"""
+
+import json
+import time
+import threading
+from array import array
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import (Column, DateTime, Float, Integer, MetaData, String, Table, Text,
+                        bindparam, func, select, text, update)
+
+from bulk_upsert import DEFAULT_CHUNK_SIZE, chunked, dialect_insert
+from skill_vocabulary import VOCABULARY
+from workload import ACTIVE_STATUSES, WORKLOAD_COLUMNS
+
+# Values one employee is scored on
+FEATURE_COLUMNS = ('name', 'role', 'skills', 'experience', 'success_rate',
+                   'tasks_completed', 'active_tasks')
+
+metadata = MetaData()
+
+employee_features = Table(
+    'employee_features', metadata,
+    Column('emp_id', String(50), primary_key=True),
+    Column('name', String(100)),
+    Column('role', String(20)),
+    Column('skills', Text, nullable=False, default='[]'),     # JSON list of skill names
+    Column('experience', Integer, nullable=False, default=0),
+    Column('success_rate', Float, nullable=False, default=0.0),
+    Column('tasks_completed', Integer, nullable=False, default=0),
+    Column('active_tasks', Integer, nullable=False, default=0),
+    Column('removed', Integer, nullable=False, default=0),     # 1 once the employee is gone
+    Column('revision', Integer, nullable=False, index=True),
+    Column('updated_at', DateTime),
+)
+
+EmployeeFeatures = namedtuple('EmployeeFeatures', ('emp_id',) + FEATURE_COLUMNS)
+
+
+def create_features_table(conn):
+    """Create the employee_features table (and its revision index) if it does not exist"""
+    employee_features.create(conn, checkfirst=True)
+
+
+def next_revision(conn):
+    """Revision for the rows this transaction writes (locks the table on PostgreSQL)"""
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text('LOCK TABLE employee_features IN SHARE ROW EXCLUSIVE MODE'))
+    current = conn.execute(select(func.max(employee_features.c.revision))).scalar()
+    return (current or 0) + 1
+
+
+def skills_json(skills):
+    """Skill list as stored in the table"""
+    return json.dumps(skills if isinstance(skills, list) else [])
+
+
+def parse_skills(value):
+    try:
+        skills = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+    return skills if isinstance(skills, list) else []
+
+
+# employees + employee_workload -> employee_features (main.py's SQLite database).
+# Rows whose values did not change keep their revision.
+ACTIVE_TASKS_SQL = ' + '.join(f'coalesce(w.{WORKLOAD_COLUMNS[status]}, 0)' for status in ACTIVE_STATUSES)
+REFRESH_SQL = f'''
+    INSERT INTO employee_features (emp_id, name, role, skills, experience, success_rate,
+                                   tasks_completed, active_tasks, removed, revision, updated_at)
+    SELECT e.emp_id, e.name, e.role, coalesce(e.skills, '[]'), coalesce(e.experience, 0),
+           coalesce(e.success_rate, 0.0), coalesce(e.tasks_completed, 0), {ACTIVE_TASKS_SQL},
+           0, :revision, :now
+    FROM employees e LEFT JOIN employee_workload w ON w.emp_id = e.emp_id
+    WHERE {{where}}
+    ON CONFLICT (emp_id) DO UPDATE SET
+        name = excluded.name, role = excluded.role, skills = excluded.skills,
+        experience = excluded.experience, success_rate = excluded.success_rate,
+        tasks_completed = excluded.tasks_completed, active_tasks = excluded.active_tasks,
+        removed = 0, revision = excluded.revision, updated_at = excluded.updated_at
+    WHERE employee_features.removed = 1
+       OR {' OR '.join(f'employee_features.{column} IS NOT excluded.{column}' for column in FEATURE_COLUMNS)}
+'''
+REMOVE_SQL = '''
+    UPDATE employee_features SET removed = 1, revision = :revision, updated_at = :now
+    WHERE removed = 0 AND {where}
+      AND NOT EXISTS (SELECT 1 FROM employees e WHERE e.emp_id = employee_features.emp_id)
+'''
+
+
+def refresh_features(conn, emp_ids=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Recompute the rows of emp_ids (default: everyone) from employees and employee_workload.
+
+    Employees that no longer exist are marked removed. Returns the revision
+    stamped on the changed rows.
+    """
+    revision = next_revision(conn)
+    params = {'revision': revision, 'now': datetime.utcnow()}
+    if emp_ids is None:
+        conn.execute(text(REFRESH_SQL.format(where='1 = 1')), params)
+        conn.execute(text(REMOVE_SQL.format(where='1 = 1')), params)
+        return revision
+
+    refresh = text(REFRESH_SQL.format(where='e.emp_id IN :emp_ids')).bindparams(
+        bindparam('emp_ids', expanding=True))
+    remove = text(REMOVE_SQL.format(where='emp_id IN :emp_ids')).bindparams(
+        bindparam('emp_ids', expanding=True))
+    for chunk in chunked(sorted(set(emp_ids)), chunk_size):
+        conn.execute(refresh, dict(params, emp_ids=chunk))
+        conn.execute(remove, dict(params, emp_ids=chunk))
+    return revision
+
+
+def feature_row(employee, active_tasks=0):
+    """employee_features values of an employee dict (employee service format)"""
+    return {
+        'emp_id': employee['emp_id'],
+        'name': employee.get('name'),
+        'role': employee.get('role'),
+        'skills': skills_json(employee.get('skills')),
+        'experience': int(employee.get('experience') or 0),
+        'success_rate': float(employee.get('success_rate') or 0.0),
+        'tasks_completed': int(employee.get('tasks_completed') or 0),
+        'active_tasks': int(active_tasks or 0),
+    }
+
+
+def replace_features(conn, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Make the table hold exactly rows (feature_row dicts); returns (changed, removed).
+
+    Only rows that differ from the stored ones are written, and employees
+    missing from rows are marked removed, so a roster refresh that changes
+    nothing leaves every revision alone.
+    """
+    table = employee_features
+    columns = [table.c[column] for column in FEATURE_COLUMNS]
+    stored = {row[0]: (row[1], tuple(row[2:]))
+              for row in conn.execute(select(table.c.emp_id, table.c.removed, *columns))}
+    rows = list({row['emp_id']: row for row in rows}.values())
+    changed = [row for row in rows
+               if stored.get(row['emp_id']) != (0, tuple(row[column] for column in FEATURE_COLUMNS))]
+    wanted = {row['emp_id'] for row in rows}
+    removed = [emp_id for emp_id, (is_removed, _) in stored.items() if not is_removed and emp_id not in wanted]
+    write_features(conn, changed, removed, chunk_size)
+    return len(changed), len(removed)
+
+
+def write_features(conn, rows=(), removed=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Store rows (feature_row dicts) and mark the removed emp_ids removed, under one new revision.
+
+    Other employees' rows are left alone.
+    """
+    table = employee_features
+    if not rows and not removed:
+        return
+    revision = next_revision(conn)
+    now = datetime.utcnow()
+    insert = dialect_insert(conn.dialect.name)
+    for chunk in chunked(list(rows), chunk_size):
+        stmt = insert(table).values([dict(row, removed=0, revision=revision, updated_at=now) for row in chunk])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.emp_id],
+            set_={column: stmt.excluded[column] for column in FEATURE_COLUMNS + ('removed', 'revision', 'updated_at')}
+        )
+        conn.execute(stmt)
+    for chunk in chunked(list(removed), chunk_size):
+        conn.execute(update(table).where(table.c.emp_id.in_(chunk))
+                     .values(removed=1, revision=revision, updated_at=now))
+
+
+def update_features(conn, changes):
+    """Set some columns of stored rows: changes is {emp_id: {column: value}}.
+
+    Employees without a row are skipped (the next full load adds them).
+    Returns the number of rows updated.
+    """
+    changes = {emp_id: values for emp_id, values in changes.items() if values}
+    if not changes:
+        return 0
+    unknown = {column for values in changes.values() for column in values} - set(FEATURE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Not employee feature columns: {', '.join(sorted(unknown))}")
+
+    # One executemany per set of columns
+    batches = {}
+    for emp_id, values in changes.items():
+        if 'skills' in values:
+            values = dict(values, skills=skills_json(values['skills']))
+        batches.setdefault(tuple(sorted(values)), []).append(
+            dict({f'new_{column}': value for column, value in values.items()}, key_emp_id=emp_id))
+
+    revision = next_revision(conn)
+    now = datetime.utcnow()
+    updated = 0
+    for columns, params in batches.items():
+        stmt = (update(employee_features)
+                .where(employee_features.c.emp_id == bindparam('key_emp_id'), employee_features.c.removed == 0)
+                .values(revision=revision, updated_at=now, **{column: bindparam(f'new_{column}') for column in columns}))
+        updated += conn.execute(stmt, params).rowcount
+    return updated
+
+
+def read_feature_rows(conn, after_revision=0):
+    """Rows (removed ones included) written after after_revision, in (revision, emp_id) order"""
+    table = employee_features
+    return conn.execute(
+        select(table.c.emp_id, *[table.c[column] for column in FEATURE_COLUMNS],
+               table.c.removed, table.c.revision)
+        .where(table.c.revision > after_revision)
+        .order_by(table.c.revision, table.c.emp_id)
+    ).fetchall()
+
+
+class FeatureSnapshot:
+    """Point-in-time copy of a FeatureStore's columns (what assignment_engine scores)"""
+
+    def __init__(self, emp_ids, names, roles, skills, skill_ids, experience, success_rate,
+                 tasks_completed, active_tasks):
+        self.emp_ids = emp_ids
+        self.names = names
+        self.roles = roles
+        self.skills = skills                    # skill name lists
+        self.skill_ids = skill_ids              # skill_vocabulary ids of each row
+        self.experience = experience            # array('q')
+        self.success_rate = success_rate        # array('d')
+        self.tasks_completed = tasks_completed  # array('q')
+        self.active_tasks = active_tasks        # array('q')
+
+    def __len__(self):
+        return len(self.emp_ids)
+
+    def records(self):
+        return [EmployeeFeatures(*values) for values in zip(
+            self.emp_ids, self.names, self.roles, self.skills, self.experience,
+            self.success_rate, self.tasks_completed, self.active_tasks)]
+
+
+class FeatureStore:
+    """Columnar in-memory copy of employee_features, one position per employee"""
+
+    COLUMNS = (('experience', 'q'), ('success_rate', 'd'), ('tasks_completed', 'q'), ('active_tasks', 'q'))
+
+    def __init__(self, vocabulary=VOCABULARY):
+        self.vocabulary = vocabulary
+        self.revision = 0       # highest revision applied
+        self.synced_at = None
+        self.refreshed_at = None  # last full reload of the table from its source (mark_refreshed)
+        self._lock = threading.RLock()
+        self._position = {}
+        self.emp_ids, self.names, self.roles, self.skills, self.skill_ids = [], [], [], [], []
+        for column, typecode in self.COLUMNS:
+            setattr(self, column, array(typecode))
+
+    def __len__(self):
+        return len(self.emp_ids)
+
+    def __contains__(self, emp_id):
+        return emp_id in self._position
+
+    def refresh_due(self, max_age):
+        """Whether the table's source should be reloaded (never was, or max_age seconds passed)"""
+        return (self.refreshed_at is None
+                or (max_age > 0 and time.monotonic() - self.refreshed_at >= max_age))
+
+    def mark_refreshed(self):
+        self.refreshed_at = time.monotonic()
+
+    def sync(self, conn):
+        """Apply the rows written since the last sync; returns them.
+
+        conn should see committed data only (not a transaction with its own
+        pending feature writes), so that the revision mark never runs ahead
+        of what was actually committed.
+        """
+        with self._lock:
+            rows = read_feature_rows(conn, self.revision)
+            self.apply(rows)
+            self.synced_at = datetime.utcnow()
+        return rows
+
+    def apply(self, rows):
+        """Apply rows from read_feature_rows (or with the same fields), in revision order"""
+        with self._lock:
+            for row in rows:
+                if row.removed:
+                    self._remove(row.emp_id)
+                else:
+                    self._set(row)
+                self.revision = max(self.revision, row.revision)
+
+    def _set(self, row):
+        skills = parse_skills(row.skills)
+        values = (row.name, row.role, skills, self.vocabulary.ids(skills))
+        numbers = (int(row.experience or 0), float(row.success_rate or 0.0),
+                   int(row.tasks_completed or 0), int(row.active_tasks or 0))
+        position = self._position.get(row.emp_id)
+        if position is None:
+            self._position[row.emp_id] = len(self.emp_ids)
+            self.emp_ids.append(row.emp_id)
+            for column, value in zip(('names', 'roles', 'skills', 'skill_ids'), values):
+                getattr(self, column).append(value)
+            for (column, _), value in zip(self.COLUMNS, numbers):
+                getattr(self, column).append(value)
+        else:
+            for column, value in zip(('names', 'roles', 'skills', 'skill_ids'), values):
+                getattr(self, column)[position] = value
+            for (column, _), value in zip(self.COLUMNS, numbers):
+                getattr(self, column)[position] = value
+
+    def _remove(self, emp_id):
+        """Drop emp_id by moving the last employee into its position"""
+        position = self._position.pop(emp_id, None)
+        if position is None:
+            return
+        last = len(self.emp_ids) - 1
+        columns = ['emp_ids', 'names', 'roles', 'skills', 'skill_ids'] + [column for column, _ in self.COLUMNS]
+        if position != last:
+            for column in columns:
+                values = getattr(self, column)
+                values[position] = values[last]
+            self._position[self.emp_ids[position]] = position
+        for column in columns:
+            getattr(self, column).pop()
+
+    def get(self, emp_id):
+        """EmployeeFeatures of one employee, or None"""
+        with self._lock:
+            position = self._position.get(emp_id)
+            if position is None:
+                return None
+            return self._record(position)
+
+    def records(self, emp_ids=None, role=None):
+        """EmployeeFeatures of emp_ids (default: everyone), optionally of one role, by emp_id"""
+        with self._lock:
+            if emp_ids is None:
+                positions = range(len(self.emp_ids))
+            else:
+                positions = [self._position[emp_id] for emp_id in emp_ids if emp_id in self._position]
+            records = [self._record(position) for position in positions
+                       if role is None or self.roles[position] == role]
+        return sorted(records, key=lambda record: record.emp_id)
+
+    def _record(self, position):
+        return EmployeeFeatures(
+            self.emp_ids[position], self.names[position], self.roles[position], list(self.skills[position]),
+            self.experience[position], self.success_rate[position], self.tasks_completed[position],
+            self.active_tasks[position])
+
+    def snapshot(self):
+        """FeatureSnapshot of every employee, in store order"""
+        with self._lock:
+            return FeatureSnapshot(
+                list(self.emp_ids), list(self.names), list(self.roles), list(self.skills), list(self.skill_ids),
+                *[array(typecode, getattr(self, column)) for column, typecode in self.COLUMNS])
@@ -2,6 +2,7 @@
 
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect as sa_inspect
 from werkzeug.security import check_password_hash, generate_password_hash
 import os
 import requests
@@ -9,6 +10,22 @@ import json
 import zipfile
 from dotenv import load_dotenv
 from email_services import send_credentials_email
+from migrations import upgrade as upgrade_database
+from db_engine import sqlite_engine_options, install_sqlite_pragmas
+from db_routing import RoutingSession, init_read_routing, read_only_route
+from sql_instrumentation import init_sql_instrumentation
+from pagination import paginate_tasks, parse_limit
+from serializers import build_task_projections, build_employee_projections
+from skill_index import SkillIndex
+from feature_store import FeatureStore, parse_skills, refresh_features
+from skill_vocabulary import canonical_skill
+from workload import ACTIVE_STATUSES, apply_workload_deltas, get_workload, reconcile_workload
+from outcomes import mark_forwarded, outcome_row, record_outcome, unforwarded_outcomes
+from recommendation_cache import (DEFAULT_MAX_ENTRIES, ROSTER, WORKLOAD, RecommendationCache,
+                                  bump_versions, read_versions, task_signature)
+import click
+import copy
+import heapq
 from datetime import datetime, timedelta
 import random
 
@@ -28,12 +45,23 @@ if not os.path.exists(app.config['UPLOAD_FOLDER']):
     os.makedirs(app.config['UPLOAD_FOLDER'])
 
 # Database configuration for local authentication
-db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'task_manager.db')
+# TASK_MANAGER_DB points at another SQLite file (benchmarks, scratch copies)
+db_path = os.environ.get('TASK_MANAGER_DB') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'task_manager.db')
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# Initialize database
-db = SQLAlchemy(app)
+# Engine profile: WAL, busy timeout and pool sizing (see db_engine.py)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = sqlite_engine_options()
+
+# Initialize database (reads in @read_only_route views go to a read-only engine)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
+init_read_routing(app, db_path)
+
+with app.app_context():
+    install_sqlite_pragmas(db.engine)
+
+# Per-request query count / DB time (Server-Timing header, N+1 warnings in debug)
+init_sql_instrumentation(app)
 
 # Define Employee Model (same as in setup_db.py)
 class Employee(db.Model):
@@ -55,6 +83,9 @@ class Employee(db.Model):
     success_rate = db.Column(db.Float, default=0.0)
     avatar_url = db.Column(db.String(255), nullable=True)
     
+    # Normalized copy of the skills JSON (skills / employee_skills tables)
+    skill_links = db.relationship('EmployeeSkill', cascade='all, delete-orphan')
+    
     def set_password(self, password):
         """Set password hash"""
         self.password_hash = generate_password_hash(password)
@@ -70,13 +101,67 @@ class Employee(db.Model):
             return []
     
     def set_skills_list(self, skills_list):
-        """Set skills list as JSON string"""
+        """Set skills list as JSON string and keep employee_skills in sync"""
         import json
         self.skills = json.dumps(skills_list) if skills_list else '[]'
+        
+        links = []
+        seen = set()
+        with db.session.no_autoflush:
+            for name in skills_list or []:
+                skill = Skill.get_or_create(name)
+                if skill and skill.name_folded not in seen:
+                    seen.add(skill.name_folded)
+                    links.append(EmployeeSkill(skill=skill))
+        self.skill_links = links
     
     def __repr__(self):
         return f'<Employee {self.emp_id}: {self.name}>'
 
+# Define Skill Model (case-folded, one row per distinct skill)
+class Skill(db.Model):
+    __tablename__ = 'skills'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)  # Display form as first entered
+    name_folded = db.Column(db.String(100), nullable=False)  # Canonical key, unique index in migration 5
+    
+    @staticmethod
+    def fold(name):
+        """Canonical lookup key for a skill name (case-folded, aliases resolved)"""
+        return canonical_skill(name)
+    
+    @classmethod
+    def get_or_create(cls, name):
+        """Return the Skill row for a name, adding it to the session if new"""
+        if not isinstance(name, str) or not name.strip():
+            return None
+        folded = cls.fold(name)
+        skill = cls.query.filter_by(name_folded=folded).first()
+        if not skill:
+            # Pending (not yet flushed) rows from this session
+            skill = next((obj for obj in db.session.new
+                          if isinstance(obj, cls) and obj.name_folded == folded), None)
+        if not skill:
+            skill = cls(name=name.strip(), name_folded=folded)
+            db.session.add(skill)
+        return skill
+    
+    def __repr__(self):
+        return f'<Skill {self.id}: {self.name}>'
+
+# Define EmployeeSkill Model (employee <-> skill link)
+class EmployeeSkill(db.Model):
+    __tablename__ = 'employee_skills'
+    
+    emp_id = db.Column(db.String(50), db.ForeignKey('employees.emp_id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), primary_key=True)
+    
+    skill = db.relationship('Skill')
+    
+    def __repr__(self):
+        return f'<EmployeeSkill {self.emp_id}: {self.skill_id}>'
+
 # Define Task Model
 class Task(db.Model):
     __tablename__ = 'tasks'
@@ -118,36 +203,12 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Relationships
+    assignee = db.relationship('Employee', foreign_keys=[assigned_to])
+    
     def to_dict(self):
         """Convert task to dictionary for JSON serialization"""
-        return {
-            'task_id': self.task_id,
-            'title': self.title,
-            'description': self.description,
-            'project_type': self.project_type,
-            'complexity': self.complexity,
-            'priority': self.priority,
-            'status': self.status,
-            'assigned_to': self.assigned_to,
-            'assigned_by': self.assigned_by,
-            'assigned_at': self.assigned_at.isoformat() if self.assigned_at else None,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'completion_date': self.completion_date.isoformat() if self.completion_date else None,
-            'submitted_at': self.submitted_at.isoformat() if self.submitted_at else None,
-            'success_rating': self.success_rating,
-            'feedback': self.feedback,
-            'spec_zip_path': self.spec_zip_path,
-            'spec_original_name': self.spec_original_name,
-            'spec_size_bytes': self.spec_size_bytes,
-            'spec_uploaded_at': self.spec_uploaded_at.isoformat() if self.spec_uploaded_at else None,
-            'submission_file_path': self.submission_file_path,
-            'submission_file_name': self.submission_file_name,
-            'has_spec_file': self.spec_zip_path is not None,
-            'has_submission_file': self.submission_file_path is not None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return TASK_PROJECTIONS['api'].serialize_object(self)
     
     def __repr__(self):
         return f'<Task {self.task_id}: {self.title}>'
@@ -205,6 +266,193 @@ class Notification(db.Model):
     def __repr__(self):
         return f'<Notification {self.id}: {self.type}>'
 
+# Named column projections for task / employee payloads (see serializers.py)
+TASK_PROJECTIONS = build_task_projections(Task, Employee)
+EMPLOYEE_PROJECTIONS = build_employee_projections(Employee)
+
+# In-memory skill -> developers index used by the recommender (see skill_index.py)
+SKILL_INDEX = SkillIndex()
+
+# Recent recommendation results, keyed on task signature and DB version counters
+RECOMMENDATION_CACHE = RecommendationCache(
+    int(os.environ.get('RECOMMENDATION_CACHE_SIZE', DEFAULT_MAX_ENTRIES)))
+
+# Columnar copy of employee_features, the recommender's scoring inputs (see feature_store.py)
+FEATURE_STORE = FeatureStore()
+
+def load_developer_skills():
+    """(emp_id, skills) for every developer, used to (re)build SKILL_INDEX"""
+    developers = []
+    for emp_id, skills in db.session.query(Employee.emp_id, Employee.skills).filter(Employee.role == 'developer'):
+        try:
+            developers.append((emp_id, json.loads(skills) if skills else []))
+        except (TypeError, ValueError):
+            developers.append((emp_id, []))
+    return developers
+
+@event.listens_for(db.session, 'after_flush')
+def collect_skill_index_changes(sess, flush_context):
+    """Remember flushed Employee changes; applied to SKILL_INDEX only on commit"""
+    pending = sess.info.setdefault('skill_index_changes', {})
+    for obj in list(sess.new) + list(sess.dirty):
+        if isinstance(obj, Employee):
+            pending[obj.emp_id] = (obj.role, obj.get_skills_list())
+    for obj in sess.deleted:
+        if isinstance(obj, Employee):
+            pending[obj.emp_id] = None
+
+@event.listens_for(db.session, 'after_commit')
+def apply_skill_index_changes(sess):
+    for emp_id, change in sess.info.pop('skill_index_changes', {}).items():
+        if change is None:
+            SKILL_INDEX.remove(emp_id)
+        else:
+            SKILL_INDEX.update(emp_id, *change)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_skill_index_changes(sess):
+    sess.info.pop('skill_index_changes', None)
+
+# Keep employee_workload counters in step with task status changes
+@event.listens_for(Task.status, 'set', active_history=True)
+@event.listens_for(Task.assigned_to, 'set', active_history=True)
+def load_previous_task_value(target, value, oldvalue, initiator):
+    """No-op; active_history loads the old value so the flush hook can see it"""
+
+def collect_workload_deltas(sess):
+    """Return {emp_id: {status: delta}} for the Task changes pending in a session"""
+    deltas = {}
+    
+    def add(emp_id, status, delta):
+        if emp_id and status:
+            counts = deltas.setdefault(emp_id, {})
+            counts[status] = counts.get(status, 0) + delta
+    
+    for obj in sess.new:
+        if isinstance(obj, Task):
+            add(obj.assigned_to, obj.status or 'assigned', 1)
+    
+    for obj in sess.deleted:
+        if isinstance(obj, Task):
+            state = sa_inspect(obj)
+            status = state.attrs.status.history
+            assigned_to = state.attrs.assigned_to.history
+            add((assigned_to.deleted or assigned_to.unchanged or [obj.assigned_to])[0],
+                (status.deleted or status.unchanged or [obj.status])[0], -1)
+    
+    for obj in sess.dirty:
+        if not isinstance(obj, Task):
+            continue
+        state = sa_inspect(obj)
+        status = state.attrs.status.history
+        assigned_to = state.attrs.assigned_to.history
+        if not (status.has_changes() or assigned_to.has_changes()):
+            continue
+        old_status = (status.deleted or status.unchanged or [None])[0]
+        old_assignee = (assigned_to.deleted or assigned_to.unchanged or [None])[0]
+        if (old_status, old_assignee) == (obj.status, obj.assigned_to):
+            continue
+        add(old_assignee, old_status, -1)
+        add(obj.assigned_to, obj.status, 1)
+    
+    return deltas
+
+@event.listens_for(db.session, 'before_flush')
+def update_employee_workload(sess, flush_context, instances):
+    """Apply workload counter changes in the same transaction as the task rows"""
+    deltas = collect_workload_deltas(sess)
+    if deltas:
+        apply_workload_deltas(sess.connection(), deltas)
+        # Their active_tasks feature changes too (refreshed after the flush)
+        sess.info.setdefault('feature_emp_ids', set()).update(deltas)
+    
+    removed = [obj.emp_id for obj in sess.deleted if isinstance(obj, Employee)]
+    if removed:
+        sess.connection().execute(
+            db.text("DELETE FROM employee_workload WHERE emp_id = :emp_id"),
+            [{'emp_id': emp_id} for emp_id in removed]
+        )
+
+# Employee columns a recommendation depends on (see recommendation_cache.py)
+ROSTER_FIELDS = ('name', 'role', 'skills', 'experience', 'success_rate', 'tasks_completed')
+
+def changed_cache_versions(sess):
+    """Names of the recommendation cache counters the pending session changes affect"""
+    names = set()
+    for obj in list(sess.new) + list(sess.deleted):
+        if isinstance(obj, Task):
+            names.add(WORKLOAD)
+        elif isinstance(obj, (Employee, Skill, EmployeeSkill)):
+            names.add(ROSTER)
+    for obj in sess.dirty:
+        if isinstance(obj, Task):
+            fields = ('status', 'assigned_to')
+        elif isinstance(obj, Employee):
+            fields = ROSTER_FIELDS
+        elif isinstance(obj, (Skill, EmployeeSkill)):
+            names.add(ROSTER)
+            continue
+        else:
+            continue
+        state = sa_inspect(obj)
+        if any(state.attrs[field].history.has_changes() for field in fields):
+            names.add(WORKLOAD if isinstance(obj, Task) else ROSTER)
+    return names
+
+@event.listens_for(db.session, 'before_flush')
+def bump_recommendation_versions(sess, flush_context, instances):
+    """Invalidate cached recommendations in the same transaction as the write"""
+    names = changed_cache_versions(sess)
+    if names:
+        bump_versions(sess.connection(), names)
+
+@event.listens_for(db.session, 'do_orm_execute')
+def bump_versions_for_bulk_writes(orm_execute_state):
+    """Bulk query.update() / query.delete() skip the flush hooks"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    entity = mapper.class_ if mapper is not None else None
+    if entity is Task:
+        bump_versions(orm_execute_state.session.connection(), [WORKLOAD])
+    elif entity in (Employee, Skill, EmployeeSkill):
+        bump_versions(orm_execute_state.session.connection(), [ROSTER])
+        if entity is Employee:
+            # Rows unknown here; employee_features is refreshed in full before commit
+            orm_execute_state.session.info['refresh_all_features'] = True
+
+@event.listens_for(db.session, 'after_flush')
+def refresh_employee_features(sess, flush_context):
+    """Recompute employee_features for the employees this flush touched (same transaction)"""
+    emp_ids = sess.info.pop('feature_emp_ids', set())
+    for obj in list(sess.new) + list(sess.deleted):
+        if isinstance(obj, Employee):
+            emp_ids.add(obj.emp_id)
+    for obj in sess.dirty:
+        if isinstance(obj, Employee):
+            state = sa_inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in ROSTER_FIELDS):
+                emp_ids.add(obj.emp_id)
+    if emp_ids:
+        refresh_features(sess.connection(), emp_ids)
+
+@event.listens_for(db.session, 'before_commit')
+def refresh_features_after_bulk_writes(sess):
+    if sess.info.pop('refresh_all_features', False):
+        refresh_features(sess.connection())
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_feature_changes(sess):
+    sess.info.pop('feature_emp_ids', None)
+    sess.info.pop('refresh_all_features', None)
+
+# Bring the schema up to date (versioned migrations and hot-path indexes)
+with app.app_context():
+    try:
+        upgrade_database(db.engine)
+    except Exception as e:
+        print(f"Error applying database migrations: {str(e)}")
+
 # Employee service configuration
 EMPLOYEE_SERVICE_URL = os.environ.get('EMPLOYEE_SERVICE_URL', 'http://localhost:5001/api')
 API_KEY = os.environ.get('API_KEY', 'dev_api_key')
@@ -227,6 +475,36 @@ def assign_tasks(tasks):
         return response.json()
     return None
 
+# Seconds to wait for the task service when forwarding outcome rows after a review
+OUTCOME_FORWARD_TIMEOUT = float(os.environ.get('OUTCOME_FORWARD_TIMEOUT', 2))
+
+def forward_outcomes(limit=500):
+    """Send outcome rows the task service has not accepted yet; returns how many it accepted.
+    
+    The task service learns the outcome model from them (see outcomes.py).
+    Rows stay pending when the service cannot be reached and go with the
+    next call.
+    """
+    try:
+        with db.engine.begin() as conn:
+            ids, rows = unforwarded_outcomes(conn, limit)
+            if not rows:
+                return 0
+            response = requests.post(
+                f'{TASK_SERVICE_URL}/task-service/outcomes',
+                json={'outcomes': rows},
+                headers=api_headers(),
+                timeout=OUTCOME_FORWARD_TIMEOUT
+            )
+            if response.status_code != 200:
+                print(f"Failed to forward outcomes: {response.status_code}, {response.text}")
+                return 0
+            mark_forwarded(conn, ids)
+            return len(ids)
+    except Exception as e:
+        print(f"Error forwarding outcomes: {str(e)}")
+        return 0
+
 def get_project_types():
     """Get all project types from task service with fallback to local definition"""
     try:
@@ -294,36 +572,9 @@ def format_date(date_str, format_str='%b %d, %Y'):
 def get_developer_tasks(emp_id):
     """Get all tasks assigned to a specific developer from local database"""
     try:
-        tasks = Task.query.filter_by(assigned_to=emp_id).all()
-        task_list = []
-        
-        for task in tasks:
-            task_dict = {
-                'task_id': task.task_id,
-                'title': task.title,
-                'description': task.description,
-                'project_type': task.project_type,
-                'complexity': task.complexity,
-                'priority': task.priority,
-                'status': task.status,
-                'assigned_to': task.assigned_to,
-                'assigned_by': task.assigned_by,
-                'due_date': task.due_date.isoformat() if task.due_date else None,
-                'start_date': task.start_date.isoformat() if task.start_date else None,
-                'completion_date': task.completion_date.isoformat() if task.completion_date else None,
-                'submitted_at': task.submitted_at.isoformat() if task.submitted_at else None,
-                'success_rating': task.success_rating,
-                'feedback': task.feedback,
-                'created_at': task.created_at.isoformat() if task.created_at else None,
-                'updated_at': task.updated_at.isoformat() if task.updated_at else None,
-                # Spec file metadata
-                'spec_zip_path': task.spec_zip_path,
-                'spec_original_name': task.spec_original_name,
-                'spec_size_bytes': task.spec_size_bytes,
-                'spec_uploaded_at': task.spec_uploaded_at.isoformat() if task.spec_uploaded_at else None,
-                'has_spec_file': task.spec_zip_path is not None
-            }
-            task_list.append(task_dict)
+        projection = TASK_PROJECTIONS['developer_list']
+        rows = projection.query(db.session).filter(Task.assigned_to == emp_id).all()
+        task_list = projection.serialize(rows)
         
         return task_list
     except Exception as e:
@@ -574,71 +825,132 @@ def save_submission_file(file, task_id):
 def get_active_tasks_count(emp_id):
     """Get count of active tasks for an employee (assigned or in_progress)"""
     try:
-        active_count = Task.query.filter(
-            Task.assigned_to == emp_id,
-            Task.status.in_(['assigned', 'in_progress'])
-        ).count()
-        return active_count
+        workload = get_workload(db.session.connection(), emp_id)
+        return sum(workload[status] for status in ACTIVE_STATUSES)
     except Exception as e:
         print(f"Error getting active tasks count for {emp_id}: {str(e)}")
         return 0
 
-def get_task_assignment_recommendation(task_data):
-    """Get the best employee recommendation for a task"""
+def sync_feature_store():
+    """Apply committed employee_features changes (of any process) to FEATURE_STORE and SKILL_INDEX.
+    
+    Reads on its own connection, so writes still pending in the request's
+    transaction are not picked up before they commit. Employee writes
+    refresh employee_features in their own transaction, so roster changes
+    committed by other workers reach the skill index here too, not only on
+    its periodic rebuild.
+    """
+    with db.engine.connect() as conn:
+        rows = FEATURE_STORE.sync(conn)
+    for row in rows:
+        if row.removed:
+            SKILL_INDEX.remove(row.emp_id)
+        else:
+            SKILL_INDEX.update(row.emp_id, row.role, parse_skills(row.skills))
+
+def get_skill_match_candidates(required_skills, min_match=50):
+    """Return [(features, skill_match_percentage)] for developers meeting the skill minimum.
+    
+    Matching is case-insensitive and uses SKILL_INDEX, so only developers that
+    share at least one required skill are looked at. Their scoring inputs,
+    active task count included, come from FEATURE_STORE (EmployeeFeatures
+    records, by emp_id), which costs one query for whatever changed since the
+    last recommendation. That sync also applies other workers' roster writes
+    to SKILL_INDEX, so the index is never behind the version counters a
+    cached result is stored under.
+    """
+    SKILL_INDEX.ensure_built(load_developer_skills)
+    sync_feature_store()
+    
+    if not any(isinstance(skill, str) and skill.strip() for skill in required_skills or []):
+        # No skills specified: every developer gets the default 50% match
+        return [(dev, 50) for dev in FEATURE_STORE.records(role='developer')]
+    
+    matches = SKILL_INDEX.match(required_skills, min_match)
+    if not matches:
+        return []
+    
+    return [(dev, matches[dev.emp_id]) for dev in FEATURE_STORE.records(matches, role='developer')]
+
+MAX_ACTIVE_TASKS = 3
+DEFAULT_RECOMMENDATIONS = 5
+MAX_RECOMMENDATIONS = 20
+
+def score_candidate(dev, skill_match, active_tasks):
+    """Score breakdown for one candidate (skill match + experience + success rate)"""
+    experience_score = min(dev.experience * 10, 50)  # Cap at 50
+    success_score = dev.success_rate * 0.5  # Max 50 from success rate
+    return {
+        'skill_match': skill_match,
+        'experience_score': experience_score,
+        'success_score': success_score,
+        'active_tasks': active_tasks,
+        'total': skill_match + experience_score + success_score
+    }
+
+def get_task_assignment_recommendations(task_data, k=DEFAULT_RECOMMENDATIONS):
+    """Get the top k employee recommendations for a task, best first.
+    
+    Results are cached per (skills, complexity, priority, k) until an
+    employee, skill or task status write bumps the version counters (see
+    recommendation_cache.py); callers get their own copy.
+    """
     try:
-        # Get all developers (only developers can be assigned tasks)
-        developers = Employee.query.filter_by(role='developer').all()
+        versions = read_versions(db.session.connection())
+        signature = task_signature(task_data, k)
+        recommendations = RECOMMENDATION_CACHE.get(signature, versions)
+        if recommendations is None:
+            recommendations = rank_assignment_candidates(task_data, k)
+            RECOMMENDATION_CACHE.put(signature, versions, recommendations)
+        return copy.deepcopy(recommendations)
         
-        if not developers:
-            return None
-            
-        required_skills = task_data.get('skills', [])
-        best_match = None
-        best_score = 0
-        
-        for dev in developers:
+    except Exception as e:
+        print(f"Error getting task assignment recommendations: {str(e)}")
+        return []
+
+def rank_assignment_candidates(task_data, k):
+    """Top k candidates for a task, best first (uncached).
+    
+    Candidates are kept in a bounded heap of size k instead of sorting all
+    of them; equal scores keep candidate order, so k=1 gives the same
+    developer as picking the first best score.
+    """
+    required_skills = task_data.get('skills', [])
+    
+    # Developers with at least a 50% skill match (only developers can be assigned tasks)
+    candidates = get_skill_match_candidates(required_skills)
+    
+    if not candidates:
+        return []
+    
+    def scored():
+        for dev, skill_match in candidates:
             # Check task limit (max 3 active tasks)
-            active_tasks = get_active_tasks_count(dev.emp_id)
-            if active_tasks >= 3:
+            active_tasks = dev.active_tasks
+            if active_tasks >= MAX_ACTIVE_TASKS:
                 print(f"Developer {dev.name} ({dev.emp_id}) has {active_tasks} active tasks - skipping")
                 continue
-            
-            dev_skills = dev.get_skills_list()
-            
-            # Calculate skill match percentage
-            if required_skills:
-                matching_skills = len([skill for skill in required_skills if skill in dev_skills])
-                skill_match = (matching_skills / len(required_skills)) * 100
-            else:
-                skill_match = 50  # Default score if no skills specified
-            
-            # Apply 50% minimum skill match requirement
-            if skill_match < 50:
-                print(f"Developer {dev.name} ({dev.emp_id}) has {skill_match:.1f}% skill match - below 50% minimum")
-                continue
-            
-            # Calculate overall score (skill match + experience + success rate)
-            experience_score = min(dev.experience * 10, 50)  # Cap at 50
-            success_score = dev.success_rate * 0.5  # Max 50 from success rate
-            
-            total_score = skill_match + experience_score + success_score
-            
-            if total_score > best_score:
-                best_score = total_score
-                best_match = {
-                    'emp_id': dev.emp_id,
-                    'name': dev.name,
-                    'skill_match_percentage': f"{skill_match:.1f}%",
-                    'match_score': f"{total_score:.1f}",
-                    'skills': dev_skills,
-                    'active_tasks': active_tasks
-                }
-        
-        return best_match
-        
-    except Exception as e:
-        print(f"Error getting task assignment recommendation: {str(e)}")
-        return None
+            breakdown = score_candidate(dev, skill_match, active_tasks)
+            if breakdown['total'] > 0:
+                yield dev, breakdown
+    
+    ranked = heapq.nlargest(k, scored(), key=lambda item: item[1]['total'])
+    
+    return [{
+        'rank': rank,
+        'emp_id': dev.emp_id,
+        'name': dev.name,
+        'skill_match_percentage': f"{breakdown['skill_match']:.1f}%",
+        'match_score': f"{breakdown['total']:.1f}",
+        'skills': dev.skills,
+        'active_tasks': breakdown['active_tasks'],
+        'breakdown': {key: value for key, value in breakdown.items() if key != 'total'}
+    } for rank, (dev, breakdown) in enumerate(ranked, start=1)]
+
+def get_task_assignment_recommendation(task_data):
+    """Get the best employee recommendation for a task"""
+    recommendations = get_task_assignment_recommendations(task_data, k=1)
+    return recommendations[0] if recommendations else None
 
 def get_faq_content(user_role):
     """Get role-specific FAQ content"""
@@ -704,29 +1016,10 @@ def get_faq_content(user_role):
 def get_pending_tasks():
     """Get all tasks that are submitted and waiting for approval"""
     try:
-        # Query tasks with 'submitted' status from the local database
-        pending_tasks = Task.query.filter_by(status='submitted').all()
-        
-        # Convert to list of dictionaries with employee info
-        task_list = []
-        for task in pending_tasks:
-            # Get employee info for the task
-            employee = Employee.query.filter_by(emp_id=task.assigned_to).first()
-            
-            task_dict = {
-                'task_id': task.task_id,
-                'title': task.title,
-                'description': task.description,
-                'project_type': task.project_type,
-                'complexity': task.complexity,
-                'priority': task.priority,
-                'status': task.status,
-                'assigned_to': task.assigned_to,
-                'assigned_to_name': employee.name if employee else 'Unknown',
-                'submitted_at': task.submitted_at.isoformat() if task.submitted_at else None,
-                'due_date': task.due_date.isoformat() if task.due_date else None
-            }
-            task_list.append(task_dict)
+        # Submitted tasks with the assignee's name, columns only (no ORM objects)
+        projection = TASK_PROJECTIONS['review_list']
+        rows = projection.query(db.session).filter(Task.status == 'submitted').all()
+        task_list = projection.serialize(rows)
         
         return task_list
         
@@ -1034,6 +1327,7 @@ def change_password():
     return render_template('change_password.html', first_login=first_login)
 
 @app.route('/developer_dashboard')
+@read_only_route
 def developer_dashboard():
     if 'emp_id' not in session:
         flash('Please log in to access the developer dashboard', 'warning')
@@ -1102,8 +1396,9 @@ def get_notification_count(emp_id):
         # 3. Recent task updates
         
         # For now, count assigned tasks + tasks submitted for approval as active notifications
-        assigned_count = Task.query.filter_by(assigned_to=emp_id, status='assigned').count()
-        submitted_count = Task.query.filter_by(assigned_to=emp_id, status='submitted').count()
+        workload = get_workload(db.session.connection(), emp_id)
+        assigned_count = workload['assigned']
+        submitted_count = workload['submitted']
         
         # You could also add more sophisticated notification logic here
         # For example: tasks with approaching due dates, feedback received, etc.
@@ -1279,6 +1574,7 @@ def assign_multiple_employees():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/project_manager_dashboard')
+@read_only_route
 def project_manager_dashboard():
     if 'emp_id' not in session or session['role'] != 'project manager':
         return redirect(url_for('index'))
@@ -1337,6 +1633,7 @@ def project_manager_dashboard():
 
 
 @app.route('/task_management')
+@read_only_route
 def task_management():
     if 'emp_id' not in session or session['role'] != 'project manager':
         flash('Access restricted to project managers', 'danger')
@@ -1346,6 +1643,7 @@ def task_management():
     status_filter = request.args.get('status', 'all')
     project_type_filter = request.args.get('project_type', 'all')
     assignee_filter = request.args.get('assignee', 'all')
+    cursor = request.args.get('cursor')
     
     # Get project types and their details
     project_types, project_type_details = get_project_types()
@@ -1354,41 +1652,21 @@ def task_management():
     employees = get_all_employees()
     
     try:
-        # Get all tasks from local database
-        query = Task.query
+        # Task rows with the assignee's name, only the columns the table shows
+        projection = TASK_PROJECTIONS['management_list']
+        query = projection.query(db.session)
         
         # Apply filters
         if status_filter != 'all':
-            query = query.filter_by(status=status_filter)
+            query = query.filter(Task.status == status_filter)
         if project_type_filter != 'all':
-            query = query.filter_by(project_type=project_type_filter)
+            query = query.filter(Task.project_type == project_type_filter)
         if assignee_filter != 'all':
-            query = query.filter_by(assigned_to=assignee_filter)
+            query = query.filter(Task.assigned_to == assignee_filter)
         
-        tasks_from_db = query.all()
-        
-        # Convert to list of dictionaries
-        tasks = []
-        for task in tasks_from_db:
-            # Get employee info
-            employee = Employee.query.filter_by(emp_id=task.assigned_to).first()
-            
-            task_dict = {
-                'task_id': task.task_id,
-                'title': task.title,
-                'description': task.description,
-                'project_type': task.project_type,
-                'complexity': task.complexity,
-                'priority': task.priority,
-                'status': task.status,
-                'assigned_to': task.assigned_to,
-                'assigned_to_name': employee.name if employee else 'Unknown',
-                'assigned_at': task.assigned_at.isoformat() if task.assigned_at else None,
-                'due_date': task.due_date.isoformat() if task.due_date else None,
-                'submitted_at': task.submitted_at.isoformat() if task.submitted_at else None,
-                'completion_date': task.completion_date.isoformat() if task.completion_date else None
-            }
-            tasks.append(task_dict)
+        # One page, newest first; "Load more" follows next_cursor
+        rows, next_cursor = paginate_tasks(query, Task, cursor, parse_limit(request.args.get('limit')))
+        tasks = projection.serialize(rows)
         
         # Categorize tasks by status for easier display
         pending_review_tasks = [task for task in tasks if task.get('status') == 'submitted']
@@ -1409,6 +1687,7 @@ def task_management():
             status_filter=status_filter,
             project_type_filter=project_type_filter,
             assignee_filter=assignee_filter,
+            next_cursor=next_cursor,
             format_date=format_date
         )
     
@@ -1452,6 +1731,18 @@ def approve_task():
         if task.status != 'submitted':
             return jsonify({'success': False, 'error': f'Cannot review task with status: {task.status}. Task must be submitted.'}), 400
         
+        # Training row for the outcome model, with the employee's metrics before this review
+        # (skills from the local catalogue: no task service round trip inside the transaction)
+        employee = Employee.query.filter_by(emp_id=task.assigned_to).first()
+        if employee:
+            record_outcome(db.session.connection(), outcome_row(
+                task.task_id, employee.emp_id, task.project_type, task.complexity, task.priority,
+                PROJECT_TYPES.get(task.project_type, []),
+                {'skills': employee.get_skills_list(), 'experience': employee.experience,
+                 'success_rate': employee.success_rate, 'tasks_completed': employee.tasks_completed},
+                outcome=action == 'approve', success_rating=5 if action == 'approve' else None,
+                source='main'))
+        
         # Update task based on action
         if action == 'approve':
             task.status = 'completed'
@@ -1459,7 +1750,6 @@ def approve_task():
             task.success_rating = 5  # Default rating for approved tasks
             
             # Update employee success rate
-            employee = Employee.query.filter_by(emp_id=task.assigned_to).first()
             if employee:
                 employee.tasks_completed = (employee.tasks_completed or 0) + 1
                 # Calculate new success rate (simple approach)
@@ -1483,6 +1773,9 @@ def approve_task():
         # Commit changes
         db.session.commit()
         
+        # Hand the outcome row to the task service's model (after the commit, so a failure cannot undo the review)
+        forward_outcomes()
+        
         return jsonify({
             'success': True, 
             'message': f'Task {action}ed successfully',
@@ -1833,31 +2126,10 @@ def get_pending_review_tasks():
         return jsonify({'success': False, 'error': 'Access restricted to project managers'}), 403
     
     try:
-        # Get tasks with 'submitted' status from local database
-        submitted_tasks = Task.query.filter_by(status='submitted').all()
-        
-        # Convert to list of dictionaries with employee info
-        tasks_data = []
-        for task in submitted_tasks:
-            # Get employee who submitted the task
-            employee = Employee.query.filter_by(emp_id=task.assigned_to).first()
-            
-            task_dict = {
-                'task_id': task.task_id,
-                'title': task.title,
-                'description': task.description,
-                'project_type': task.project_type,
-                'complexity': task.complexity,
-                'priority': task.priority,
-                'status': task.status,
-                'assigned_to': task.assigned_to,
-                'assigned_to_name': employee.name if employee else 'Unknown',
-                'assigned_by': task.assigned_by,
-                'submitted_at': task.submitted_at.isoformat() if task.submitted_at else None,
-                'due_date': task.due_date.isoformat() if task.due_date else None,
-                'created_at': task.created_at.isoformat() if task.created_at else None
-            }
-            tasks_data.append(task_dict)
+        # Get tasks with 'submitted' status (and the submitter's name) from local database
+        projection = TASK_PROJECTIONS['review_api']
+        rows = projection.query(db.session).filter(Task.status == 'submitted').all()
+        tasks_data = projection.serialize(rows)
         
         return jsonify({
             'success': True,
@@ -1879,52 +2151,26 @@ def task_details(task_id):
         return redirect(url_for('login'))
     
     try:
-        # Get task from local database
-        task = Task.query.filter_by(task_id=task_id).first()
+        # Get task from local database (detail columns only)
+        task_row = TASK_PROJECTIONS['detail'].query(db.session).filter(Task.task_id == task_id).first()
         
-        if not task:
+        if not task_row:
             flash('Task not found', 'danger')
             return redirect(url_for('index'))
         
-        # Get assigned employee details
-        assignee = None
-        if task.assigned_to:
-            assignee = Employee.query.filter_by(emp_id=task.assigned_to).first()
-        
         # Get task submission if exists
         submission = TaskSubmission.query.filter_by(task_id=task_id).first()
         
         # Convert task to dict format for template compatibility
-        task_dict = {
-            'task_id': task.task_id,
-            'title': task.title,
-            'description': task.description,
-            'status': task.status,
-            'priority': task.priority,
-            'project_type': task.project_type,
-            'complexity': task.complexity,
-            'estimated_hours': task.estimated_hours,
-            'deadline': task.deadline.isoformat() if task.deadline else None,
-            'assigned_to': task.assigned_to,
-            'created_at': task.created_at.isoformat() if task.created_at else None,
-            'updated_at': task.updated_at.isoformat() if task.updated_at else None,
-            'spec_zip_path': task.spec_zip_path,
-            'spec_original_name': task.spec_original_name,
-            'spec_size_bytes': task.spec_size_bytes,
-            'spec_uploaded_at': task.spec_uploaded_at.isoformat() if task.spec_uploaded_at else None
-        }
+        task_dict = TASK_PROJECTIONS['detail'].serialize_row(task_row)
         
-        # Convert assignee to dict if exists
+        # Assigned employee details
         assignee_dict = None
-        if assignee:
-            assignee_dict = {
-                'emp_id': assignee.emp_id,
-                'name': assignee.name,
-                'email': assignee.email,
-                'role': assignee.role,
-                'experience': assignee.experience,
-                'skills': assignee.get_skills_list()
-            }
+        if task_dict['assigned_to']:
+            projection = EMPLOYEE_PROJECTIONS['assignee']
+            assignee_row = projection.query(db.session).filter(Employee.emp_id == task_dict['assigned_to']).first()
+            if assignee_row:
+                assignee_dict = projection.serialize_row(assignee_row)
         
         # Convert submission to dict if exists
         submission_dict = None
@@ -1952,7 +2198,7 @@ def task_details(task_id):
             )
         else:
             # Check if current user is assigned to this task
-            is_assigned = (task.assigned_to == session.get('emp_id'))
+            is_assigned = (task_dict['assigned_to'] == session.get('emp_id'))
             
             return render_template(
                 'task_details.html',
@@ -1969,6 +2215,40 @@ def task_details(task_id):
         return redirect(url_for('index'))
 
 
+@app.route('/api/get_assignment_recommendations', methods=['POST'])
+def get_assignment_recommendations():
+    """Get the top K assignment recommendations for a task, with score breakdowns"""
+    if 'emp_id' not in session or session.get('role') != 'project manager':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        
+    task_data = request.json or {}
+    
+    try:
+        k = int(task_data.get('k', request.args.get('k', DEFAULT_RECOMMENDATIONS)))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'k must be an integer'}), 400
+    k = max(1, min(k, MAX_RECOMMENDATIONS))
+    
+    # Get skills for project type if not provided
+    if not task_data.get('skills'):
+        if not task_data.get('project_type'):
+            return jsonify({'success': False, 'error': 'skills or project_type is required'}), 400
+        task_data['skills'] = get_skills_for_project_type(task_data['project_type'])
+    
+    recommendations = get_task_assignment_recommendations(task_data, k)
+    return jsonify({
+        'success': bool(recommendations),
+        'k': k,
+        'recommendations': recommendations
+    })
+
+@app.route('/api/recommendation_cache/stats', methods=['GET'])
+def recommendation_cache_stats():
+    """Hit/miss/eviction counters of the recommendation cache"""
+    if 'emp_id' not in session or session.get('role') not in ('project manager', 'admin'):
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    return jsonify({'success': True, 'stats': RECOMMENDATION_CACHE.stats()})
+
 @app.route('/api/get_assignment_recommendation', methods=['POST'])
 def get_assignment_recommendation():
     """Get assignment recommendation for a task without saving it"""
@@ -2068,32 +2348,44 @@ def update_task_status():
 # Modified get_all_tasks function to ensure Task is defined
 @app.route('/api/task-service/tasks', methods=['GET'])
 def get_all_tasks():
-    """Get all tasks or filter by employee, status, etc."""
+    """Get tasks (one keyset page) or filter by employee, status, etc."""
     try:
         # Get query parameters for filtering
         emp_id = request.args.get('emp_id')
         status = request.args.get('status')
         project_type = request.args.get('project_type')
+        cursor = request.args.get('cursor')
         
-        # Start with base query - make sure Task is defined in this scope
-        query = Task.query
+        try:
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        # Start with base query (plain rows, same payload as Task.to_dict)
+        projection = TASK_PROJECTIONS['api']
+        query = projection.query(db.session)
         
         # Apply filters if provided
         if emp_id:
-            query = query.filter_by(assigned_to=emp_id)
+            query = query.filter(Task.assigned_to == emp_id)
         if status:
-            query = query.filter_by(status=status)
+            query = query.filter(Task.status == status)
         if project_type:
-            query = query.filter_by(project_type=project_type)
+            query = query.filter(Task.project_type == project_type)
             
-        # Execute query and convert to dict
-        tasks = query.all()
-        task_list = [task.to_dict() for task in tasks]
+        # Execute query for one page and convert to dict
+        try:
+            rows, next_cursor = paginate_tasks(query, Task, cursor, limit)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        task_list = projection.serialize(rows)
         
         return jsonify({
             'success': True,
             'tasks': task_list,
-            'count': len(task_list)
+            'count': len(task_list),
+            'limit': limit,
+            'next_cursor': next_cursor
         })
     except Exception as e:
         print(f"Error getting tasks: {str(e)}")
@@ -2533,6 +2825,7 @@ def test_email():
     return jsonify({"success": result})
 
 @app.route('/my_tasks')
+@read_only_route
 def my_tasks():
     """Show tasks assigned to the current developer"""
     if 'emp_id' not in session or session.get('role') != 'developer':
@@ -2542,36 +2835,29 @@ def my_tasks():
     # Get status filter from query parameters
     status_filter = request.args.get('status', 'all')
     
-    # Get tasks assigned to current employee
-    query = Task.query.filter_by(assigned_to=session['emp_id'])
+    # Get tasks assigned to current employee (only the columns the cards show)
+    projection = TASK_PROJECTIONS['my_tasks_list']
+    query = projection.query(db.session).filter(Task.assigned_to == session['emp_id'])
     
     # Apply status filter
     if status_filter != 'all':
-        query = query.filter_by(status=status_filter)
+        query = query.filter(Task.status == status_filter)
     
-    tasks = query.order_by(Task.created_at.desc()).all()
+    # One page, newest first; "Load more" follows next_cursor
+    try:
+        rows, next_cursor = paginate_tasks(query, Task, request.args.get('cursor'),
+                                           parse_limit(request.args.get('limit')))
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('my_tasks', status=status_filter))
     
-    # Convert to list of dictionaries
-    task_list = []
-    for task in tasks:
-        task_dict = {
-            'task_id': task.task_id,
-            'title': task.title,
-            'description': task.description,
-            'project_type': task.project_type,
-            'complexity': task.complexity,
-            'priority': task.priority,
-            'status': task.status,
-            'assigned_at': task.assigned_at.isoformat() if task.assigned_at else None,
-            'due_date': task.due_date.isoformat() if task.due_date else None,
-            'submitted_at': task.submitted_at.isoformat() if task.submitted_at else None,
-            'completion_date': task.completion_date.isoformat() if task.completion_date else None
-        }
-        task_list.append(task_dict)
+    task_list = projection.serialize(rows)
     
-    return render_template('my_tasks.html', tasks=task_list, status_filter=status_filter, format_date=format_date)
+    return render_template('my_tasks.html', tasks=task_list, status_filter=status_filter,
+                           next_cursor=next_cursor, format_date=format_date)
 
 @app.route('/notifications')
+@read_only_route
 def notifications():
     """Show notifications for the current user"""
     if 'emp_id' not in session:
@@ -2652,8 +2938,8 @@ def add_skill():
         # Get current skills
         current_skills = employee.get_skills_list()
         
-        # Check if skill already exists (case insensitive)
-        if skill.lower() in [s.lower() for s in current_skills]:
+        # Check if skill already exists (case insensitive, aliases count as the same skill)
+        if canonical_skill(skill) in {canonical_skill(s) for s in current_skills}:
             return jsonify({'success': False, 'error': 'Skill already exists'}), 400
         
         # Add new skill
@@ -2723,8 +3009,8 @@ def remove_skill():
         # Get current skills
         current_skills = employee.get_skills_list()
         
-        # Remove the skill (case insensitive)
-        updated_skills = [s for s in current_skills if s.lower() != skill.lower()]
+        # Remove the skill (case insensitive, any alias of it)
+        updated_skills = [s for s in current_skills if canonical_skill(s) != canonical_skill(skill)]
         
         if len(updated_skills) == len(current_skills):
             return jsonify({'success': False, 'error': 'Skill not found'}), 404
@@ -2744,5 +3030,33 @@ def logout():
     session.clear()
     return redirect(url_for('index'))
 
+# Command to rebuild workload counters: flask --app main reconcile-workload
+@app.cli.command('reconcile-workload')
+@click.option('--emp-id', default=None, help='Only reconcile one employee')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting the counters')
+def reconcile_workload_command(emp_id, dry_run):
+    """Rebuild employee_workload from the tasks table and report any drift"""
+    with db.engine.begin() as conn:
+        drift = reconcile_workload(conn, emp_id=emp_id, apply=not dry_run)
+        if drift and not dry_run:
+            refresh_features(conn, None if emp_id is None else [emp_id])
+
+    for entry in drift:
+        print(f"[DRIFT] {entry['emp_id']} {entry['status']}: stored={entry['stored']} actual={entry['actual']}")
+    action = 'found' if dry_run else 'fixed'
+    print(f"Workload counters reconciled: {len(drift)} drifted value(s) {action}")
+
+# Command to retry outcome rows the task service did not get: flask --app main forward-outcomes
+@app.cli.command('forward-outcomes')
+def forward_outcomes_command():
+    """Send pending assignment_outcomes rows to the task service"""
+    total = 0
+    while True:
+        sent = forward_outcomes()
+        total += sent
+        if not sent:
+            break
+    print(f"Outcome rows forwarded: {total}")
+
 if __name__ == '__main__':
     app.run(port=5000, debug=True)
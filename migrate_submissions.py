@@ -3,53 +3,19 @@
 Database migration script to add TaskSubmission table for developer submissions
 """
 
-import sqlite3
-from datetime import datetime
+from migrations import upgrade, get_engine
 
 def create_task_submissions_table():
-    """Create the task_submissions table"""
+    """Create the task_submissions table (migration 002 in migrations.py)"""
     print("=== CREATING TASK SUBMISSIONS TABLE ===")
     
     try:
-        # Connect to database
-        conn = sqlite3.connect('task_manager.db')
-        cursor = conn.cursor()
+        applied = upgrade(get_engine('task_manager.db'), target=2)
         
-        # Check if table already exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='task_submissions'")
-        if cursor.fetchone():
+        if 2 in applied:
+            print("[SUCCESS] Created task_submissions table and indexes")
+        else:
             print("[INFO] task_submissions table already exists")
-            conn.close()
-            return True
-        
-        # Create task_submissions table
-        cursor.execute('''
-            CREATE TABLE task_submissions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id VARCHAR(50) NOT NULL,
-                developer_id VARCHAR(50) NOT NULL,
-                submit_zip_path VARCHAR(500) NOT NULL,
-                submit_original_name VARCHAR(255) NOT NULL,
-                submit_size_bytes INTEGER NOT NULL,
-                submitted_at DATETIME NOT NULL,
-                notes TEXT,
-                FOREIGN KEY (task_id) REFERENCES tasks (task_id),
-                FOREIGN KEY (developer_id) REFERENCES employees (emp_id)
-            )
-        ''')
-        
-        print("[SUCCESS] Created task_submissions table")
-        
-        # Create indexes for better performance
-        cursor.execute('CREATE INDEX idx_task_submissions_task_id ON task_submissions (task_id)')
-        cursor.execute('CREATE INDEX idx_task_submissions_developer_id ON task_submissions (developer_id)')
-        cursor.execute('CREATE INDEX idx_task_submissions_submitted_at ON task_submissions (submitted_at)')
-        
-        print("[SUCCESS] Created indexes on task_submissions table")
-        
-        # Commit changes
-        conn.commit()
-        conn.close()
         
         return True
         
@@ -60,12 +26,11 @@ def create_task_submissions_table():
 def verify_table_structure():
     """Verify the table was created correctly"""
     try:
-        conn = sqlite3.connect('task_manager.db')
-        cursor = conn.cursor()
+        engine = get_engine('task_manager.db')
+        conn = engine.connect()
         
         # Check table structure
-        cursor.execute("PRAGMA table_info(task_submissions)")
-        columns = cursor.fetchall()
+        columns = conn.exec_driver_sql("PRAGMA table_info(task_submissions)").fetchall()
         
         print("\n=== TASK SUBMISSIONS TABLE STRUCTURE ===")
         for col in columns:
@@ -73,14 +38,14 @@ def verify_table_structure():
             print(f"{cid:2}: {name:25} {type_:15} {'NOT NULL' if notnull else 'NULL'} {'PK' if pk else ''}")
         
         # Check indexes
-        cursor.execute("PRAGMA index_list(task_submissions)")
-        indexes = cursor.fetchall()
+        indexes = conn.exec_driver_sql("PRAGMA index_list(task_submissions)").fetchall()
         
         print(f"\nIndexes created: {len(indexes)}")
         for idx in indexes:
             print(f"  - {idx[1]}")
         
         conn.close()
+        engine.dispose()
         return True
         
     except Exception as e:
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the Task Manager SQLite database.
+
+Every schema change is registered as a numbered migration. Applied versions
+are recorded in the ``schema_migrations`` table so each step runs exactly once
+per database. Secondary indexes for the hot query paths in main.py are
+declared in ``HOT_PATH_INDEXES`` together with the app queries they serve, so
+``explain`` can show (via EXPLAIN QUERY PLAN) which queries actually use them.
+
+Usage:
+    python migrations.py upgrade   # apply pending migrations
+    python migrations.py status    # list applied / pending migrations
+    python migrations.py explain   # report index usage for app queries
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, text
+
+from feature_store import create_features_table, refresh_features
+from outcomes import create_outcomes_table
+from recommendation_cache import create_versions_table
+from skill_vocabulary import canonical_skill
+from workload import create_workload_table, reconcile_workload
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'task_manager.db')
+
+# Registered migrations, kept sorted by version
+MIGRATIONS = []
+
+# Secondary indexes for the hot query paths. Each entry lists the app queries
+# (by the function that issues them) the index is meant to serve.
+HOT_PATH_INDEXES = [
+    {
+        'name': 'idx_tasks_assigned_to_status',
+        'table': 'tasks',
+        'columns': ['assigned_to', 'status'],
+        'migration': 3,
+        'queries': {
+            'count_workload_from_tasks (one employee)': (
+                "SELECT assigned_to, status, count(*) FROM tasks "
+                "WHERE status IN ('assigned', 'in_progress', 'submitted', 'completed') "
+                "AND assigned_to = :emp_id GROUP BY assigned_to, status"
+            ),
+            'get_developer_tasks': "SELECT * FROM tasks WHERE assigned_to = :emp_id",
+        }
+    },
+    {
+        'name': 'idx_tasks_status',
+        'table': 'tasks',
+        'columns': ['status'],
+        'migration': 3,
+        'queries': {
+            'get_pending_tasks': "SELECT * FROM tasks WHERE status = 'submitted'",
+            'project_manager_dashboard': (
+                "SELECT count(*) FROM tasks WHERE status IN ('assigned', 'in_progress')"
+            ),
+        }
+    },
+    {
+        'name': 'idx_tasks_project_type',
+        'table': 'tasks',
+        'columns': ['project_type'],
+        'migration': 3,
+        'queries': {
+            'task_management': "SELECT * FROM tasks WHERE project_type = :project_type",
+        }
+    },
+    {
+        'name': 'idx_notifications_emp_id_created_at',
+        'table': 'notifications',
+        'columns': ['emp_id', 'created_at'],
+        'migration': 3,
+        'queries': {
+            'notifications': (
+                "SELECT * FROM notifications WHERE emp_id = :emp_id "
+                "ORDER BY created_at DESC LIMIT 20"
+            ),
+        }
+    },
+    {
+        'name': 'idx_task_submissions_task_id',
+        'table': 'task_submissions',
+        'columns': ['task_id'],
+        'migration': 2,
+        'queries': {
+            'task_details': "SELECT * FROM task_submissions WHERE task_id = :task_id LIMIT 1",
+        }
+    },
+    {
+        'name': 'idx_tasks_created_at_task_id',
+        'table': 'tasks',
+        'columns': ['created_at', 'task_id'],
+        'migration': 4,
+        'queries': {
+            'get_all_tasks (page)': (
+                "SELECT * FROM tasks WHERE created_at IS NOT NULL "
+                "AND (created_at, task_id) < (:created_at, :task_id) "
+                "ORDER BY created_at DESC, task_id DESC LIMIT 51"
+            ),
+        }
+    },
+    {
+        'name': 'idx_tasks_assigned_to_created_at',
+        'table': 'tasks',
+        'columns': ['assigned_to', 'created_at', 'task_id'],
+        'migration': 4,
+        'queries': {
+            'my_tasks (page)': (
+                "SELECT * FROM tasks WHERE assigned_to = :emp_id AND created_at IS NOT NULL "
+                "AND (created_at, task_id) < (:created_at, :task_id) "
+                "ORDER BY created_at DESC, task_id DESC LIMIT 51"
+            ),
+        }
+    },
+    {
+        'name': 'idx_skills_name_folded',
+        'table': 'skills',
+        'columns': ['name_folded'],
+        'unique': True,
+        'migration': 5,
+        'queries': {
+            'get_skill_match_candidates (skill lookup)': "SELECT id FROM skills WHERE name_folded IN ('python', 'react')",
+        }
+    },
+    {
+        'name': 'idx_employee_skills_skill_id',
+        'table': 'employee_skills',
+        'columns': ['skill_id', 'emp_id'],
+        'migration': 5,
+        'queries': {
+            'get_skill_match_candidates': (
+                "SELECT e.emp_id, count(es.skill_id) FROM employees e "
+                "JOIN employee_skills es ON es.emp_id = e.emp_id "
+                "JOIN skills s ON s.id = es.skill_id "
+                "WHERE e.role = 'developer' AND s.name_folded IN ('python', 'react') "
+                "GROUP BY e.emp_id HAVING count(es.skill_id) * 100 >= 50 * 2"
+            ),
+        }
+    },
+]
+
+# Sample bind values used when explaining the queries above
+EXPLAIN_PARAMS = {
+    'emp_id': 'DEV001',
+    'project_type': 'website_development',
+    'task_id': 'TASK001',
+    'created_at': '2030-01-01 00:00:00',
+}
+
+
+def migration(version, name):
+    """Register a migration step; the decorated function receives a connection"""
+    def decorator(func):
+        MIGRATIONS.append({'version': version, 'name': name, 'upgrade': func})
+        MIGRATIONS.sort(key=lambda m: m['version'])
+        return func
+    return decorator
+
+
+def column_exists(conn, table, column):
+    """Check if a column exists in a table"""
+    return column in [col['name'] for col in inspect(conn).get_columns(table)]
+
+
+def table_exists(conn, table):
+    """Check if a table exists in the database"""
+    return inspect(conn).has_table(table)
+
+
+def create_index(conn, index):
+    """Create a declared index if it does not exist yet"""
+    columns = ', '.join(index['columns'])
+    unique = 'UNIQUE ' if index.get('unique') else ''
+    conn.execute(text(f"CREATE {unique}INDEX IF NOT EXISTS {index['name']} ON {index['table']} ({columns})"))
+
+
+def create_declared_indexes(conn, version):
+    """Create the HOT_PATH_INDEXES introduced by a given migration version"""
+    for index in HOT_PATH_INDEXES:
+        if index['migration'] == version and table_exists(conn, index['table']):
+            create_index(conn, index)
+
+
+@migration(1, 'zip_upload_columns')
+def add_zip_upload_columns(conn):
+    """Add spec/submission file columns to tasks (was migrate_database.py)"""
+    new_columns = [
+        ('spec_zip_path', 'VARCHAR(500)'),
+        ('spec_original_name', 'VARCHAR(255)'),
+        ('spec_size_bytes', 'INTEGER'),
+        ('spec_uploaded_at', 'DATETIME'),
+        ('submission_file_path', 'VARCHAR(500)'),
+        ('submission_file_name', 'VARCHAR(255)'),
+    ]
+    for column_name, column_type in new_columns:
+        if not column_exists(conn, 'tasks', column_name):
+            conn.execute(text(f"ALTER TABLE tasks ADD COLUMN {column_name} {column_type}"))
+
+
+@migration(2, 'task_submissions_table')
+def create_task_submissions_table(conn):
+    """Create the task_submissions table (was migrate_submissions.py)"""
+    conn.execute(text('''
+        CREATE TABLE IF NOT EXISTS task_submissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id VARCHAR(50) NOT NULL,
+            developer_id VARCHAR(50) NOT NULL,
+            submit_zip_path VARCHAR(500) NOT NULL,
+            submit_original_name VARCHAR(255) NOT NULL,
+            submit_size_bytes INTEGER NOT NULL,
+            submitted_at DATETIME NOT NULL,
+            notes TEXT,
+            FOREIGN KEY (task_id) REFERENCES tasks (task_id),
+            FOREIGN KEY (developer_id) REFERENCES employees (emp_id)
+        )
+    '''))
+    conn.execute(text('CREATE INDEX IF NOT EXISTS idx_task_submissions_task_id ON task_submissions (task_id)'))
+    conn.execute(text('CREATE INDEX IF NOT EXISTS idx_task_submissions_developer_id ON task_submissions (developer_id)'))
+    conn.execute(text('CREATE INDEX IF NOT EXISTS idx_task_submissions_submitted_at ON task_submissions (submitted_at)'))
+
+
+@migration(3, 'hot_path_indexes')
+def create_hot_path_indexes(conn):
+    """Create the secondary indexes used by dashboards and counters"""
+    create_declared_indexes(conn, 3)
+
+
+@migration(4, 'task_pagination_indexes')
+def create_task_pagination_indexes(conn):
+    """Indexes matching the (created_at, task_id) keyset order of task listings"""
+    create_declared_indexes(conn, 4)
+
+
+def backfill_employee_skills(conn):
+    """Populate skills / employee_skills from the legacy employees.skills JSON column"""
+    skill_ids = {row[1]: row[0] for row in conn.execute(text('SELECT id, name_folded FROM skills'))}
+
+    for emp_id, skills_json in conn.execute(text('SELECT emp_id, skills FROM employees')).fetchall():
+        try:
+            skills = json.loads(skills_json) if skills_json else []
+        except (TypeError, ValueError):
+            skills = []
+
+        for name in skills:
+            if not isinstance(name, str) or not name.strip():
+                continue
+            name = name.strip()
+            folded = name.casefold()
+            if folded not in skill_ids:
+                result = conn.execute(
+                    text('INSERT INTO skills (name, name_folded) VALUES (:name, :folded)'),
+                    {'name': name, 'folded': folded}
+                )
+                skill_ids[folded] = result.lastrowid
+            conn.execute(
+                text('INSERT OR IGNORE INTO employee_skills (emp_id, skill_id) VALUES (:emp_id, :skill_id)'),
+                {'emp_id': emp_id, 'skill_id': skill_ids[folded]}
+            )
+
+
+@migration(5, 'normalized_skills')
+def create_skill_tables(conn):
+    """Normalize employees.skills into skills + employee_skills and backfill them"""
+    conn.execute(text('''
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(100) NOT NULL,
+            name_folded VARCHAR(100) NOT NULL
+        )
+    '''))
+    conn.execute(text('''
+        CREATE TABLE IF NOT EXISTS employee_skills (
+            emp_id VARCHAR(50) NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY (emp_id, skill_id),
+            FOREIGN KEY (emp_id) REFERENCES employees (emp_id),
+            FOREIGN KEY (skill_id) REFERENCES skills (id)
+        )
+    '''))
+    create_declared_indexes(conn, 5)
+    backfill_employee_skills(conn)
+
+
+@migration(6, 'employee_workload')
+def create_employee_workload(conn):
+    """Add per-employee task counters and fill them from the tasks table"""
+    create_workload_table(conn)
+    reconcile_workload(conn)
+
+
+@migration(7, 'assignment_outcomes')
+def create_assignment_outcomes(conn):
+    """Add the table of reviewed assignments the outcome model learns from"""
+    create_outcomes_table(conn)
+
+
+@migration(8, 'canonical_skill_keys')
+def canonicalize_skill_keys(conn):
+    """Re-key skills.name_folded with canonical_skill, merging aliases of one skill.
+
+    The lowest id of each canonical key is kept; links to the other rows
+    are moved to it.
+    """
+    kept = {}
+    for skill_id, name, folded in conn.execute(text('SELECT id, name, name_folded FROM skills ORDER BY id')).fetchall():
+        key = canonical_skill(name) or folded
+        if key not in kept:
+            kept[key] = (skill_id, folded)
+            continue
+        params = {'keep': kept[key][0], 'old': skill_id}
+        conn.execute(text('INSERT OR IGNORE INTO employee_skills (emp_id, skill_id) '
+                          'SELECT emp_id, :keep FROM employee_skills WHERE skill_id = :old'), params)
+        conn.execute(text('DELETE FROM employee_skills WHERE skill_id = :old'), params)
+        conn.execute(text('DELETE FROM skills WHERE id = :old'), params)
+
+    for key, (skill_id, folded) in kept.items():
+        if key != folded:
+            conn.execute(text('UPDATE skills SET name_folded = :key WHERE id = :id'), {'key': key, 'id': skill_id})
+
+
+@migration(9, 'cache_versions')
+def create_cache_versions(conn):
+    """Add the version counters that invalidate cached recommendations"""
+    create_versions_table(conn)
+
+
+@migration(10, 'employee_features')
+def create_employee_features(conn):
+    """Add the precomputed per-employee scoring features and fill them"""
+    create_features_table(conn)
+    # Databases older than the employee metrics columns start empty; writes fill them in
+    if all(column_exists(conn, 'employees', column)
+           for column in ('skills', 'experience', 'success_rate', 'tasks_completed')):
+        refresh_features(conn)
+
+
+@migration(11, 'outcome_forwarding')
+def add_outcome_forwarding(conn):
+    """Track which outcome rows the task service accepted (see outcomes.py)"""
+    if not column_exists(conn, 'assignment_outcomes', 'forwarded_at'):
+        conn.execute(text('ALTER TABLE assignment_outcomes ADD COLUMN forwarded_at DATETIME'))
+
+
+def ensure_migrations_table(conn):
+    """Create the schema_migrations bookkeeping table"""
+    conn.execute(text('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    '''))
+
+
+def get_applied_versions(conn):
+    """Return the set of migration versions already applied"""
+    ensure_migrations_table(conn)
+    rows = conn.execute(text('SELECT version FROM schema_migrations')).fetchall()
+    return {row[0] for row in rows}
+
+
+def reset_migration_history(conn):
+    """Forget applied versions (used after the tables are dropped and recreated)"""
+    conn.execute(text('DROP TABLE IF EXISTS schema_migrations'))
+
+
+def upgrade(engine, target=None, verbose=True):
+    """Apply pending migrations up to target (or latest); returns applied versions"""
+    with engine.connect() as conn:
+        if not table_exists(conn, 'tasks'):
+            if verbose:
+                print("[SKIP] Base tables not found - run setup_db.py first")
+            return []
+
+    applied_now = []
+    for step in MIGRATIONS:
+        if target is not None and step['version'] > target:
+            break
+
+        # Each migration runs in its own transaction together with its bookkeeping row
+        with engine.begin() as conn:
+            if step['version'] in get_applied_versions(conn):
+                continue
+            step['upgrade'](conn)
+            conn.execute(
+                text('INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)'),
+                {'v': step['version'], 'n': step['name'], 't': datetime.utcnow()}
+            )
+
+        applied_now.append(step['version'])
+        if verbose:
+            print(f"[APPLIED] {step['version']:03d} {step['name']}")
+
+    return applied_now
+
+
+def migration_status(engine):
+    """Return a list of (version, name, applied) tuples"""
+    with engine.begin() as conn:
+        applied = get_applied_versions(conn)
+    return [(m['version'], m['name'], m['version'] in applied) for m in MIGRATIONS]
+
+
+def explain_query(conn, sql, params=None):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    rows = conn.execute(text(f'EXPLAIN QUERY PLAN {sql}'), params or {}).fetchall()
+    return [row[-1] for row in rows]
+
+
+def report_index_usage(engine):
+    """Report, per declared index, which app queries the planner uses it for"""
+    report = {}
+    with engine.connect() as conn:
+        for index in HOT_PATH_INDEXES:
+            entries = []
+            if table_exists(conn, index['table']):
+                for label, sql in index['queries'].items():
+                    plan = explain_query(conn, sql, EXPLAIN_PARAMS)
+                    uses_index = any(f"INDEX {index['name']}" in line for line in plan)
+                    # A full scan of the base table means no index serves the query at all
+                    full_scan = any(line.startswith(f"SCAN {index['table']}") and 'INDEX' not in line
+                                    for line in plan)
+                    entries.append({'query': label, 'uses_index': uses_index,
+                                    'full_scan': full_scan, 'plan': plan})
+            report[index['name']] = entries
+    return report
+
+
+def get_engine(db_path=DEFAULT_DB_PATH):
+    """Create an engine for a database file"""
+    return create_engine(f'sqlite:///{db_path}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Task Manager schema migrations')
+    parser.add_argument('command', nargs='?', default='upgrade', choices=['upgrade', 'status', 'explain'])
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Path to the SQLite database file')
+    parser.add_argument('--target', type=int, default=None, help='Migrate up to this version only')
+    args = parser.parse_args(argv)
+
+    engine = get_engine(args.db)
+
+    if args.command == 'upgrade':
+        print("=== DATABASE MIGRATION ===")
+        applied = upgrade(engine, target=args.target)
+        if applied:
+            print(f"\n[SUCCESS] Applied {len(applied)} migration(s).")
+        else:
+            print("\n[INFO] Database already up to date.")
+
+    elif args.command == 'status':
+        print("=== MIGRATION STATUS ===")
+        for version, name, applied in migration_status(engine):
+            print(f"{version:03d} {name:30} {'applied' if applied else 'pending'}")
+
+    elif args.command == 'explain':
+        print("=== INDEX USAGE (EXPLAIN QUERY PLAN) ===")
+        for index_name, entries in report_index_usage(engine).items():
+            print(f"\n{index_name}")
+            if not entries:
+                print("  (table missing)")
+            for entry in entries:
+                marker = 'USES' if entry['uses_index'] else 'SCAN' if entry['full_scan'] else 'OTHER'
+                print(f"  [{marker}] {entry['query']}: {' | '.join(entry['plan'])}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,222 @@
+# model_registry.py
+"""
+Versioned on-disk registry for the task assignment model, with an
+in-process cache.
+
+Layout (MODEL_REGISTRY_DIR, default ``model_registry/``):
+
+    CURRENT                      name of the live version (one line)
+    versions/<version>/model.pkl the pickled model_data dict
+    versions/<version>/serving.pkl
+                                 model_data with the model flattened into
+                                 NumPy arrays (compact_model.py), if it has
+                                 a compact form
+    versions/<version>/metadata.json
+                                 trained_at, employee_count, feature_columns
+    jobs/                        training job state shared between worker
+                                 processes (training_jobs.py)
+
+A version directory is written completely under a temporary name and then
+renamed, and CURRENT is replaced with os.replace, so a reader always sees
+either the old or the new model -- never a missing or half-written file.
+Published versions are never modified; old ones are pruned (the live one
+is always kept).
+
+``ModelRegistry.load()`` keeps the live model in memory and only stats
+CURRENT on later calls; the pickle is read again only when another
+publish (from this or any other process) moved the pointer.
+``load(serving=True)`` does the same with serving.pkl, which unpickles
+without scikit-learn; it is what request handlers should score with.
+"""
+
+import os
+import json
+import uuid
+import pickle
+import shutil
+import threading
+from datetime import datetime
+
+from compact_model import export_model_data
+
+DEFAULT_KEEP_VERSIONS = 5
+MODEL_FILE = 'model.pkl'
+SERVING_FILE = 'serving.pkl'
+
+
+class ModelRegistry:
+    """Versions of one model under a directory plus the cached live version"""
+
+    def __init__(self, root, legacy_path=None, keep_versions=DEFAULT_KEEP_VERSIONS):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.pointer_path = os.path.join(root, 'CURRENT')
+        self.legacy_path = legacy_path
+        self.keep_versions = keep_versions
+        self._cached = {}            # 'model' / 'serving' -> (pointer stat, version, model_data)
+        self._loaded_version = None
+        self._lock = threading.RLock()
+
+    # Reading
+
+    def _pointer_stat(self):
+        try:
+            stat = os.stat(self.pointer_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def current_version(self):
+        """Name of the live version, or None if nothing was published yet"""
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def metadata(self, version):
+        with open(os.path.join(self.versions_dir, version, 'metadata.json')) as f:
+            return json.load(f)
+
+    def list_versions(self):
+        """Metadata of every stored version, newest first"""
+        try:
+            names = os.listdir(self.versions_dir)
+        except FileNotFoundError:
+            return []
+        versions = []
+        for name in names:
+            if name.startswith('.'):
+                continue
+            try:
+                versions.append(self.metadata(name))
+            except (OSError, ValueError):
+                continue
+        return sorted(versions, key=lambda meta: meta['version'], reverse=True)
+
+    def _read_model(self, version):
+        with open(os.path.join(self.versions_dir, version, MODEL_FILE), 'rb') as f:
+            return pickle.load(f)
+
+    def _read_serving(self, version):
+        try:
+            with open(os.path.join(self.versions_dir, version, SERVING_FILE), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            # No compact form (or published before there was one): serve the original
+            return self._read_model(version)
+
+    def load(self, serving=False):
+        """The live model_data, from memory unless a new version was published.
+
+        With serving=True the model is the compact copy from serving.pkl
+        when the version has one. Returns None when the registry is empty
+        (and there is no legacy model file to import).
+        """
+        key = 'serving' if serving else 'model'
+        stat = self._pointer_stat()
+        cached = self._cached.get(key)
+        if cached is not None and stat is not None and cached[0] == stat:
+            return cached[2]
+
+        with self._lock:
+            stat = self._pointer_stat()
+            cached = self._cached.get(key)
+            if cached is not None and stat is not None and cached[0] == stat:
+                return cached[2]
+
+            if stat is None:
+                if not self._import_legacy():
+                    return None
+                stat = self._pointer_stat()
+
+            version = None
+            while True:
+                previous, version = version, self.current_version()
+                if cached is not None and cached[1] == version:
+                    model_data = cached[2]
+                    break
+                try:
+                    model_data = self._read_serving(version) if serving else self._read_model(version)
+                    break
+                except FileNotFoundError:
+                    # Pruned by another process between reading CURRENT and the pickle:
+                    # CURRENT moved on, read it again (the live version is never pruned)
+                    if version == previous:
+                        raise
+                    stat = self._pointer_stat()
+            self._cached[key] = (stat, version, model_data)
+            self._loaded_version = version
+            return model_data
+
+    @property
+    def loaded_version(self):
+        """Version held in memory by this process (None before the first load)"""
+        return self._loaded_version
+
+    # Writing
+
+    def publish(self, model_data, employee_count=None, trained_at=None, **extra):
+        """Store model_data as a new version and make it live; returns its metadata"""
+        trained_at = trained_at or datetime.utcnow()
+        version = f"{trained_at.strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+        metadata = dict(extra,
+                        version=version,
+                        trained_at=trained_at.isoformat(),
+                        employee_count=employee_count,
+                        feature_columns=list(model_data.get('feature_columns') or []),
+                        has_model=model_data.get('model') is not None)
+        try:
+            serving_data = export_model_data(model_data)
+        except Exception as e:
+            print(f"Error exporting compact model: {str(e)}")
+            serving_data = None
+        metadata['compact'] = serving_data is not None
+
+        os.makedirs(self.versions_dir, exist_ok=True)
+        staging = os.path.join(self.versions_dir, f'.{version}.tmp')
+        os.makedirs(staging)
+        try:
+            with open(os.path.join(staging, MODEL_FILE), 'wb') as f:
+                pickle.dump(model_data, f)
+            if serving_data is not None:
+                with open(os.path.join(staging, SERVING_FILE), 'wb') as f:
+                    pickle.dump(serving_data, f)
+            with open(os.path.join(staging, 'metadata.json'), 'w') as f:
+                json.dump(metadata, f, indent=2)
+            os.rename(staging, os.path.join(self.versions_dir, version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._write_pointer(version)
+        with self._lock:
+            stat = self._pointer_stat()
+            self._cached = {'model': (stat, version, model_data),
+                            'serving': (stat, version, serving_data or model_data)}
+            self._loaded_version = version
+        self.prune()
+        return metadata
+
+    def _write_pointer(self, version):
+        tmp_path = f'{self.pointer_path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(version + '\n')
+        os.replace(tmp_path, self.pointer_path)
+
+    def prune(self):
+        """Delete all but the newest keep_versions versions (never the live one)"""
+        live = self.current_version()
+        for meta in self.list_versions()[self.keep_versions:]:
+            if meta['version'] != live:
+                shutil.rmtree(os.path.join(self.versions_dir, meta['version']), ignore_errors=True)
+
+    def _import_legacy(self):
+        """Publish the pre-registry pickle (task_assignment_model.pkl) as the first version"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return False
+        with open(self.legacy_path, 'rb') as f:
+            model_data = pickle.load(f)
+        self.publish(model_data, trained_at=datetime.utcfromtimestamp(os.path.getmtime(self.legacy_path)),
+                     source=os.path.basename(self.legacy_path))
+        return True
@@ -0,0 +1,175 @@
+# outcomes.py
+"""
+Real assignment outcomes as training rows (the ``assignment_outcomes`` table).
+
+When a manager approves (completed) or rejects a submitted task, approve_task
+in main.py and in the task service records one row: the task/employee
+features the assignment model scores (FEATURE_COLUMNS, as they were before
+the review updated the employee's metrics) and the outcome, 1 for completed
+and 0 for rejected. The row is written in the same transaction as the review
+itself.
+
+The task service is the one that learns: main.py forwards its rows to the
+service's /api/task-service/outcomes endpoint after the review committed
+(forwarded_at marks the rows it accepted; rows that could not be sent go
+with the next batch or ``flask --app main forward-outcomes``).
+
+Rows are append-only and ids only grow, so a model remembers the last id it
+learned from and later updates read just the rows after it (see
+outcome_model.py). The table is defined with SQLAlchemy Core so the same
+code creates and fills it on SQLite (main.py) and PostgreSQL (task service);
+this module needs no numpy/pandas, since main.py does not install them.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (Column, DateTime, Float, Integer, MetaData, String, Table,
+                        func, select)
+
+from skill_vocabulary import VOCABULARY
+
+COMPLETED = 1
+REJECTED = 0
+
+# Model inputs stored per row, in training_data.FEATURE_COLUMNS order
+FEATURE_COLUMNS = ['complexity', 'priority', 'skill_match_percentage',
+                   'experience', 'success_rate', 'tasks_completed']
+
+metadata = MetaData()
+
+assignment_outcomes = Table(
+    'assignment_outcomes', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('task_id', String(50), nullable=False),
+    Column('emp_id', String(50), nullable=False),
+    Column('project_type', String(100)),
+    Column('complexity', Integer),
+    Column('priority', Integer),
+    Column('skill_match_percentage', Float),
+    Column('experience', Float),
+    Column('success_rate', Float),
+    Column('tasks_completed', Float),
+    Column('outcome', Integer, nullable=False),        # 1 completed, 0 rejected
+    Column('success_rating', Integer),
+    Column('source', String(20)),                      # 'main' or 'task_service'
+    Column('recorded_at', DateTime, nullable=False),
+    Column('forwarded_at', DateTime),                  # main.py: accepted by the task service
+)
+
+# Columns sent to the task service for a forwarded row
+FORWARDED_COLUMNS = ['task_id', 'emp_id', 'project_type'] + FEATURE_COLUMNS + [
+    'outcome', 'success_rating', 'source', 'recorded_at']
+
+
+def create_outcomes_table(conn):
+    """Create the assignment_outcomes table if it does not exist"""
+    assignment_outcomes.create(conn, checkfirst=True)
+
+
+def level_code(value):
+    """Low/Medium/High -> 0/1/2, the coding training_data uses"""
+    return 0 if value == "Low" else 1 if value == "Medium" else 2
+
+
+def skill_match_percentage(task_skills, employee_skills):
+    """Share of the task's skills the employee has, like the synthetic history"""
+    return VOCABULARY.match_percentage(task_skills, VOCABULARY.mask(employee_skills))
+
+
+def outcome_row(task_id, emp_id, project_type, complexity, priority, task_skills, employee,
+                outcome, success_rating=None, source=None):
+    """Training row for one reviewed assignment.
+
+    employee is a dict with skills/experience/success_rate/tasks_completed
+    (missing values are stored as NULL).
+    """
+    employee = employee or {}
+    return {
+        'task_id': task_id,
+        'emp_id': emp_id,
+        'project_type': project_type,
+        'complexity': level_code(complexity),
+        'priority': level_code(priority),
+        'skill_match_percentage': skill_match_percentage(task_skills, employee.get('skills')),
+        'experience': employee.get('experience'),
+        'success_rate': employee.get('success_rate'),
+        'tasks_completed': employee.get('tasks_completed'),
+        'outcome': COMPLETED if outcome else REJECTED,
+        'success_rating': success_rating,
+        'source': source,
+        'recorded_at': datetime.utcnow(),
+    }
+
+
+def record_outcome(conn, row):
+    """Insert one outcome row (in the caller's transaction)"""
+    conn.execute(assignment_outcomes.insert(), [row])
+
+
+def unforwarded_outcomes(conn, limit=500):
+    """(ids, JSON-ready rows) of outcomes not yet accepted by the task service, oldest first"""
+    columns = [assignment_outcomes.c.id] + [assignment_outcomes.c[name] for name in FORWARDED_COLUMNS]
+    rows = conn.execute(select(*columns)
+                        .where(assignment_outcomes.c.forwarded_at.is_(None))
+                        .order_by(assignment_outcomes.c.id).limit(limit)).fetchall()
+    payload = []
+    for row in rows:
+        values = dict(zip(FORWARDED_COLUMNS, row[1:]))
+        values['recorded_at'] = values['recorded_at'].isoformat()
+        payload.append(values)
+    return [row[0] for row in rows], payload
+
+
+def mark_forwarded(conn, ids):
+    """Record that the task service accepted these outcome rows"""
+    if ids:
+        conn.execute(assignment_outcomes.update()
+                     .where(assignment_outcomes.c.id.in_(ids))
+                     .values(forwarded_at=datetime.utcnow()))
+
+
+def record_forwarded_outcomes(conn, rows):
+    """Insert outcome rows forwarded by another app; returns how many were new.
+
+    A row already recorded (same source, task, employee and recorded_at)
+    is skipped, so a batch sent again after a lost response is harmless.
+    """
+    rows = [{**{name: row.get(name) for name in FORWARDED_COLUMNS},
+             'recorded_at': datetime.fromisoformat(row['recorded_at'])} for row in rows]
+    if not rows:
+        return 0
+    table = assignment_outcomes
+    existing = set(conn.execute(
+        select(table.c.source, table.c.task_id, table.c.emp_id, table.c.recorded_at)
+        .where(table.c.task_id.in_({row['task_id'] for row in rows}))
+    ).fetchall())
+    new_rows = []
+    for row in rows:
+        key = (row['source'], row['task_id'], row['emp_id'], row['recorded_at'])
+        if key not in existing:
+            existing.add(key)
+            new_rows.append(row)
+    if new_rows:
+        conn.execute(table.insert(), new_rows)
+    return len(new_rows)
+
+
+def count_outcomes(conn, after_id=0):
+    """{outcome: count} for rows with id > after_id"""
+    rows = conn.execute(
+        select(assignment_outcomes.c.outcome, func.count())
+        .where(assignment_outcomes.c.id > after_id)
+        .group_by(assignment_outcomes.c.outcome)
+    )
+    return {outcome: count for outcome, count in rows}
+
+
+def select_outcomes(after_id=0, limit=None):
+    """Query for id, FEATURE_COLUMNS and outcome of rows with id > after_id, in id order"""
+    columns = ['id'] + FEATURE_COLUMNS + ['outcome']
+    query = (select(*[assignment_outcomes.c[name] for name in columns])
+             .where(assignment_outcomes.c.id > after_id)
+             .order_by(assignment_outcomes.c.id))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
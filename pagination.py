@@ -0,0 +1,78 @@
+# pagination.py
+"""
+Keyset (cursor) pagination for task listings.
+
+Pages are ordered newest first by (created_at, task_id). The cursor is an
+opaque token holding the sort key of the last row of the previous page, so
+fetching any page is an index range scan of ``limit`` rows, no matter how deep
+the client has paged (unlike OFFSET, which re-reads every skipped row).
+
+Rows with a NULL created_at (legacy data) sort after all dated rows.
+"""
+
+import json
+import base64
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at, task_id):
+    """Build an opaque cursor from the sort key of a row"""
+    payload = json.dumps([created_at.isoformat() if created_at else None, task_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, task_id) from a cursor; raises ValueError if malformed"""
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return (datetime.fromisoformat(created_at) if created_at else None), str(task_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE):
+    """Clamp a user-supplied page size to 1..MAX_PAGE_SIZE"""
+    try:
+        limit = int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        raise ValueError('Invalid limit')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate_tasks(query, model, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Return (rows, next_cursor) for one page of a Task query.
+
+    model must have created_at and task_id columns. next_cursor is None on the
+    last page. Dated rows are read with a row-value range condition so the
+    (created_at, task_id) index can seek straight to the cursor position;
+    undated rows are only read once the dated ones are exhausted.
+    """
+    after_created_at, after_task_id = decode_cursor(cursor) if cursor else (None, None)
+
+    # One extra row tells us whether another page exists
+    rows = []
+    if not cursor or after_created_at is not None:
+        dated = query.filter(model.created_at.isnot(None))
+        if cursor:
+            dated = dated.filter(
+                tuple_(model.created_at, model.task_id) < tuple_(after_created_at, after_task_id)
+            )
+        rows = dated.order_by(model.created_at.desc(), model.task_id.desc()).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        undated = query.filter(model.created_at.is_(None))
+        if after_task_id is not None and after_created_at is None:
+            undated = undated.filter(model.task_id < after_task_id)
+        rows += undated.order_by(model.task_id.desc()).limit(limit + 1 - len(rows)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.task_id)
+    return rows, next_cursor
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Assignment policy simulator: replays the historical task stream through
+alternative assignment policies (discrete-event, offline).
+
+The tasks table gives, per task, when it was created, how long the assignee
+actually worked on it (start_date, or assigned_at, to submitted_at) and how
+long the review took (submitted_at to completion_date); rejected reviews in
+assignment_outcomes add rework rounds. Durations that were never recorded
+(open tasks, seeded rows) are estimated from the median of the recorded
+ones of the same complexity. The stream is then replayed against the
+current developer roster under each policy:
+
+- a task arriving is scored against every eligible developer (fewer than
+  max_active active tasks, skill match >= min_skill_match) with
+  assign_tasks_ml's custom score
+
+      skill_weight * match% / 100 + success_weight * success_rate / 100
+      + experience_weight * experience / 10,
+      x workload_penalty once the developer was given more than
+      penalty_above tasks in the last penalty_window_hours
+
+  and goes to the best one (ties: first developer). assign_tasks_ml counts
+  the tasks handed out earlier in the same batch for the penalty; a replay
+  has no request batches, so the tasks assigned within a rolling window
+  stand in for them (24 hours by default: a day's assignments). The model
+  term of the live scorer is left out, since it depends on the trained
+  model rather than on the policy. With no eligible developer the task
+  waits in a queue (fifo, or by priority with queue_order='priority').
+- developers work their active tasks one at a time, in assignment order,
+  each for its recorded duration, stretched by mismatch_slowdown x the
+  share of required skills the developer lacks (0 replays durations as
+  recorded). A submitted task frees the slot (it no longer counts towards
+  the cap, as in main.py); the slot goes to the first queued task the
+  developer is eligible for. After the review the task is completed, or,
+  for a rework round, back on the developer's list.
+
+Reported per policy: throughput (completed tasks per day), queue wait
+(creation to assignment), completion latency (creation to completion),
+developer utilization (share of the simulated span spent working) and
+tasks that never found an eligible developer.
+
+sweep() runs many policies on a process pool; the prepared stream is sent
+to each worker once, and one simulation of a few thousand tasks takes well
+under a second, so hundreds of combinations are a matter of minutes.
+
+Usage:
+    python policy_simulator.py                         # current policy on task_manager.db
+    python policy_simulator.py --grid skill_weight=0.5,0.7,0.9 max_active=2,3,4 --output sweep.json
+    python policy_simulator.py --database-url postgresql://... --employees employees.json
+"""
+
+import os
+import sys
+import json
+import heapq
+import bisect
+import argparse
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import create_engine, inspect, text
+
+from project_types import PROJECT_TYPES
+from skill_vocabulary import VOCABULARY
+
+DEFAULT_DB_PATH = os.environ.get('TASK_MANAGER_DB') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'task_manager.db')
+
+# assign_tasks_ml's weights and workload penalty, main.py's 3-active-task cap
+DEFAULT_POLICY = {
+    'skill_weight': 0.7,
+    'success_weight': 0.2,
+    'experience_weight': 0.1,
+    'workload_penalty': 0.8,
+    'penalty_above': 3,
+    'penalty_window_hours': 24.0,
+    'max_active': 3,
+    'min_skill_match': 0.0,
+    'mismatch_slowdown': 0.0,
+    'queue_order': 'fifo',
+}
+QUEUE_ORDERS = ('fifo', 'priority')
+
+# Estimates for durations nothing was recorded for (hours)
+DEFAULT_WORK_HOURS = {'Low': 8.0, 'Medium': 24.0, 'High': 72.0}
+DEFAULT_REVIEW_HOURS = 8.0
+# Task without skills: every developer matches 50%, like main.py's recommender
+NO_SKILLS_MATCH = 50.0
+
+HOUR = 3600.0
+DAY = 86400.0
+
+
+def level(value):
+    """Low/Medium/High -> 0/1/2 (anything else counts as High)"""
+    return 0 if value == "Low" else 1 if value == "Medium" else 2
+
+
+def as_datetime(value):
+    """DATETIME column value (SQLite returns text) -> datetime, or None"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def as_skill_list(value):
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return [skill for skill in value or [] if isinstance(skill, str)]
+
+
+def recorded_durations(task):
+    """(work_seconds, review_seconds) from the task's timestamps; None where not recorded"""
+    created = as_datetime(task.get('created_at'))
+    assigned = as_datetime(task.get('assigned_at')) or created
+    started = as_datetime(task.get('start_date'))
+    submitted = as_datetime(task.get('submitted_at'))
+    completed = as_datetime(task.get('completion_date'))
+    # start_date may be a planned date before the assignment
+    if started is None or (assigned is not None and started < assigned):
+        started = assigned
+
+    work = review = None
+    finished = submitted or completed
+    if started is not None and finished is not None and finished > started:
+        work = (finished - started).total_seconds()
+    if submitted is not None and completed is not None and completed >= submitted:
+        review = (completed - submitted).total_seconds()
+    return work, review
+
+
+class TaskStream:
+    """Tasks (by arrival) and developers as arrays, shared by every simulated policy"""
+
+    def __init__(self, tasks, developers, project_skills=PROJECT_TYPES):
+        """tasks: dicts with task_id, created_at, project_type / skills, complexity, priority,
+        recorded timestamps (see recorded_durations) and optional rework count;
+        developers: dicts with emp_id, skills, experience, success_rate."""
+        tasks = sorted((task for task in tasks if as_datetime(task.get('created_at')) is not None),
+                       key=lambda task: as_datetime(task['created_at']))
+        self.started_at = as_datetime(tasks[0]['created_at']) if tasks else None
+
+        # Developers: skill incidence over the skills they have (vocabulary ids -> columns)
+        self.emp_ids = [dev['emp_id'] for dev in developers]
+        dev_ids = [VOCABULARY.ids(as_skill_list(dev.get('skills'))) for dev in developers]
+        self.skill_columns = {skill_id: col for col, skill_id in
+                              enumerate(sorted({skill_id for ids in dev_ids for skill_id in ids}))}
+        self.dev_skills = np.zeros((len(developers), len(self.skill_columns)), dtype=np.float32)
+        for row, ids in enumerate(dev_ids):
+            self.dev_skills[row, [self.skill_columns[skill_id] for skill_id in ids]] = 1
+        self.dev_masks = [VOCABULARY.mask(as_skill_list(dev.get('skills'))) for dev in developers]
+        self.experience = np.array([dev.get('experience') or 0 for dev in developers], dtype=float)
+        self.success_rate = np.array([dev.get('success_rate') or 0 for dev in developers], dtype=float)
+
+        # Tasks
+        self.task_ids = [task['task_id'] for task in tasks]
+        self.arrival = np.array([(as_datetime(task['created_at']) - self.started_at).total_seconds()
+                                 for task in tasks], dtype=float)
+        self.priority = [level(task.get('priority')) for task in tasks]
+        self.rework = [int(task.get('rework') or 0) for task in tasks]
+        self.task_columns, self.task_masks, self.task_skill_counts = [], [], []
+        for task in tasks:
+            skills = task.get('skills')
+            if skills is None:
+                skills = project_skills.get(task.get('project_type'), [])
+            skill_ids = VOCABULARY.ids(as_skill_list(skills))
+            self.task_columns.append(np.array([self.skill_columns[skill_id] for skill_id in skill_ids
+                                               if skill_id in self.skill_columns], dtype=np.intp))
+            self.task_masks.append(VOCABULARY.mask(as_skill_list(skills)))
+            self.task_skill_counts.append(len(skill_ids))
+
+        # Recorded durations; missing ones are the median of the same complexity
+        recorded = [recorded_durations(task) for task in tasks]
+        complexities = [task.get('complexity') or 'Medium' for task in tasks]
+        self.work = self._fill(recorded, 0, complexities, DEFAULT_WORK_HOURS, DEFAULT_WORK_HOURS['Medium'])
+        self.review = self._fill(recorded, 1, complexities, {}, DEFAULT_REVIEW_HOURS)
+        self.estimated_work = sum(durations[0] is None for durations in recorded)
+        self.estimated_review = sum(durations[1] is None for durations in recorded)
+
+    @staticmethod
+    def _fill(recorded, index, complexities, default_hours, fallback_hours):
+        known = {}
+        for durations, complexity in zip(recorded, complexities):
+            if durations[index] is not None:
+                known.setdefault(complexity, []).append(durations[index])
+        everything = [value for values in known.values() for value in values]
+        medians = {complexity: float(np.median(values)) for complexity, values in known.items()}
+        overall = float(np.median(everything)) if everything else None
+        return np.array([
+            durations[index] if durations[index] is not None
+            else medians.get(complexity, overall if overall is not None
+                             else default_hours.get(complexity, fallback_hours) * HOUR)
+            for durations, complexity in zip(recorded, complexities)
+        ], dtype=float)
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    @property
+    def developer_count(self):
+        return len(self.emp_ids)
+
+    def match_percentages(self, task):
+        """Skill match % of every developer for one task"""
+        if not self.task_skill_counts[task]:
+            return np.full(self.developer_count, NO_SKILLS_MATCH)
+        counts = self.dev_skills[:, self.task_columns[task]].sum(axis=1)
+        return counts * (100.0 / self.task_skill_counts[task])
+
+    def match_percentage(self, task, dev):
+        """Skill match % of one developer for one task"""
+        if not self.task_skill_counts[task]:
+            return NO_SKILLS_MATCH
+        return (self.task_masks[task] & self.dev_masks[dev]).bit_count() * 100.0 / self.task_skill_counts[task]
+
+    def summary(self):
+        span = float(self.arrival[-1]) / DAY if len(self) else 0.0
+        return {
+            'tasks': len(self),
+            'developers': self.developer_count,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'arrival_span_days': round(span, 2),
+            'estimated_work_durations': self.estimated_work,
+            'estimated_review_durations': self.estimated_review,
+            'rework_rounds': sum(self.rework),
+        }
+
+
+def make_policy(overrides=None):
+    """DEFAULT_POLICY with overrides applied; raises ValueError for unknown or invalid values"""
+    policy = dict(DEFAULT_POLICY)
+    for name, value in (overrides or {}).items():
+        if name not in DEFAULT_POLICY:
+            raise ValueError(f"Unknown policy parameter: {name}")
+        policy[name] = value
+    if policy['queue_order'] not in QUEUE_ORDERS:
+        raise ValueError(f"queue_order must be one of {', '.join(QUEUE_ORDERS)}")
+    for name in ('max_active', 'penalty_above'):
+        policy[name] = int(policy[name])
+    for name in DEFAULT_POLICY:
+        if name != 'queue_order':
+            if name not in ('max_active', 'penalty_above'):
+                policy[name] = float(policy[name])
+            if policy[name] < 0:
+                raise ValueError(f"{name} must not be negative")
+    if policy['max_active'] < 1:
+        raise ValueError("max_active must be at least 1")
+    if policy['workload_penalty'] != 1 and policy['penalty_window_hours'] == 0:
+        raise ValueError("workload_penalty can never apply with penalty_window_hours=0 "
+                         "(use workload_penalty=1 to turn it off)")
+    return policy
+
+
+# Event kinds, in the order simultaneous events are handled
+WORK_DONE, REVIEW_DONE, ARRIVAL = 0, 1, 2
+
+
+def simulate(stream, policy=None):
+    """Replay stream under one policy (see make_policy); returns its metrics"""
+    policy = make_policy(policy)
+    n_tasks, n_devs = len(stream), stream.developer_count
+    max_active, min_match = policy['max_active'], policy['min_skill_match']
+    base_score = (policy['success_weight'] * stream.success_rate / 100
+                  + policy['experience_weight'] * stream.experience / 10)
+    by_priority = policy['queue_order'] == 'priority'
+
+    active = np.zeros(n_devs, dtype=np.intp)
+    # Tasks given to each developer within the penalty window, and when they were
+    recent = np.zeros(n_devs, dtype=np.intp)
+    recent_assignments = deque()
+    window = policy['penalty_window_hours'] * HOUR
+    busy = [False] * n_devs
+    busy_time = np.zeros(n_devs)
+    todo = [deque() for _ in range(n_devs)]
+    assignee = np.full(n_tasks, -1, dtype=np.intp)
+    match = np.zeros(n_tasks)
+    rework = list(stream.rework)
+    assigned_at = np.full(n_tasks, np.nan)
+    completed_at = np.full(n_tasks, np.nan)
+    waiting = []   # queued tasks as (order key, task)
+
+    events = [(float(stream.arrival[task]), ARRIVAL, task, -1) for task in range(n_tasks)]
+    heapq.heapify(events)
+
+    def assign(task, dev, now):
+        assignee[task] = dev
+        match[task] = stream.match_percentage(task, dev)
+        assigned_at[task] = now
+        active[dev] += 1
+        recent[dev] += 1
+        recent_assignments.append((now, dev))
+        todo[dev].append(task)
+        if not busy[dev]:
+            start_next(dev, now)
+
+    def start_next(dev, now):
+        task = todo[dev].popleft()
+        duration = stream.work[task] * (1 + policy['mismatch_slowdown'] * (1 - match[task] / 100))
+        busy[dev] = True
+        busy_time[dev] += duration
+        heapq.heappush(events, (now + duration, WORK_DONE, task, dev))
+
+    def choose(task, now):
+        """Best eligible developer for task, or -1"""
+        if not n_devs:
+            return -1
+        while recent_assignments and recent_assignments[0][0] <= now - window:
+            recent[recent_assignments.popleft()[1]] -= 1
+        percentages = stream.match_percentages(task)
+        scores = policy['skill_weight'] * percentages / 100 + base_score
+        scores = np.where(recent > policy['penalty_above'], scores * policy['workload_penalty'], scores)
+        eligible = (active < max_active) & (percentages >= min_match)
+        if not eligible.any():
+            return -1
+        return int(np.argmax(np.where(eligible, scores, -np.inf)))
+
+    def fill_slot(dev, now):
+        """A slot of dev opened: it takes the first queued task it is eligible for.
+
+        Queued tasks had no eligible developer, and only a submission lowers
+        a developer's active count, so dev is the only candidate.
+        """
+        if active[dev] >= max_active:
+            return
+        for position, (_, task) in enumerate(waiting):
+            if stream.match_percentage(task, dev) >= min_match:
+                del waiting[position]
+                assign(task, dev, now)
+                return
+
+    now = 0.0
+    while events:
+        now, kind, task, dev = heapq.heappop(events)
+        if kind == ARRIVAL:
+            best = choose(task, now)
+            if best >= 0:
+                assign(task, best, now)
+            else:
+                key = (-stream.priority[task], task) if by_priority else (task,)
+                bisect.insort(waiting, (key, task))
+        elif kind == WORK_DONE:
+            # Submitted: no longer active, off to review
+            busy[dev] = False
+            active[dev] -= 1
+            heapq.heappush(events, (now + stream.review[task], REVIEW_DONE, task, dev))
+            if todo[dev]:
+                start_next(dev, now)
+            fill_slot(dev, now)
+        elif rework[task]:
+            # Rejected: back on the developer's list (above the cap if need be, as in main.py)
+            rework[task] -= 1
+            active[dev] += 1
+            todo[dev].append(task)
+            if not busy[dev]:
+                start_next(dev, now)
+        else:
+            completed_at[task] = now
+
+    return metrics(stream, assigned_at, completed_at, busy_time, now)
+
+
+def distribution(values_seconds):
+    """mean / p50 / p95 / max in hours of the finite values"""
+    values = values_seconds[np.isfinite(values_seconds)] / HOUR
+    if not len(values):
+        return {'mean': None, 'p50': None, 'p95': None, 'max': None}
+    return {
+        'mean': round(float(values.mean()), 2),
+        'p50': round(float(np.percentile(values, 50)), 2),
+        'p95': round(float(np.percentile(values, 95)), 2),
+        'max': round(float(values.max()), 2),
+    }
+
+
+def metrics(stream, assigned_at, completed_at, busy_time, end):
+    span_days = max(end, float(stream.arrival[-1]) if len(stream) else 0.0) / DAY
+    completed = int(np.isfinite(completed_at).sum())
+    utilization = busy_time / (span_days * DAY) if span_days > 0 else np.zeros_like(busy_time)
+    return {
+        'completed': completed,
+        'unassigned': int(np.isnan(assigned_at).sum()),
+        'span_days': round(span_days, 2),
+        'throughput_per_day': round(completed / span_days, 3) if span_days > 0 else None,
+        'queue_wait_hours': distribution(assigned_at - stream.arrival),
+        'completion_latency_hours': distribution(completed_at - stream.arrival),
+        'utilization': {
+            'mean': round(float(utilization.mean()), 4) if len(utilization) else None,
+            'max': round(float(utilization.max()), 4) if len(utilization) else None,
+            'idle_developers': int((busy_time == 0).sum()),
+        },
+    }
+
+
+# Process pool workers keep the stream they were started with
+_WORKER_STREAM = None
+
+
+def _init_worker(stream):
+    global _WORKER_STREAM
+    _WORKER_STREAM = stream
+
+
+def _simulate_in_worker(policy):
+    return simulate(_WORKER_STREAM, policy)
+
+
+def sweep(stream, policies, workers=None):
+    """[{'policy', 'metrics'}] for every policy (dict of overrides), in order.
+
+    Runs on a pool of workers processes (default: one per CPU); the stream
+    is pickled once per worker, not once per policy.
+    """
+    policies = [make_policy(policy) for policy in policies]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(policies) <= 1:
+        results = [simulate(stream, policy) for policy in policies]
+    else:
+        chunksize = max(1, len(policies) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stream,)) as pool:
+            results = list(pool.map(_simulate_in_worker, policies, chunksize=chunksize))
+    return [{'policy': policy, 'metrics': result} for policy, result in zip(policies, results)]
+
+
+def policy_grid(specs):
+    """Cartesian product of 'name=v1,v2,...' specs -> list of override dicts"""
+    axes = []
+    for spec in specs or []:
+        name, _, values = spec.partition('=')
+        if name not in DEFAULT_POLICY or not values:
+            raise ValueError(f"Expected <parameter>=<v1>,<v2>,... with a parameter of {', '.join(DEFAULT_POLICY)}: {spec}")
+        parse = str if name == 'queue_order' else float
+        axes.append([(name, parse(value)) for value in values.split(',')])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+
+def load_stream(engine, since=None, until=None, employees=None, project_skills=PROJECT_TYPES):
+    """TaskStream from a tasks table (main.py's SQLite or the task service's database).
+
+    Developers are the employees table's (role developer) unless employees
+    (dicts, e.g. the employee service's /employees) is given.
+    """
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        columns = {column['name'] for column in inspector.get_columns('tasks')}
+        wanted = ['task_id', 'project_type', 'complexity', 'priority', 'created_at', 'assigned_at',
+                  'start_date', 'submitted_at', 'completion_date', 'skills']
+        selected = [column for column in wanted if column in columns]
+        sql = f"SELECT {', '.join(selected)} FROM tasks WHERE created_at IS NOT NULL"
+        params = {}
+        if since:
+            sql += " AND created_at >= :since"
+            params['since'] = since
+        if until:
+            sql += " AND created_at < :until"
+            params['until'] = until
+        tasks = [dict(row._mapping) for row in conn.execute(text(sql), params)]
+
+        if inspector.has_table('assignment_outcomes'):
+            rejected = dict(conn.execute(text(
+                "SELECT task_id, count(*) FROM assignment_outcomes WHERE outcome = 0 GROUP BY task_id")).fetchall())
+            for task in tasks:
+                task['rework'] = rejected.get(task['task_id'], 0)
+
+        if employees is None:
+            employees = [] if not inspector.has_table('employees') else [dict(row._mapping) for row in conn.execute(text(
+                "SELECT emp_id, skills, experience, success_rate FROM employees WHERE role = 'developer' "
+                "ORDER BY emp_id"))]
+    developers = [emp for emp in employees if isinstance(emp, dict) and 'emp_id' in emp
+                  and str(emp.get('role', 'developer')).strip().lower() == 'developer']
+    return TaskStream(tasks, developers, project_skills)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay the task stream through assignment policies')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='SQLite database with the tasks table')
+    parser.add_argument('--database-url', default=None, help='SQLAlchemy URL instead of --db')
+    parser.add_argument('--employees', default=None, help='JSON file of employees (default: employees table)')
+    parser.add_argument('--project-skills', default=None, help='JSON file of project type -> skills')
+    parser.add_argument('--since', default=None, help='Only tasks created at or after this date')
+    parser.add_argument('--until', default=None, help='Only tasks created before this date')
+    parser.add_argument('--grid', nargs='*', default=[], metavar='NAME=V1,V2',
+                        help=f"Policy values to sweep ({', '.join(DEFAULT_POLICY)}); the current policy if omitted")
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output', default=None, help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    try:
+        policies = policy_grid(args.grid) if args.grid else [{}]
+        for policy in policies:
+            make_policy(policy)
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+
+    employees = project_skills = None
+    if args.employees:
+        with open(args.employees) as f:
+            employees = json.load(f)
+    if args.project_skills:
+        with open(args.project_skills) as f:
+            project_skills = json.load(f)
+
+    engine = create_engine(args.database_url or f'sqlite:///{args.db}')
+    try:
+        stream = load_stream(engine, args.since, args.until, employees, project_skills or PROJECT_TYPES)
+    finally:
+        engine.dispose()
+
+    started = datetime.utcnow()
+    results = sweep(stream, policies, args.workers)
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    for result in results:
+        overrides = {name: value for name, value in result['policy'].items() if value != DEFAULT_POLICY[name]}
+        m = result['metrics']
+        print(f"  {json.dumps(overrides) if overrides else 'current policy'}: "
+              f"throughput={m['throughput_per_day']}/day wait_p95={m['queue_wait_hours']['p95']}h "
+              f"latency_p95={m['completion_latency_hours']['p95']}h "
+              f"utilization={m['utilization']['mean']} unassigned={m['unassigned']}", file=sys.stderr)
+
+    report = {
+        'simulator': 'assignment_policies',
+        'created_at': started.isoformat(timespec='seconds'),
+        'stream': stream.summary(),
+        'policies': len(results),
+        'elapsed_seconds': round(elapsed, 2),
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
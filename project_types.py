@@ -0,0 +1,49 @@
+# project_types.py
+"""
+Project types and the skills each one requires.
+
+The task service derives a task's skills from its project type with this
+catalogue; offline tools (benchmarks, policy_simulator.py) import it from
+here because the service module needs a PostgreSQL driver to import.
+main.py keeps its own smaller PROJECT_TYPES as a fallback for when the
+task service is unreachable.
+"""
+
+PROJECT_TYPES = {
+    "website_development": [
+        "HTML", "CSS", "JavaScript", "React", "Vue", "Angular", "Node.js", 
+        "PHP", "UI/UX", "Responsive Design", "Web Security"
+    ],
+    "mobile_app_development": [
+        "Swift", "Kotlin", "React Native", "Flutter", "Java", "Mobile UI/UX", 
+        "Firebase", "App Store Optimization"
+    ],
+    "machine_learning": [
+        "Python", "TensorFlow", "PyTorch", "Scikit-learn", "NLP", "Computer Vision", 
+        "Data Mining", "Statistics", "Feature Engineering"
+    ],
+    "data_engineering": [
+        "SQL", "ETL", "Data Warehouse", "Spark", "Hadoop", "Data Modeling", 
+        "MongoDB", "PostgreSQL", "AWS Redshift"
+    ],
+    "api_development": [
+        "REST API", "GraphQL", "Node.js", "Django", "Flask", "API Security",
+        "API Testing", "API Documentation", "Microservices"
+    ],
+    "devops": [
+        "Docker", "Kubernetes", "CI/CD", "AWS", "Azure", "GCP", "Jenkins",
+        "Terraform", "Ansible", "System Administration"
+    ],
+    "blockchain": [
+        "Solidity", "Smart Contracts", "Ethereum", "Web3.js", "DApps",
+        "Blockchain Security", "Consensus Algorithms"
+    ],
+    "cybersecurity": [
+        "Network Security", "Penetration Testing", "Vulnerability Assessment",
+        "Security Auditing", "Encryption", "Ethical Hacking", "OWASP"
+    ],
+    "game_development": [
+        "Unity", "Unreal Engine", "C#", "C++", "Game Design", "3D Modeling",
+        "Animation", "Physics Simulation", "Multiplayer Networking"
+    ]
+}
@@ -0,0 +1,141 @@
+# recommendation_cache.py
+"""
+Bounded LRU cache for assignment recommendations, invalidated by version
+counters stored in the database.
+
+A recommendation depends on the developers and their skills (the roster)
+and on how many active tasks each has (the workload). main.py bumps the
+``roster`` counter in the ``cache_versions`` table whenever an Employee,
+Skill or EmployeeSkill row is written, and the ``workload`` counter whenever
+a task is created, deleted, reassigned or changes status -- in the same
+transaction as the write, from its flush hook. Cache keys include both
+counters, so an answer computed before a write can never be returned after
+it, in this or any other worker process; reading the counters is one
+primary-key query instead of a scan of all developers.
+
+Writes made with raw SQL bypass the hook; call bump_versions for them.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import text
+
+from skill_vocabulary import VOCABULARY
+
+ROSTER = 'roster'
+WORKLOAD = 'workload'
+DEFAULT_MAX_ENTRIES = 256
+
+
+def create_versions_table(conn):
+    """Create the cache_versions table if it does not exist"""
+    conn.execute(text('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name VARCHAR(50) PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME
+        )
+    '''))
+
+
+def bump_versions(conn, names):
+    """Increment the named counters (in the caller's transaction)"""
+    now = datetime.utcnow()
+    for name in sorted(set(names)):
+        conn.execute(
+            text("INSERT INTO cache_versions (name, version, updated_at) VALUES (:name, 0, :now) "
+                 "ON CONFLICT (name) DO NOTHING"),
+            {'name': name, 'now': now}
+        )
+        conn.execute(
+            text("UPDATE cache_versions SET version = version + 1, updated_at = :now WHERE name = :name"),
+            {'name': name, 'now': now}
+        )
+
+
+def read_versions(conn):
+    """(roster version, workload version); counters never bumped read as 0"""
+    versions = dict(conn.execute(text("SELECT name, version FROM cache_versions")).fetchall())
+    return versions.get(ROSTER, 0), versions.get(WORKLOAD, 0)
+
+
+def task_signature(task_data, k):
+    """Cache key part for a task: normalized skill set, complexity, priority and k"""
+    skills = task_data.get('skills') or []
+    if isinstance(skills, str):
+        skills = [skills]
+    return (tuple(sorted(VOCABULARY.keys(skills))), task_data.get('complexity'),
+            task_data.get('priority'), k)
+
+
+class RecommendationCache:
+    """LRU of recommendation lists keyed by (task signature, versions)"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _current(self, versions):
+        """Move to newer versions; False if versions are older than the cached ones"""
+        if versions == self._versions:
+            return True
+        if self._versions is not None and not all(new >= old for new, old in zip(versions, self._versions)):
+            return False  # read before a write another request already saw
+        # Entries of older versions can never be hit again; drop them at once
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._versions = versions
+        return True
+
+    def get(self, signature, versions):
+        """Cached value or None (counted as a hit / miss)"""
+        with self._lock:
+            value = self._entries.get(signature) if self._current(versions) else None
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(signature)
+            self.hits += 1
+            return value
+
+    def put(self, signature, versions, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if not self._current(versions):
+                return
+            self._entries[signature] = value
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'roster_version': self._versions[0] if self._versions else None,
+            'workload_version': self._versions[1] if self._versions else None,
+        }
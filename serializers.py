@@ -0,0 +1,183 @@
+# serializers.py
+"""
+Column-projected serializers for task and employee payloads.
+
+Each view declares a named projection: the fields it renders and where each
+one comes from. A projection selects only those columns (plus the sort keys
+pagination needs) as plain rows, so wide Text columns a view never shows are
+not read, and no ORM instances or identity-map entries are created. The
+row -> dict conversion is compiled once per projection into a list of
+(key, position, converter) steps.
+
+    projection = TASK_PROJECTIONS['review_list']
+    rows = projection.query(db.session).filter(Task.status == 'submitted').all()
+    tasks = projection.serialize(rows)
+"""
+
+import json
+
+from sqlalchemy import DateTime
+
+
+def iso(value):
+    """ISO 8601 string for a datetime, None stays None"""
+    return value.isoformat() if value else None
+
+
+def is_set(value):
+    return value is not None
+
+
+def json_list(value):
+    """Decode a JSON list column (e.g. Employee.skills)"""
+    try:
+        return json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+
+
+class Field:
+    """One output key: the column it is read from and an optional converter.
+
+    By default DateTime columns are converted with iso(). hidden fields are
+    selected (e.g. pagination sort keys) but left out of the output dict;
+    default replaces a NULL result (e.g. a missing outer-joined assignee).
+    A field with column=None is not selected and always outputs default.
+    """
+
+    def __init__(self, key, column, convert=None, default=None, hidden=False):
+        self.key = key
+        self.column = column
+        if convert is None and isinstance(getattr(column, 'type', None), DateTime):
+            convert = iso
+        self.convert = convert
+        self.default = default
+        self.hidden = hidden
+
+
+class Projection:
+    """A named list of Fields selected from a base model (plus outer joins)"""
+
+    def __init__(self, name, model, fields, joins=()):
+        self.name = name
+        self.model = model
+        self.fields = list(fields)
+        self.joins = list(joins)  # (target, onclause) pairs, outer-joined in order
+        self.selected = [field for field in self.fields if field.column is not None]
+
+        # Compiled row -> dict plan; constant fields have no row position
+        positions = {id(field): index for index, field in enumerate(self.selected)}
+        self._plan = [(field.key, positions.get(id(field)), field.convert, field.default)
+                      for field in self.fields if not field.hidden]
+
+    def columns(self):
+        """Labelled column expressions; rows expose each field by its key"""
+        return [field.column.label(field.key) for field in self.selected]
+
+    def query(self, session):
+        """Query of plain rows for this projection (add filters / ordering)"""
+        query = session.query(*self.columns()).select_from(self.model)
+        for target, onclause in self.joins:
+            query = query.outerjoin(target, onclause)
+        return query
+
+    def serialize_row(self, row):
+        result = {}
+        for key, index, convert, default in self._plan:
+            value = row[index] if index is not None else None
+            if value is None:
+                value = default
+            elif convert is not None:
+                value = convert(value)
+            result[key] = value
+        return result
+
+    def serialize(self, rows):
+        serialize_row = self.serialize_row
+        return [serialize_row(row) for row in rows]
+
+    def serialize_object(self, obj):
+        """Serialize an already loaded ORM instance of the base model"""
+        return self.serialize_row([getattr(obj, field.column.key) for field in self.selected])
+
+
+def build_task_projections(Task, Employee):
+    """Named projections for the task views in main.py"""
+    assignee_join = [(Employee, Employee.emp_id == Task.assigned_to)]
+    assigned_to_name = Field('assigned_to_name', Employee.name, default='Unknown')
+    # Keyset pagination (pagination.py) reads these from every row
+    sort_keys = [Field('created_at', Task.created_at, hidden=True), Field('task_id', Task.task_id, hidden=True)]
+
+    def fields(*names):
+        return [Field(name, getattr(Task, name)) for name in names]
+
+    projections = [
+        # get_developer_tasks (developer dashboard; feedback is not shown there)
+        Projection('developer_list', Task, fields(
+            'task_id', 'title', 'description', 'project_type', 'complexity', 'priority', 'status',
+            'assigned_to', 'assigned_by', 'due_date', 'start_date', 'completion_date', 'submitted_at',
+            'success_rating', 'created_at', 'updated_at',
+            'spec_zip_path', 'spec_original_name', 'spec_size_bytes', 'spec_uploaded_at',
+        ) + [Field('has_spec_file', Task.spec_zip_path, convert=is_set, default=False)]),
+
+        # get_pending_tasks (PM dashboard review queue; description is fetched per task)
+        Projection('review_list', Task, fields(
+            'task_id', 'title', 'project_type', 'complexity', 'priority', 'status',
+            'assigned_to',
+        ) + [assigned_to_name] + fields('submitted_at', 'due_date'), joins=assignee_join),
+
+        # /pending_review_tasks JSON
+        Projection('review_api', Task, fields(
+            'task_id', 'title', 'description', 'project_type', 'complexity', 'priority', 'status',
+            'assigned_to',
+        ) + [assigned_to_name] + fields('assigned_by', 'submitted_at', 'due_date', 'created_at'),
+            joins=assignee_join),
+
+        # task_management table (description is fetched when a row is opened)
+        Projection('management_list', Task, fields(
+            'task_id', 'title', 'project_type', 'complexity', 'priority', 'status',
+            'assigned_to',
+        ) + [assigned_to_name] + fields('assigned_at', 'due_date', 'submitted_at', 'completion_date')
+            + sort_keys[:1], joins=assignee_join),
+
+        # my_tasks cards
+        Projection('my_tasks_list', Task, fields(
+            'task_id', 'title', 'description', 'project_type', 'complexity', 'priority', 'status',
+            'assigned_at', 'due_date', 'submitted_at', 'completion_date',
+        ) + sort_keys[:1]),
+
+        # task_details page (deadline is the due date; tasks have no hours estimate)
+        Projection('detail', Task, fields(
+            'task_id', 'title', 'description', 'status', 'priority', 'project_type', 'complexity',
+        ) + [Field('estimated_hours', None), Field('deadline', Task.due_date)] + fields(
+            'assigned_to', 'created_at', 'updated_at',
+            'spec_zip_path', 'spec_original_name', 'spec_size_bytes', 'spec_uploaded_at',
+        )),
+
+        # Task.to_dict / JSON APIs: every column
+        Projection('api', Task, fields(
+            'task_id', 'title', 'description', 'project_type', 'complexity', 'priority', 'status',
+            'assigned_to', 'assigned_by', 'assigned_at', 'start_date', 'due_date', 'completion_date',
+            'submitted_at', 'success_rating', 'feedback',
+            'spec_zip_path', 'spec_original_name', 'spec_size_bytes', 'spec_uploaded_at',
+            'submission_file_path', 'submission_file_name',
+        ) + [Field('has_spec_file', Task.spec_zip_path, convert=is_set, default=False),
+             Field('has_submission_file', Task.submission_file_path, convert=is_set, default=False)]
+            + fields('created_at', 'updated_at')),
+    ]
+    return {projection.name: projection for projection in projections}
+
+
+def build_employee_projections(Employee):
+    """Named projections for employee payloads in main.py"""
+    return {
+        # Assignee block on task_details
+        'assignee': Projection('assignee', Employee, [
+            Field('emp_id', Employee.emp_id),
+            Field('name', Employee.name),
+            Field('email', Employee.email),
+            Field('role', Employee.role),
+            Field('experience', Employee.experience),
+            Field('skills', Employee.skills, convert=json_list, default=()),
+        ]),
+    }
@@ -290,6 +290,13 @@ def setup_database():
             db.session.commit()
             print("[SUCCESS] Sample data created successfully!")
             
+            # Re-apply versioned migrations (indexes, extra tables) on the fresh tables.
+            # Runs after the sample data so the skills backfill sees the employees.
+            from migrations import upgrade, reset_migration_history
+            with db.engine.begin() as conn:
+                reset_migration_history(conn)
+            upgrade(db.engine)
+            
             print("\n" + "="*50)
             print("DATABASE SETUP COMPLETED SUCCESSFULLY!")
             print("="*50)
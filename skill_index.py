@@ -0,0 +1,120 @@
+# skill_index.py
+"""
+Process-level inverted index from skill to developers.
+
+Maps each skill (its skill_vocabulary id, so case and aliases such as
+"React.js" / "react" do not matter) to the set of developer IDs that have
+it, so a recommendation only looks at developers sharing at least one
+required skill instead of every developer. The index is built once (lazily) from the
+database and then kept current incrementally: main.py feeds it every
+committed Employee insert, update and delete.
+
+Other worker processes do not see this process's commits, so the index is
+also rebuilt when it is older than SKILL_INDEX_MAX_AGE seconds (default 300;
+0 disables the periodic rebuild).
+"""
+
+import os
+import time
+import threading
+from collections import Counter
+
+from skill_vocabulary import VOCABULARY, ids_of
+
+DEFAULT_MAX_AGE = 300
+
+
+class SkillIndex:
+    """skill id -> {emp_id} postings plus emp_id -> skill bitmask for the developers"""
+
+    def __init__(self, max_age=None, vocabulary=VOCABULARY):
+        self.max_age = float(max_age if max_age is not None
+                             else os.environ.get('SKILL_INDEX_MAX_AGE', DEFAULT_MAX_AGE))
+        self.vocabulary = vocabulary
+        self._postings = {}
+        self._skills = {}
+        self._built_at = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._skills)
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def is_stale(self):
+        return (not self.is_built
+                or (self.max_age > 0 and time.monotonic() - self._built_at >= self.max_age))
+
+    def build(self, developers):
+        """Replace the index with developers, an iterable of (emp_id, skill names)"""
+        postings = {}
+        skills_by_emp = {}
+        for emp_id, skills in developers:
+            skill_ids = self.vocabulary.ids(skills)
+            skills_by_emp[emp_id] = self.vocabulary.mask(skills)
+            for skill_id in skill_ids:
+                postings.setdefault(skill_id, set()).add(emp_id)
+
+        with self._lock:
+            self._postings = postings
+            self._skills = skills_by_emp
+            self._built_at = time.monotonic()
+
+    def ensure_built(self, load):
+        """Build (or rebuild when stale) using load() -> iterable of (emp_id, skills)"""
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self.build(load())
+
+    def remove(self, emp_id):
+        with self._lock:
+            for skill_id in ids_of(self._skills.pop(emp_id, 0)):
+                members = self._postings.get(skill_id)
+                if members is not None:
+                    members.discard(emp_id)
+                    if not members:
+                        del self._postings[skill_id]
+
+    def update(self, emp_id, role, skills):
+        """Apply one committed employee change; non-developers are dropped"""
+        if not self.is_built:
+            return
+        with self._lock:
+            self.remove(emp_id)
+            if role == 'developer':
+                skill_ids = self.vocabulary.ids(skills)
+                self._skills[emp_id] = self.vocabulary.mask(skills)
+                for skill_id in skill_ids:
+                    self._postings.setdefault(skill_id, set()).add(emp_id)
+
+    def developers(self):
+        with self._lock:
+            return list(self._skills)
+
+    def skills_of(self, emp_id):
+        """Skill bitmask of a developer (0 if unknown)"""
+        return self._skills.get(emp_id, 0)
+
+    def match(self, required_skills, min_match=50):
+        """Return {emp_id: match_percentage} for developers at or above min_match.
+
+        Only the postings of the required skills are visited. With no required
+        skills every developer matches at the default 50%.
+        """
+        required = self.vocabulary.keys(required_skills)
+        if not required:
+            return {emp_id: 50 for emp_id in self.developers()}
+
+        # Skills nobody has were never interned; they still count as required
+        skill_ids = [skill_id for skill_id in map(self.vocabulary.lookup, required) if skill_id is not None]
+        with self._lock:
+            counts = Counter()
+            for skill_id in skill_ids:
+                counts.update(self._postings.get(skill_id, ()))
+
+        needed = min_match * len(required)
+        return {emp_id: (count / len(required)) * 100
+                for emp_id, count in counts.items() if count * 100 >= needed}
@@ -0,0 +1,150 @@
+# skill_vocabulary.py
+"""
+Process-wide skill vocabulary: canonical skill keys and small integer ids.
+
+Every skill name is reduced to one canonical key -- trimmed, case-folded,
+inner whitespace collapsed, then mapped through SKILL_ALIASES, so "React",
+" react " and "React.js" are all ``react``. Each key seen gets the next
+integer id (0, 1, 2, ...), and a skill set is kept either as a sorted tuple
+of ids or as a bitmask (bit i set for id i). Matchers intersect those
+instead of comparing strings:
+
+    have = VOCABULARY.mask(employee_skills)
+    VOCABULARY.match_percentage(task_skills, have)
+
+Ids are only meaningful within one process (they depend on the order skills
+were first seen), so they are never stored; the skills table in main.py
+keeps the canonical key (name_folded) instead. Lookups of skills that were
+never interned (lookup, add=False) return None / are dropped, so request
+input does not grow the vocabulary.
+"""
+
+import threading
+
+# Alternative spellings (already case-folded) -> canonical key
+SKILL_ALIASES = {
+    'react.js': 'react',
+    'reactjs': 'react',
+    'vue.js': 'vue',
+    'vuejs': 'vue',
+    'angularjs': 'angular',
+    'angular.js': 'angular',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'golang': 'go',
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'sklearn': 'scikit-learn',
+    'scikit learn': 'scikit-learn',
+    'cicd': 'ci/cd',
+    'ci-cd': 'ci/cd',
+    'ux/ui': 'ui/ux',
+    'cpp': 'c++',
+    'csharp': 'c#',
+    'amazon web services': 'aws',
+    'google cloud': 'gcp',
+    'rest': 'rest api',
+    'restful api': 'rest api',
+}
+
+
+def canonical_skill(name, aliases=SKILL_ALIASES):
+    """Canonical key for a skill name (None for blanks / non-strings)"""
+    if not isinstance(name, str):
+        return None
+    key = ' '.join(name.split()).casefold()
+    if not key:
+        return None
+    return aliases.get(key, key)
+
+
+def mask_of(skill_ids):
+    mask = 0
+    for skill_id in skill_ids:
+        mask |= 1 << skill_id
+    return mask
+
+
+def ids_of(mask):
+    """Sorted ids of the bits set in mask"""
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return tuple(ids)
+
+
+class SkillVocabulary:
+    """canonical key <-> integer id, plus the first spelling seen for display"""
+
+    def __init__(self, aliases=SKILL_ALIASES):
+        self.aliases = aliases
+        self._ids = {}
+        self._keys = []
+        self._names = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def key(self, name):
+        return canonical_skill(name, self.aliases)
+
+    def lookup(self, name):
+        """Id of an already interned skill, None otherwise"""
+        return self._ids.get(self.key(name))
+
+    def intern(self, name):
+        """Id of a skill, assigning the next one if it is new (None for blanks)"""
+        key = self.key(name)
+        if key is None:
+            return None
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(key)
+                if skill_id is None:
+                    skill_id = len(self._keys)
+                    self._keys.append(key)
+                    self._names.append(' '.join(name.split()))
+                    self._ids[key] = skill_id
+        return skill_id
+
+    def ids(self, names, add=True):
+        """Sorted, distinct ids of names; unknown skills are dropped when add=False"""
+        get = self.intern if add else self.lookup
+        return tuple(sorted({skill_id for skill_id in map(get, names or []) if skill_id is not None}))
+
+    def mask(self, names, add=True):
+        return mask_of(self.ids(names, add))
+
+    def keys(self, names):
+        """Distinct canonical keys of names (known or not)"""
+        return {key for key in map(self.key, names or []) if key is not None}
+
+    def name(self, skill_id):
+        return self._names[skill_id]
+
+    def canonical(self, skill_id):
+        return self._keys[skill_id]
+
+    def match_percentage(self, required, have_mask):
+        """Share of the distinct required skills set in have_mask (0 with none required)"""
+        required_keys = self.keys(required)
+        if not required_keys:
+            return 0.0
+        required_mask = mask_of(skill_id for skill_id in map(self._ids.get, required_keys)
+                                if skill_id is not None)
+        return (required_mask & have_mask).bit_count() / len(required_keys) * 100
+
+    def catalogue(self, project_types):
+        """Intern a {project_type: [skill names]} catalogue; returns {project_type: ids}"""
+        return {project_type: self.ids(skills) for project_type, skills in project_types.items()}
+
+
+# Shared by every matcher in the process
+VOCABULARY = SkillVocabulary()
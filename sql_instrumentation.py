@@ -0,0 +1,174 @@
+# sql_instrumentation.py
+"""
+Per-request SQL instrumentation for the Flask apps.
+
+Every statement executed while a request is being handled is timed through
+SQLAlchemy engine events. At the end of the request the totals are exposed:
+
+  * a ``Server-Timing`` response header (visible in the browser dev tools):
+        Server-Timing: db;dur=12.4;desc="7 queries", db-slowest;dur=5.1
+  * one structured (JSON) log line per request on the ``sql_stats`` logger,
+    which has its own level (Flask's app.logger stays at WARNING outside
+    debug mode, which would hide these lines in production)
+  * in development, a warning when the same statement shape runs more than
+    ``SQL_REPEAT_WARN_THRESHOLD`` times in one request, which is how N+1
+    patterns (one lookup per row of a listing) show up.
+
+Configuration (app.config, defaulting to environment variables):
+    SQL_INSTRUMENTATION        on/off switch (default: on)
+    SQL_REPEAT_WARN_THRESHOLD  repeats of one statement shape before warning (default: 10)
+    SQL_WARN_REPEATED          warn about repeats; defaults to on in debug mode
+    SQL_STATS_LOG_LEVEL        level of the sql_stats logger (default: INFO; WARNING silences it)
+"""
+
+import os
+import re
+import json
+import time
+import logging
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_REPEAT_WARN_THRESHOLD = 10
+STATS_LOGGER = 'sql_stats'
+
+# Longest statement text kept for the slowest-statement report
+MAX_STATEMENT_LENGTH = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement):
+    """Normalize a SQL statement so repeats with different values compare equal.
+
+    Literals become ``?`` and expanded IN lists collapse to ``(?)``.
+    """
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PARAM_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class RequestSqlStats:
+    """SQL statements executed during one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement = None
+        self.shapes = {}
+
+    def record(self, statement, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms or self.slowest_statement is None:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement[:MAX_STATEMENT_LENGTH]
+        shape = statement_shape(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def repeated_shapes(self, threshold):
+        """Statement shapes run more than threshold times, most frequent first"""
+        repeated = [(shape, count) for shape, count in self.shapes.items() if count > threshold]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+    def server_timing(self):
+        """Value for the Server-Timing response header"""
+        return (f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+                f'db-slowest;dur={self.slowest_ms:.1f}')
+
+    def to_dict(self):
+        return {
+            'query_count': self.count,
+            'db_time_ms': round(self.total_ms, 2),
+            'slowest_ms': round(self.slowest_ms, 2),
+            'slowest_statement': self.slowest_statement,
+        }
+
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_stats_logger(level):
+    """The sql_stats logger at level, with a stderr handler unless one was configured"""
+    logger = logging.getLogger(STATS_LOGGER)
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s in %(name)s: %(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    return logger
+
+
+def current_sql_stats():
+    """Stats for the request being handled, or None outside a request"""
+    if not has_request_context():
+        return None
+    return g.get('sql_stats')
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_sql_stats() is not None:
+        context._sql_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, '_sql_started_at', None)
+    stats = current_sql_stats()
+    if started_at is None or stats is None:
+        return
+    stats.record(statement, (time.perf_counter() - started_at) * 1000)
+
+
+def init_sql_instrumentation(app):
+    """Start collecting per-request SQL stats for app (all of its engines)"""
+    app.config.setdefault('SQL_INSTRUMENTATION', _env_flag('SQL_INSTRUMENTATION', True))
+    app.config.setdefault('SQL_REPEAT_WARN_THRESHOLD',
+                          int(os.environ.get('SQL_REPEAT_WARN_THRESHOLD', DEFAULT_REPEAT_WARN_THRESHOLD)))
+    app.config.setdefault('SQL_WARN_REPEATED', _env_flag('SQL_WARN_REPEATED', None))
+    app.config.setdefault('SQL_STATS_LOG_LEVEL', os.environ.get('SQL_STATS_LOG_LEVEL', 'INFO').strip().upper())
+    stats_logger = get_stats_logger(app.config['SQL_STATS_LOG_LEVEL'])
+
+    @app.before_request
+    def start_sql_stats():
+        if app.config['SQL_INSTRUMENTATION']:
+            g.sql_stats = RequestSqlStats()
+
+    @app.after_request
+    def report_sql_stats(response):
+        stats = g.pop('sql_stats', None)
+        if stats is None:
+            return response
+
+        response.headers.add('Server-Timing', stats.server_timing())
+        stats_logger.info('sql_stats %s', json.dumps(dict(
+            stats.to_dict(), method=request.method, path=request.path,
+            endpoint=request.endpoint, status=response.status_code
+        )))
+
+        warn_repeated = app.config['SQL_WARN_REPEATED']
+        if warn_repeated is None:
+            warn_repeated = app.debug
+        if warn_repeated:
+            threshold = app.config['SQL_REPEAT_WARN_THRESHOLD']
+            for shape, count in stats.repeated_shapes(threshold):
+                app.logger.warning(
+                    f"Possible N+1 on {request.method} {request.path}: statement ran {count} times "
+                    f"(threshold {threshold}): {shape[:MAX_STATEMENT_LENGTH]}"
+                )
+        return response
+
+    return app
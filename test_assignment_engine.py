@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Tests for the matrix scoring engine (assignment_engine.py): assignments must
+be identical to the per-task DataFrame loop it replaced, with and without a
+model, including the workload penalty and the fallback paths.
+"""
+
+import os
+import sys
+import random
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from assignment_engine import ScoringEngine, assign_tasks_ml, assign_tasks_optimal
+
+SKILLS = ['Python', 'SQL', 'React', 'Docker', 'AWS', 'Java', 'Go', 'Rust', 'Flask', 'Spark']
+LEVELS = ['Low', 'Medium', 'High', 'Unknown']
+
+
+def reference_assign_tasks_ml(tasks, employees, model_data):
+    """The previous task_assignment_service.assign_tasks_ml, kept as the oracle"""
+    assignments = {}
+    current_workloads = defaultdict(int)
+    for emp in employees:
+        if isinstance(emp, dict) and 'emp_id' in emp:
+            current_workloads[emp['emp_id']] = 0
+
+    for task in tasks:
+        if not isinstance(task, dict):
+            assignments[str(task)] = "Invalid task format"
+            continue
+        task_id = task.get('task_id', 'unknown')
+        required_skills = task.get('skills', [])
+        candidates = []
+        for emp in employees:
+            if not isinstance(emp, dict) or 'emp_id' not in emp:
+                continue
+            emp_id = emp['emp_id']
+            emp_skills = emp.get('skills', [])
+            if not isinstance(emp_skills, list):
+                emp_skills = []
+            skill_match = 0
+            if required_skills and emp_skills:
+                matching_skills = set(required_skills).intersection(set(emp_skills))
+                skill_match = len(matching_skills) / len(required_skills)
+            if skill_match == 0:
+                continue
+            candidates.append({
+                "emp_id": emp_id,
+                "name": emp.get('name', ''),
+                "complexity": 0 if task.get('complexity', '') == "Low" else 1 if task.get('complexity', '') == "Medium" else 2,
+                "priority": 0 if task.get('priority', '') == "Low" else 1 if task.get('priority', '') == "Medium" else 2,
+                "skill_match_percentage": skill_match * 100,
+                "experience": emp.get('experience', 0),
+                "success_rate": emp.get('success_rate', 0),
+                "tasks_completed": emp.get('tasks_completed', 0),
+                "current_workload": current_workloads[emp_id]
+            })
+        if not candidates:
+            assignments[task_id] = "No eligible employees found for this task"
+            continue
+
+        candidates_df = pd.DataFrame(candidates)
+        if model_data and 'model' in model_data and model_data['model'] and 'feature_columns' in model_data:
+            model = model_data['model']
+            feature_cols = model_data['feature_columns']
+            if all(col in candidates_df.columns for col in feature_cols):
+                X_candidates = candidates_df[feature_cols].copy()
+                candidates_df["custom_score"] = (
+                    0.7 * candidates_df["skill_match_percentage"] / 100 +
+                    0.2 * candidates_df["success_rate"] / 100 +
+                    0.1 * candidates_df["experience"] / 10
+                )
+                candidates_df.loc[candidates_df["current_workload"] > 3, "custom_score"] *= 0.8
+                try:
+                    employee_probs = model.predict_proba(X_candidates)
+                    model_scores = np.max(employee_probs, axis=1)
+                    candidates_df["final_score"] = 0.7 * candidates_df["custom_score"] + 0.3 * model_scores
+                except Exception:
+                    candidates_df["final_score"] = candidates_df["custom_score"]
+            else:
+                candidates_df["final_score"] = candidates_df["skill_match_percentage"] / 100
+        else:
+            candidates_df["final_score"] = (
+                0.7 * candidates_df["skill_match_percentage"] / 100 +
+                0.2 * candidates_df["success_rate"] / 100 +
+                0.1 * candidates_df["experience"] / 10
+            )
+        candidates_df = candidates_df.sort_values("final_score", ascending=False, kind='stable')
+        best_emp = candidates_df.iloc[0]
+        emp_id = best_emp["emp_id"]
+        assignments[task_id] = {
+            "emp_id": emp_id,
+            "name": best_emp["name"],
+            "skill_match_percentage": f"{best_emp['skill_match_percentage']:.1f}%",
+            "score": f"{best_emp['final_score']:.3f}"
+        }
+        current_workloads[emp_id] += 1
+    return assignments
+
+
+def make_fixture(seed=3, employee_count=40, task_count=120):
+    rng = random.Random(seed)
+    employees = [{
+        'emp_id': f'EMP{i:03d}',
+        'name': f'Employee {i}',
+        'skills': rng.sample(SKILLS[:-1], rng.randint(0, 4)),
+        # Coarse values so several employees tie on score
+        'experience': rng.choice([1, 3, 5, 8]),
+        'success_rate': rng.choice([0, 50.0, 75.0, 90.0]),
+        'tasks_completed': rng.randint(0, 5),
+    } for i in range(employee_count)]
+    employees.append({'emp_id': 'EMP003', 'name': 'Duplicate row', 'skills': ['Go'], 'experience': 2})
+    # Only these two have Spark; SPARKA wins until the workload penalty kicks in
+    employees.append({'emp_id': 'SPARKA', 'name': 'Spark A', 'skills': ['Spark'], 'experience': 8, 'success_rate': 90.0})
+    employees.append({'emp_id': 'SPARKB', 'name': 'Spark B', 'skills': ['Spark'], 'experience': 5, 'success_rate': 75.0})
+    employees.append({'emp_id': 'EMPX', 'skills': 'Python'})   # skills not a list
+    employees.append({'name': 'No id', 'skills': ['Python']})
+    employees.append('not a dict')
+
+    tasks = [{
+        'task_id': f'T{i:04d}',
+        'skills': rng.sample(SKILLS[:-1], rng.randint(1, 4)) + (['Python'] if i % 7 == 0 else []),
+        'complexity': rng.choice(LEVELS),
+        'priority': rng.choice(LEVELS),
+    } for i in range(task_count)]
+    tasks += [{'task_id': f'SPARK{i}', 'skills': ['Spark'], 'complexity': 'High', 'priority': 'Low'} for i in range(6)]
+    tasks += [{'task_id': 'NOSKILLS', 'skills': []}, {'task_id': 'UNKNOWN', 'skills': ['COBOL']},
+              {'skills': ['SQL']}, 'garbage', {'task_id': 'DUP', 'skills': ['Python', 'Python', 'SQL']}]
+    return employees, tasks
+
+
+def train_model(employees, feature_cols, seed=0):
+    from sklearn.ensemble import RandomForestClassifier
+    rng = np.random.RandomState(seed)
+    valid = [emp for emp in employees if isinstance(emp, dict) and 'emp_id' in emp]
+    rows = [{
+        'complexity': rng.randint(3), 'priority': rng.randint(3),
+        'skill_match_percentage': rng.choice([25, 50, 100]),
+        'experience': emp.get('experience', 0), 'success_rate': emp.get('success_rate', 0),
+        'tasks_completed': emp.get('tasks_completed', 0), 'current_workload': rng.randint(6),
+        'emp_id': emp['emp_id'],
+    } for emp in valid for _ in range(3)]
+    df = pd.DataFrame(rows)
+    model = RandomForestClassifier(n_estimators=10, random_state=seed).fit(df[feature_cols], df['emp_id'])
+    return {'model': model, 'feature_columns': feature_cols}
+
+
+class FailingModel:
+    def predict_proba(self, X):
+        raise ValueError("model is broken")
+
+
+def check(employees, tasks, model_data, label):
+    expected = reference_assign_tasks_ml(tasks, employees, model_data)
+    actual = assign_tasks_ml(tasks, employees, model_data)
+    assert actual == expected, label
+    assigned = [a for a in actual.values() if isinstance(a, dict)]
+    assert assigned, label
+    print(f"[PASS] {label}: {len(assigned)} assignments identical")
+    return actual
+
+
+def test_matches_previous_scoring_without_model():
+    print("\n=== Testing engine vs previous loop (no model) ===")
+    employees, tasks = make_fixture()
+    actual = check(employees, tasks, {'model': None, 'feature_columns': []}, "No model")
+    assert actual['NOSKILLS'] == actual['UNKNOWN'] == "No eligible employees found for this task"
+    assert actual['garbage'] == "Invalid task format"
+    assert actual['unknown']['emp_id'] != 'EMPX'
+    # Without a model there is no workload penalty
+    assert {actual[f'SPARK{i}']['emp_id'] for i in range(6)} == {'SPARKA'}
+    check(employees, tasks, None, "model_data None")
+
+
+def test_matches_previous_scoring_with_model():
+    print("\n=== Testing engine vs previous loop (RandomForest model) ===")
+    employees, tasks = make_fixture(seed=11)
+    features = ['complexity', 'priority', 'skill_match_percentage', 'experience', 'success_rate', 'tasks_completed']
+    check(employees, tasks, train_model(employees, features), "Static features")
+
+    check(employees, tasks, train_model(employees, features[:3] + ['current_workload']), "Workload feature")
+    actual = check(employees, tasks, {'model': FailingModel(), 'feature_columns': features}, "Failing model")
+    spark = [actual[f'SPARK{i}']['emp_id'] for i in range(6)]
+    assert spark == ['SPARKA'] * 4 + ['SPARKB'] * 2, spark
+    check(employees, tasks, {'model': FailingModel(), 'feature_columns': ['team_size']}, "Missing column")
+
+
+def test_large_batch_blocks():
+    print("\n=== Testing block boundaries on a larger batch ===")
+    employees, tasks = make_fixture(seed=5, employee_count=60, task_count=400)
+    # Predictions cached by earlier blocks are reused by later ones
+    model_data = train_model(employees, ['complexity', 'priority', 'skill_match_percentage', 'experience'])
+    expected = reference_assign_tasks_ml(tasks, employees, model_data)
+    del expected['garbage']
+
+    # Blocks of 7 tasks: the greedy workload has to carry across blocks
+    engine = ScoringEngine(employees, model_data, block_cells=500)
+    assert engine.assign_greedy(tasks) == expected
+    print(f"[PASS] {len(expected)} tasks scored in blocks of 7 match")
+
+
+def brute_force_total(employees, tasks, capacities, weights):
+    """Exact optimum with a dense assignment over every capacity slot (small inputs only)"""
+    from scipy.optimize import linear_sum_assignment
+    slots = [emp for emp in employees for _ in range(capacities.get(emp['emp_id'], 3))]
+    profit = np.zeros((len(tasks), len(slots) + len(tasks)))
+    for t, task in enumerate(tasks):
+        required = task.get('skills') or []
+        for e, emp in enumerate(slots):
+            matched = len(set(required) & set(emp['skills'])) if isinstance(emp['skills'], list) else 0
+            if matched:
+                score = (0.7 * (matched / len(required) * 100) / 100 + 0.2 * emp.get('success_rate', 0) / 100
+                         + 0.1 * emp.get('experience', 0) / 10)
+                profit[t, e] = score * weights[task['priority']]
+    rows, cols = linear_sum_assignment(profit, maximize=True)
+    return profit[rows, cols].sum()
+
+
+def test_optimal_mode():
+    print("\n=== Testing optimal batch assignment ===")
+    weights = {'Low': 1.0, 'Medium': 2.0, 'High': 3.0}
+    employees = [
+        {'emp_id': 'STAR', 'name': 'Star', 'skills': ['Python', 'SQL'], 'experience': 10, 'success_rate': 95.0},
+        {'emp_id': 'PY', 'name': 'Py', 'skills': ['Python'], 'experience': 2, 'success_rate': 60.0},
+        {'emp_id': 'SQL', 'name': 'Sql', 'skills': ['SQL'], 'experience': 4, 'success_rate': 70.0},
+    ]
+    # Greedy hands STAR the early low-priority task; optimal keeps STAR for the High one
+    tasks = [
+        {'task_id': 'LOW', 'skills': ['Python'], 'priority': 'Low'},
+        {'task_id': 'HIGH', 'skills': ['Python', 'SQL'], 'priority': 'High'},
+        {'task_id': 'MED', 'skills': ['SQL'], 'priority': 'Medium'},
+        {'task_id': 'NONE', 'skills': ['COBOL'], 'priority': 'High'},
+    ]
+    capacities = {'STAR': 1, 'PY': 1, 'SQL': 1}
+    greedy = assign_tasks_ml(tasks, employees, None)
+    assert greedy['LOW']['emp_id'] == 'STAR'
+
+    assignments, summary = assign_tasks_optimal(tasks, employees, None, capacities, weights)
+    assert assignments['HIGH']['emp_id'] == 'STAR'
+    assert assignments['LOW']['emp_id'] == 'PY' and assignments['MED']['emp_id'] == 'SQL'
+    assert assignments['NONE'] == "No eligible employees found for this task"
+    assert summary['assigned'] == 3 and summary['greedy_over_capacity'] == 2
+    assert summary['total_score'] > summary['greedy_within_capacity_score']
+    print(f"[PASS] Optimal total {summary['total_score']} vs greedy {summary['greedy_total_score']}")
+
+    # No capacity left: eligible tasks are reported as such
+    assignments, summary = assign_tasks_optimal(tasks, employees, None, {'STAR': 0, 'PY': 0, 'SQL': 1}, weights)
+    assert assignments['MED']['emp_id'] == 'SQL'
+    assert assignments['HIGH'] == assignments['LOW'] == "No employee with free capacity for this task"
+    print("[PASS] Capacity limits respected")
+
+
+def test_optimal_matches_brute_force():
+    print("\n=== Testing optimal total against an exact dense solve ===")
+    weights = {'Low': 1.0, 'Medium': 2.5, 'High': 4.0}
+    for seed in range(4):
+        employees, tasks = make_fixture(seed=seed, employee_count=8, task_count=14)
+        employees = [emp for emp in employees if isinstance(emp, dict) and 'emp_id' in emp][:8]
+        tasks = [dict(task, priority=random.Random(i).choice(['Low', 'Medium', 'High']))
+                 for i, task in enumerate(tasks[:14])]
+        capacities = {emp['emp_id']: (i % 3) for i, emp in enumerate(employees)}
+
+        assignments, summary = ScoringEngine(employees, None).assign_optimal(tasks, capacities, weights)
+        expected = brute_force_total(employees, tasks, capacities, weights)
+        assert abs(summary['total_score'] - expected) < 1e-3, (summary, expected)
+
+        counts = {}
+        for result in assignments.values():
+            if isinstance(result, dict):
+                counts[result['emp_id']] = counts.get(result['emp_id'], 0) + 1
+        assert all(count <= capacities[emp_id] for emp_id, count in counts.items())
+    print("[PASS] Same total as the exact solve, capacities respected")
+
+
+def main():
+    test_matches_previous_scoring_without_model()
+    test_matches_previous_scoring_with_model()
+    test_large_batch_blocks()
+    test_optimal_mode()
+    test_optimal_matches_brute_force()
+    print("\nAll assignment engine tests passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched upsert helpers (bulk_upsert.py) used by
+/api/task-service/assign-tasks.
+
+Runs against an in-memory SQLite tasks table: a payload of thousands of
+tasks (half new, half reassignments) must be written in a handful of
+statements, update only the assignment columns of existing rows and insert
+the new ones in full.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, create_engine, event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from bulk_upsert import fetch_existing_keys, upsert_rows, upsert_rows_one_by_one
+
+metadata = MetaData()
+tasks = Table(
+    'tasks', metadata,
+    Column('task_id', String(50), primary_key=True),
+    Column('project_type', String(100), nullable=False),
+    Column('complexity', String(20), nullable=False),
+    Column('status', String(20)),
+    Column('assigned_to', String(50)),
+    Column('assigned_at', DateTime),
+)
+
+def make_session():
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    statements = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return Session(engine), statements
+
+def task_row(i, emp_id):
+    return {'task_id': f'TASK{i:05d}', 'project_type': 'website_development', 'complexity': 'Medium',
+            'status': 'assigned', 'assigned_to': emp_id, 'assigned_at': datetime(2026, 1, 1)}
+
+def test_bulk_upsert_round_trips():
+    print("\n=== Testing bulk upsert of 5000 tasks ===")
+    session, statements = make_session()
+    session.execute(tasks.insert(), [dict(task_row(i, 'DEV001'), complexity='High', status='completed')
+                                     for i in range(2500)])
+    session.commit()
+    statements.clear()
+
+    rows = [task_row(i, 'DEV002') for i in range(5000)]
+    existing = fetch_existing_keys(session, tasks.c.task_id, [row['task_id'] for row in rows], chunk_size=1000)
+    written = upsert_rows(session, tasks, rows, 'task_id', ['assigned_to', 'assigned_at', 'status'],
+                          chunk_size=1000)
+    session.commit()
+
+    assert len(existing) == 2500 and written == 5000
+    # 5 prefetch chunks + 5 upsert chunks (+ transaction bookkeeping)
+    assert len(statements) <= 12, len(statements)
+
+    old = session.execute(select(tasks).where(tasks.c.task_id == 'TASK00001')).one()
+    assert old.assigned_to == 'DEV002' and old.status == 'assigned' and old.complexity == 'High'
+    new = session.execute(select(tasks).where(tasks.c.task_id == 'TASK04999')).one()
+    assert new.assigned_to == 'DEV002' and new.complexity == 'Medium'
+    assert len(session.execute(select(tasks.c.task_id)).all()) == 5000
+    print(f"[PASS] 5000 rows in {len(statements)} statements")
+
+def test_duplicate_keys_collapse():
+    print("\n=== Testing duplicate task ids in one payload ===")
+    session, _ = make_session()
+    written = upsert_rows(session, tasks, [task_row(1, 'DEV001'), task_row(1, 'DEV003')], 'task_id',
+                          ['assigned_to'])
+    session.commit()
+    assert written == 1
+    assert session.execute(select(tasks.c.assigned_to)).scalar() == 'DEV003'
+    print("[PASS] Last row for a task id wins")
+
+def test_one_by_one_isolates_bad_rows():
+    print("\n=== Testing row-by-row retry of a failed batch ===")
+    session, _ = make_session()
+    session.execute(tasks.insert(), [task_row(0, 'DEV001')])
+    session.commit()
+
+    # complexity is NOT NULL: the batch fails as a whole
+    rows = [task_row(0, 'DEV002'), dict(task_row(1, 'DEV002'), complexity=None), task_row(2, 'DEV002')]
+    try:
+        upsert_rows(session, tasks, rows, 'task_id', ['assigned_to'])
+        raise AssertionError("NULL complexity accepted")
+    except IntegrityError:
+        session.rollback()
+
+    errors = upsert_rows_one_by_one(session, tasks, rows, 'task_id', ['assigned_to'])
+    session.commit()
+    assert list(errors) == ['TASK00001']
+    assert dict(session.execute(select(tasks.c.task_id, tasks.c.assigned_to)).all()) == {
+        'TASK00000': 'DEV002', 'TASK00002': 'DEV002'}
+    print("[PASS] Only the bad row fails; the others are written")
+
+if __name__ == "__main__":
+    test_bulk_upsert_round_trips()
+    test_duplicate_keys_collapse()
+    test_one_by_one_isolates_bad_rows()
+    print("\nAll bulk upsert tests passed")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact serving models (compact_model.py): the flattened
+forest and logistic model give the same predict_proba as scikit-learn, the
+registry publishes and serves them, and loading one does not import
+scikit-learn.
+"""
+
+import os
+import sys
+import random
+import pickle
+import tempfile
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from assignment_engine import assign_tasks_ml
+from benchmark_assignment_engine import make_batch
+from benchmark_model_training import make_tasks
+from compact_model import CompactForest, CompactLogistic, export_model_data
+from model_registry import ModelRegistry
+from outcomes import create_outcomes_table
+from outcome_model import compact_outcome_model, pending_outcomes
+from training_data import FEATURE_COLUMNS, build_assignment_model, synthetic_history
+from test_outcome_model import add_outcomes
+
+
+def forest_and_features(seed=11, employees=60, trees=15):
+    rng = random.Random(seed)
+    employee_rows, _ = make_batch(employees, 0, rng)
+    tasks = make_tasks(rng)
+    model_data = build_assignment_model(employee_rows, tasks.copy(), trees=trees, n_jobs=1)
+    features = synthetic_history(pd.DataFrame(employee_rows), tasks)[FEATURE_COLUMNS].astype(float)
+    # Values between the training ones exercise the thresholds
+    features.iloc[::3, 2] += 0.37
+    features.iloc[1::5, 4] -= 0.5
+    return employee_rows, model_data, features
+
+
+def test_forest_matches_predict_proba():
+    print("\n=== Testing CompactForest against RandomForestClassifier ===")
+    _, model_data, features = forest_and_features()
+    model = model_data['model']
+    compact = export_model_data(model_data)['model']
+    assert isinstance(compact, CompactForest) and compact.n_trees == len(model.estimators_)
+    assert list(compact.classes_) == list(model.classes_)
+
+    expected = model.predict_proba(features)
+    np.testing.assert_allclose(compact.predict_proba(features), expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(compact.predict_proba(features.to_numpy()), expected, rtol=0, atol=1e-12)
+    # Column order comes from the feature names, not the frame
+    np.testing.assert_allclose(compact.predict_proba(features[FEATURE_COLUMNS[::-1]]), expected,
+                               rtol=0, atol=1e-12)
+    assert compact.predict_proba(features.iloc[:0]).shape == (0, len(model.classes_))
+    # What the engine scores with: the largest probability, without the rows x classes matrix
+    assert np.array_equal(compact.max_proba(features), compact.predict_proba(features).max(axis=1))
+    assert compact.max_proba(features.iloc[:0]).shape == (0,)
+    print(f"[PASS] {len(features)} rows x {len(model.classes_)} classes match ({compact.n_nodes} nodes)")
+
+
+def test_forest_missing_values():
+    print("\n=== Testing CompactForest with missing values ===")
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(5)
+    X = rng.normal(size=(400, 3))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+    X[rng.random(X.shape) < 0.2] = np.nan
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    compact = export_model_data({'model': model, 'feature_columns': ['a', 'b', 'c']})['model']
+
+    probe = rng.normal(size=(200, 3))
+    probe[rng.random(probe.shape) < 0.3] = np.nan
+    np.testing.assert_allclose(compact.predict_proba(probe), model.predict_proba(probe), rtol=0, atol=1e-12)
+    print("[PASS] NaN features follow the learned missing-value direction")
+
+
+def test_outcome_model_export():
+    print("\n=== Testing CompactLogistic against OutcomeModel ===")
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        engine = create_engine('sqlite://')
+        with engine.begin() as conn:
+            create_outcomes_table(conn)
+            add_outcomes(conn, 120, random.Random(9))
+            compact_outcome_model(conn, registry)
+            model = registry.load()['model']
+            served = registry.load(serving=True)
+            compact = served['model']
+            assert isinstance(compact, CompactLogistic) and served['kind'] == 'outcomes'
+            assert (compact.outcomes, compact.last_outcome_id) == (model.outcomes, model.last_outcome_id)
+            # The scheduler only needs the serving copy
+            assert pending_outcomes(conn, served) == pending_outcomes(conn, registry.load())
+        engine.dispose()
+
+    features = pd.DataFrame(np.random.default_rng(1).uniform(0, 100, size=(50, len(FEATURE_COLUMNS))),
+                            columns=FEATURE_COLUMNS)
+    features.iloc[0, 3] = np.nan
+    np.testing.assert_allclose(compact.predict_proba(features), model.predict_proba(features),
+                               rtol=1e-12, atol=1e-12)
+    assert np.array_equal(compact.max_proba(features), compact.predict_proba(features)[:, 0])
+    print("[PASS] P(completed) and bookkeeping survive the export")
+
+
+def test_registry_serves_compact_model():
+    print("\n=== Testing registry serving copy ===")
+    employees, model_data, _ = forest_and_features(seed=4, employees=40, trees=10)
+    rng = random.Random(4)
+    _, tasks = make_batch(0, 30, rng)
+
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        metadata = registry.publish(model_data, employee_count=len(employees))
+        assert metadata['compact']
+        version_dir = os.path.join(root, 'versions', metadata['version'])
+        assert os.path.exists(os.path.join(version_dir, 'serving.pkl'))
+        assert isinstance(registry.load(serving=True)['model'], CompactForest)
+
+        # A fresh process loads the serving copy without scikit-learn
+        reader = ModelRegistry(root)
+        served = reader.load(serving=True)
+        assert reader.loaded_version == metadata['version']
+        expected = assign_tasks_ml(tasks, employees, model_data)
+        assert assign_tasks_ml(tasks, employees, served) == expected
+
+        # ... and, like the service's own imports, without pandas
+        script = ("import sys, pickle; sys.path.insert(0, sys.argv[1]); "
+                  "import assignment_engine, model_registry, training_data, training_jobs, outcome_model; "
+                  "data = pickle.load(open(sys.argv[2], 'rb')); "
+                  "data['model'].predict_proba([[1, 2, 50.0, 3, 80.0, 4]]); "
+                  "print('sklearn' in sys.modules, 'pandas' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', script, os.path.dirname(os.path.abspath(__file__)),
+                                 os.path.join(version_dir, 'serving.pkl')],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        assert output == 'False False', output
+
+        # Models without a compact form are served as published
+        plain = {'model': None, 'feature_columns': []}
+        assert not registry.publish(plain)['compact']
+        assert registry.load(serving=True) is plain
+    print("[PASS] Published with serving.pkl; assignments identical; no scikit-learn or pandas import")
+
+
+if __name__ == '__main__':
+    test_forest_matches_predict_proba()
+    test_forest_missing_values()
+    test_outcome_model_export()
+    test_registry_serves_compact_model()
+    print("\nAll compact model tests passed")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for the employee_workload counters.
+
+Checks that creating, moving, reassigning and deleting tasks keeps the
+counters equal to a COUNT over the tasks table, that a rolled-back change
+leaves them untouched, and that reconcile_workload finds and repairs drift
+introduced behind the ORM's back.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from sqlalchemy import text
+from main import app, db, Employee, Task, get_active_tasks_count, get_notification_count
+from workload import count_workload_from_tasks, get_workload, reconcile_workload, empty_workload
+
+PREFIX = 'WKLD_'
+DEV_A = f'{PREFIX}DEVA'
+DEV_B = f'{PREFIX}DEVB'
+
+def cleanup():
+    db.session.rollback()
+    Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.execute(text("DELETE FROM employee_workload WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+    Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.commit()
+
+@contextmanager
+def seeded():
+    """App context with two prefixed developers, removed afterwards"""
+    with app.app_context():
+        cleanup()
+        try:
+            for emp_id in (DEV_A, DEV_B):
+                developer = Employee(emp_id=emp_id, name=f'Workload {emp_id}',
+                                     email=f'{emp_id.lower()}@example.com', role='developer')
+                developer.set_password('x')
+                db.session.add(developer)
+            db.session.commit()
+            yield
+        finally:
+            cleanup()
+
+def stored(emp_id):
+    return get_workload(db.session.connection(), emp_id)
+
+def actual(emp_id):
+    return count_workload_from_tasks(db.session.connection(), emp_id).get(emp_id, empty_workload())
+
+def test_transitions_update_counters():
+    print("\n=== Testing counters follow task transitions ===")
+    with seeded():
+        for i in range(3):
+            db.session.add(Task(task_id=f'{PREFIX}TASK{i}', title=f'Workload task {i}',
+                                project_type='website_development', assigned_to=DEV_A))
+        db.session.commit()
+        assert stored(DEV_A)['assigned'] == 3
+        assert get_active_tasks_count(DEV_A) == 3
+
+        task0 = db.session.get(Task, f'{PREFIX}TASK0')
+        task1 = db.session.get(Task, f'{PREFIX}TASK1')
+        task2 = db.session.get(Task, f'{PREFIX}TASK2')
+        task0.status = 'in_progress'
+        db.session.commit()
+        task0.status = 'submitted'
+        task1.assigned_to = DEV_B
+        db.session.commit()
+        db.session.delete(task2)
+        db.session.commit()
+
+        assert stored(DEV_A) == actual(DEV_A) == {'assigned': 0, 'in_progress': 0, 'submitted': 1, 'completed': 0}
+        assert stored(DEV_B) == actual(DEV_B)
+        assert get_active_tasks_count(DEV_A) == 0
+        assert get_active_tasks_count(DEV_B) == 1
+        assert get_notification_count(DEV_A) == 1
+
+        task0.status = 'completed'
+        db.session.commit()
+        assert stored(DEV_A)['completed'] == 1 and stored(DEV_A)['submitted'] == 0
+        print(f"[PASS] {DEV_A}: {stored(DEV_A)}, {DEV_B}: {stored(DEV_B)}")
+
+def test_rollback_leaves_counters():
+    print("\n=== Testing rollback leaves counters unchanged ===")
+    with seeded():
+        db.session.add(Task(task_id=f'{PREFIX}TASK0', title='Workload task',
+                            project_type='website_development', assigned_to=DEV_A))
+        db.session.commit()
+
+        task = db.session.get(Task, f'{PREFIX}TASK0')
+        task.status = 'in_progress'
+        db.session.flush()
+        assert stored(DEV_A)['in_progress'] == 1
+        db.session.rollback()
+
+        assert stored(DEV_A) == actual(DEV_A)
+        assert stored(DEV_A)['assigned'] == 1
+        print("[PASS] Counters rolled back with the task")
+
+def test_update_task_status_route():
+    print("\n=== Testing /update_task_status keeps counters in step ===")
+    with seeded():
+        db.session.add(Task(task_id=f'{PREFIX}TASK0', title='Workload task',
+                            project_type='website_development', assigned_to=DEV_A))
+        db.session.commit()
+
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['emp_id'] = DEV_A
+            sess['role'] = 'developer'
+        response = client.post('/update_task_status', json={'task_id': f'{PREFIX}TASK0', 'status': 'in_progress'})
+        assert response.status_code == 200, response.data
+
+        db.session.expire_all()
+        assert stored(DEV_A) == actual(DEV_A)
+        assert stored(DEV_A)['in_progress'] == 1
+        print("[PASS] Route transition counted")
+
+def test_reconcile_reports_and_fixes_drift():
+    print("\n=== Testing reconcile_workload ===")
+    with seeded():
+        db.session.add(Task(task_id=f'{PREFIX}TASK0', title='Workload task',
+                            project_type='website_development', assigned_to=DEV_A))
+        db.session.commit()
+
+        # Bypass the ORM, as a manual fix-up would
+        db.session.execute(text("UPDATE tasks SET status = 'completed' WHERE task_id = :t"), {'t': f'{PREFIX}TASK0'})
+        db.session.commit()
+
+        conn = db.session.connection()
+        drift = reconcile_workload(conn, emp_id=DEV_A, apply=False)
+        assert {(d['status'], d['stored'], d['actual']) for d in drift} == {('assigned', 1, 0), ('completed', 0, 1)}
+
+        reconcile_workload(conn, emp_id=DEV_A)
+        db.session.commit()
+        assert reconcile_workload(db.session.connection(), emp_id=DEV_A, apply=False) == []
+        assert stored(DEV_A)['completed'] == 1
+        print(f"[PASS] Drift found and fixed: {drift}")
+
+if __name__ == "__main__":
+    test_transitions_update_counters()
+    test_rollback_leaves_counters()
+    test_update_task_status_route()
+    test_reconcile_reports_and_fixes_drift()
+    print("\nAll workload tests passed")
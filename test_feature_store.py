@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the employee feature store (feature_store.py): revision-based
+sync and removal in the columnar mirror, single employees pushed by the
+employee service, main.py keeping employee_features
+current from its flush hooks (skill edits, metrics, task status, bulk
+deletes), and assign_tasks_ml giving the same assignments from a
+FeatureSnapshot as from employee dicts.
+"""
+
+import os
+import sys
+import random
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from sqlalchemy import create_engine, text
+
+from assignment_engine import assign_tasks_ml, assign_tasks_optimal
+from benchmark_assignment_engine import make_batch
+from feature_store import (FeatureStore, create_features_table, feature_row, read_feature_rows,
+                           replace_features, update_features, write_features)
+
+PREFIX = 'FEAT_'
+SKILL = f'{PREFIX}Erlang'
+
+
+def test_sync_and_removal():
+    print("\n=== Testing feature store sync ===")
+    engine = create_engine('sqlite://')
+    store = FeatureStore()
+    with engine.begin() as conn:
+        create_features_table(conn)
+        roster = [{'emp_id': f'E{i}', 'name': f'Employee {i}', 'role': 'developer', 'skills': ['Python'],
+                   'experience': i, 'success_rate': 10.0 * i, 'tasks_completed': i} for i in range(4)]
+        assert replace_features(conn, [feature_row(emp) for emp in roster]) == (4, 0)
+        assert len(store.sync(conn)) == 4 and store.revision == 1
+        assert store.get('E2').experience == 2 and store.get('E2').skills == ['Python']
+
+        # Unchanged roster: nothing written, nothing to sync
+        assert replace_features(conn, [feature_row(emp) for emp in roster]) == (0, 0)
+        assert store.sync(conn) == []
+
+        snapshot = store.snapshot()
+        assert update_features(conn, {'E1': {'active_tasks': 2, 'skills': ['Go']}, 'NOPE': {'active_tasks': 1}}) == 1
+        # E0 left the roster: marked removed, its position taken by the last employee
+        assert replace_features(conn, [feature_row(emp) for emp in roster[1:]]) == (1, 1)
+        rows = store.sync(conn)
+        assert [(row.emp_id, row.removed) for row in rows] == [('E0', 1), ('E1', 0)]
+        assert 'E0' not in store and len(store) == 3
+        assert store.emp_ids == ['E3', 'E1', 'E2']
+        assert list(store.experience) == [3, 1, 2] and list(store.active_tasks) == [0, 0, 0]
+        assert store.get('E1').skills == ['Python']  # the roster reload restored it
+        assert [record.emp_id for record in store.records(['E2', 'E1', 'X'])] == ['E1', 'E2']
+
+        # Snapshots are copies
+        assert snapshot.emp_ids == ['E0', 'E1', 'E2', 'E3'] and list(snapshot.experience) == [0, 1, 2, 3]
+
+        # A fresh store catches up from scratch and skips removed rows
+        fresh = FeatureStore()
+        fresh.sync(conn)
+        assert sorted(fresh.emp_ids) == ['E1', 'E2', 'E3'] and fresh.revision == store.revision
+        assert read_feature_rows(conn, store.revision) == []
+    engine.dispose()
+    print("[PASS] Changed rows only; removals and updates reach the mirror by revision")
+
+
+def test_pushed_employee():
+    print("\n=== Testing one employee pushed by the employee service ===")
+    engine = create_engine('sqlite://')
+    store = FeatureStore()
+    with engine.begin() as conn:
+        create_features_table(conn)
+        roster = [{'emp_id': f'E{i}', 'name': f'Employee {i}', 'role': 'developer', 'skills': ['Python'],
+                   'experience': i, 'success_rate': 50.0, 'tasks_completed': i} for i in range(3)]
+        replace_features(conn, [feature_row(emp, 1) for emp in roster])
+        store.sync(conn)
+
+        # A skill edit and a new hire, each written alone; the other rows keep their revision
+        write_features(conn, [feature_row(dict(roster[1], skills=['Python', 'Go'], success_rate=75.0), 1)])
+        write_features(conn, [feature_row({'emp_id': 'E9', 'name': 'New', 'role': 'developer', 'skills': ['Rust']})])
+        assert [row.emp_id for row in store.sync(conn)] == ['E1', 'E9'] and store.revision == 3
+        assert store.get('E1').skills == ['Python', 'Go'] and store.get('E1').success_rate == 75.0
+        assert store.get('E1').active_tasks == 1 and store.get('E9').skills == ['Rust']
+
+        write_features(conn, removed=['E0'])
+        assert [(row.emp_id, row.removed) for row in store.sync(conn)] == [('E0', 1)]
+        assert sorted(store.emp_ids) == ['E1', 'E2', 'E9']
+        write_features(conn)
+        assert store.sync(conn) == [] and store.revision == 4
+    engine.dispose()
+    print("[PASS] Pushed rows reach the mirror without a roster reload")
+
+
+def test_main_keeps_features_current():
+    print("\n=== Testing employee_features maintenance in main.py ===")
+    from main import (app, db, Employee, Task, FEATURE_STORE, sync_feature_store,
+                      get_task_assignment_recommendations)
+
+    developer_id = f'{PREFIX}DEV0'
+
+    def cleanup():
+        db.session.rollback()
+        Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+        for table in ('employee_workload', 'employee_skills'):
+            db.session.execute(text(f"DELETE FROM {table} WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+        Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+        db.session.execute(text("DELETE FROM skills WHERE name_folded LIKE :p"), {'p': f'{PREFIX.lower()}%'})
+        db.session.commit()
+
+    def stored():
+        sync_feature_store()
+        return FEATURE_STORE.get(developer_id)
+
+    with app.app_context():
+        cleanup()
+        try:
+            developer = Employee(emp_id=developer_id, name='Feature Dev', email='feat_dev0@example.com',
+                                 role='developer', experience=4, success_rate=50.0)
+            developer.set_password('x')
+            developer.set_skills_list([SKILL])
+            db.session.add(developer)
+            db.session.commit()
+            features = stored()
+            assert (features.skills, features.experience, features.active_tasks) == ([SKILL], 4, 0)
+
+            # Skill edit and metrics update (what approve_task does)
+            developer = db.session.get(Employee, developer_id)
+            developer.set_skills_list([SKILL, 'Python'])
+            developer.tasks_completed = 3
+            developer.success_rate = 90.0
+            db.session.commit()
+            features = stored()
+            assert features.skills == [SKILL, 'Python'] and (features.tasks_completed, features.success_rate) == (3, 90.0)
+
+            # Task status changes move active_tasks; the recommender reads it from the store
+            for i in range(2):
+                db.session.add(Task(task_id=f'{PREFIX}TASK{i}', title=f'Feature task {i}',
+                                    project_type='website_development', status='assigned',
+                                    assigned_to=developer_id))
+            db.session.commit()
+            assert stored().active_tasks == 2
+            [recommendation] = get_task_assignment_recommendations({'skills': [SKILL]}, 5)
+            assert recommendation['active_tasks'] == 2 and recommendation['skills'] == [SKILL, 'Python']
+            db.session.get(Task, f'{PREFIX}TASK0').status = 'submitted'
+            db.session.commit()
+            assert stored().active_tasks == 1
+
+            # A rolled-back change never reaches the table
+            db.session.get(Employee, developer_id).experience = 9
+            db.session.flush()
+            db.session.rollback()
+            assert stored().experience == 4
+
+            # Bulk deletes skip the flush hooks; the row is still marked removed
+            Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+            db.session.execute(text("DELETE FROM employee_workload WHERE emp_id = :e"), {'e': developer_id})
+            db.session.execute(text("DELETE FROM employee_skills WHERE emp_id = :e"), {'e': developer_id})
+            Employee.query.filter_by(emp_id=developer_id).delete(synchronize_session=False)
+            db.session.commit()
+            assert stored() is None
+            assert get_task_assignment_recommendations({'skills': [SKILL]}, 5) == []
+        finally:
+            cleanup()
+    print("[PASS] Skill, metrics, task status and bulk delete writes reach the feature store")
+
+
+def test_engine_reads_snapshot():
+    print("\n=== Testing assign_tasks_ml on a FeatureSnapshot ===")
+    rng = random.Random(3)
+    employees, tasks = make_batch(120, 60, rng)
+    engine = create_engine('sqlite://')
+    store = FeatureStore()
+    with engine.begin() as conn:
+        create_features_table(conn)
+        replace_features(conn, [feature_row(emp, rng.randint(0, 3)) for emp in employees])
+        store.sync(conn)
+    engine.dispose()
+
+    # Store order follows the rows' (revision, emp_id) order
+    employees = sorted(employees, key=lambda emp: emp['emp_id'])
+    roster = store.snapshot()
+    assert roster.emp_ids == [emp['emp_id'] for emp in employees]
+    assert assign_tasks_ml(tasks, roster, None) == assign_tasks_ml(tasks, employees, None)
+
+    capacities = {emp_id: max(0, 3 - active) for emp_id, active in zip(roster.emp_ids, roster.active_tasks)}
+    expected = assign_tasks_optimal(tasks, employees, None, capacities=capacities)
+    assert assign_tasks_optimal(tasks, roster, None, capacities=capacities) == expected
+    print(f"[PASS] {len(tasks)} tasks assigned identically from {len(roster)} stored employees")
+
+
+if __name__ == '__main__':
+    test_sync_and_removal()
+    test_pushed_employee()
+    test_main_keeps_features_current()
+    test_engine_reads_snapshot()
+    print("\nAll feature store tests passed")
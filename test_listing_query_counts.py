@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Query-count harness for the task listing routes.
+
+Seeds a small and a large batch of tasks (each with its own assignee) and
+checks that every listing path issues the same number of SQL statements for
+both, i.e. no per-row Employee lookups.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from sqlalchemy import event
+from main import app, db, Employee, Task, get_pending_tasks
+
+PREFIX = 'QCOUNT_'
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement executed on the app engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def seed_tasks(count):
+    """Create count submitted tasks, each assigned to a distinct developer"""
+    for i in range(count):
+        emp_id = f'{PREFIX}DEV{i:04d}'
+        if not db.session.get(Employee, emp_id):
+            developer = Employee(emp_id=emp_id, name=f'Query Count Dev {i}',
+                                 email=f'{emp_id.lower()}@example.com', role='developer')
+            developer.set_password('x')
+            db.session.add(developer)
+        if not db.session.get(Task, f'{PREFIX}TASK{i:04d}'):
+            db.session.add(Task(task_id=f'{PREFIX}TASK{i:04d}', title=f'Query count task {i}',
+                                project_type='website_development', status='submitted',
+                                assigned_to=emp_id))
+    db.session.commit()
+
+def cleanup():
+    Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.execute(db.text("DELETE FROM employee_workload WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+    Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.commit()
+
+def pm_client():
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['emp_id'] = 'PM001'
+        sess['role'] = 'project manager'
+    return client
+
+def measure(label, func):
+    with app.app_context():
+        db.session.expire_all()
+        with count_queries() as statements:
+            func()
+    print(f"  {label}: {len(statements)} statements")
+    return len(statements)
+
+def listing_paths():
+    client = pm_client()
+
+    def pending_tasks():
+        assert get_pending_tasks()
+
+    def pending_review_route():
+        response = client.get('/pending_review_tasks')
+        assert response.status_code == 200
+
+    def task_management_route():
+        response = client.get('/task_management')
+        assert response.status_code == 200
+
+    return {
+        'get_pending_tasks': pending_tasks,
+        '/pending_review_tasks': pending_review_route,
+        '/task_management': task_management_route,
+    }
+
+def test_listing_routes_issue_constant_queries():
+    print("=== Testing listing query counts ===")
+    try:
+        with app.app_context():
+            cleanup()
+            seed_tasks(5)
+        small = {label: measure(label, func) for label, func in listing_paths().items()}
+
+        with app.app_context():
+            seed_tasks(60)
+        large = {label: measure(label, func) for label, func in listing_paths().items()}
+
+        for label in small:
+            assert large[label] <= small[label], (
+                f"{label} issued {small[label]} statements for 5 tasks but {large[label]} for 60"
+            )
+        print("[PASS] Statement count does not grow with the number of tasks")
+    finally:
+        with app.app_context():
+            cleanup()
+
+if __name__ == "__main__":
+    test_listing_routes_issue_constant_queries()
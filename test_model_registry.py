@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned model registry (model_registry.py): the live model
+is cached in memory, new versions published by another process are picked
+up, and readers never see a missing model while versions are swapped.
+"""
+
+import os
+import sys
+import pickle
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model_registry import ModelRegistry
+
+FEATURES = ['complexity', 'priority', 'skill_match_percentage']
+
+def model(name):
+    return {'model': name, 'feature_columns': FEATURES}
+
+def counting(registry):
+    """Count pickle reads done by registry.load()"""
+    reads = []
+    read_model = registry._read_model
+    registry._read_model = lambda version: reads.append(version) or read_model(version)
+    return reads
+
+def test_cached_until_new_version():
+    print("\n=== Testing in-memory cache and version pickup ===")
+    with tempfile.TemporaryDirectory() as root:
+        api = ModelRegistry(root)
+        assert api.load() is None and api.current_version() is None
+
+        trainer = ModelRegistry(root)  # stands in for another process
+        first = trainer.publish(model('v1'), employee_count=12)
+        assert first['employee_count'] == 12 and first['feature_columns'] == FEATURES
+        assert first['trained_at'] and first['has_model']
+
+        reads = counting(api)
+        for _ in range(5):
+            assert api.load() == model('v1')
+        assert reads == [first['version']]
+
+        second = trainer.publish(model('v2'), employee_count=13)
+        assert api.load() == model('v2') and api.load() == model('v2')
+        assert reads == [first['version'], second['version']]
+        assert api.loaded_version == second['version'] == api.current_version()
+        assert [meta['version'] for meta in api.list_versions()] == [second['version'], first['version']]
+        print("[PASS] One pickle read per published version")
+
+def test_prune_and_legacy_import():
+    print("\n=== Testing pruning and legacy model import ===")
+    with tempfile.TemporaryDirectory() as root:
+        legacy = os.path.join(root, 'task_assignment_model.pkl')
+        with open(legacy, 'wb') as f:
+            pickle.dump(model('legacy'), f)
+
+        registry = ModelRegistry(os.path.join(root, 'registry'), legacy_path=legacy, keep_versions=2)
+        assert registry.load() == model('legacy')
+        assert registry.list_versions()[0]['source'] == 'task_assignment_model.pkl'
+
+        for i in range(4):
+            latest = registry.publish(model(f'v{i}'))
+        versions = registry.list_versions()
+        assert len(versions) == 2 and versions[0]['version'] == latest['version']
+        assert not [name for name in os.listdir(registry.versions_dir) if name.startswith('.')]
+        print("[PASS] Legacy pickle imported, old versions pruned")
+
+def test_swap_never_leaves_a_gap():
+    print("\n=== Testing concurrent publish and load ===")
+    with tempfile.TemporaryDirectory() as root:
+        ModelRegistry(root).publish(model('v0'))
+        stop = threading.Event()
+        errors = []
+
+        def publisher():
+            trainer = ModelRegistry(root, keep_versions=2)
+            for i in range(1, 60):
+                trainer.publish(model(f'v{i}'))
+            stop.set()
+
+        def reader():
+            # A fresh registry per load, like a cold worker process
+            while not stop.is_set():
+                try:
+                    loaded = ModelRegistry(root).load()
+                    if not loaded or not loaded['model'].startswith('v'):
+                        errors.append(loaded)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=publisher)] + [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, errors[:3]
+        assert ModelRegistry(root).load() == model('v59')
+        print("[PASS] Readers always got a complete model")
+
+if __name__ == '__main__':
+    test_cached_until_new_version()
+    test_prune_and_legacy_import()
+    test_swap_never_leaves_a_gap()
+    print("\nAll model registry tests passed")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tests for learning from real assignment outcomes: approve/reject in main.py
+records a training row and forwards it to the task service, the outcome
+model replaces the synthetic one once there is enough history, later
+updates learn only the new rows, and compaction rebuilds it from everything.
+"""
+
+import os
+import sys
+import random
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from sqlalchemy import create_engine, text
+from assignment_engine import assign_tasks_ml
+from model_registry import ModelRegistry
+from outcomes import (COMPLETED, REJECTED, count_outcomes, create_outcomes_table, mark_forwarded, outcome_row,
+                      record_forwarded_outcomes, record_outcome, unforwarded_outcomes)
+from outcome_model import (MIN_OUTCOMES, UPDATE_BATCH, compact_outcome_model, is_outcome_model,
+                           pending_outcomes, read_outcomes, update_outcome_model)
+
+TASK_SKILLS = ['Python', 'SQL', 'Docker', 'AWS']
+PREFIX = 'OUTC_'
+
+
+def add_outcomes(conn, count, rng, start=0):
+    """Outcomes where a good skill match usually means the task was completed"""
+    for i in range(start, start + count):
+        skills = rng.sample(TASK_SKILLS, rng.randint(0, 4))
+        employee = {'skills': skills, 'experience': rng.randint(0, 10),
+                    'success_rate': rng.choice([None, 50.0, 90.0]), 'tasks_completed': rng.randint(0, 20)}
+        completed = len(skills) >= 2 if rng.random() < 0.9 else len(skills) < 2
+        record_outcome(conn, outcome_row(f'TASK{i}', f'EMP{i % 7}', 'data_engineering',
+                                         rng.choice(['Low', 'Medium', 'High']), 'Medium',
+                                         TASK_SKILLS, employee, completed))
+
+
+def test_incremental_updates_and_compaction():
+    print("\n=== Testing outcome model updates ===")
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        registry.publish({'model': 'synthetic', 'feature_columns': []})
+        engine = create_engine('sqlite://')
+        with engine.begin() as conn:
+            create_outcomes_table(conn)
+
+            # Not enough history: the synthetic model stays live
+            add_outcomes(conn, MIN_OUTCOMES - 1, rng)
+            assert pending_outcomes(conn, registry.load()) == (MIN_OUTCOMES - 1, MIN_OUTCOMES)
+            assert update_outcome_model(conn, registry) is None
+            assert registry.load()['model'] == 'synthetic'
+
+            add_outcomes(conn, 1, rng, start=MIN_OUTCOMES - 1)
+            first = update_outcome_model(conn, registry)
+            assert first['reason'] == 'compaction' and first['outcomes'] == MIN_OUTCOMES
+            assert is_outcome_model(registry.load())
+            live = registry.load()['model']
+            assert live.last_outcome_id == MIN_OUTCOMES
+
+            # Small batches wait; a full batch is learned on top of the live model
+            add_outcomes(conn, UPDATE_BATCH - 1, rng, start=MIN_OUTCOMES)
+            assert update_outcome_model(conn, registry) is None
+            add_outcomes(conn, 1, rng, start=MIN_OUTCOMES + UPDATE_BATCH - 1)
+            second = update_outcome_model(conn, registry)
+            assert second['reason'] == 'incremental'
+            assert second['outcomes'] == second['last_outcome_id'] == MIN_OUTCOMES + UPDATE_BATCH
+            assert live.outcomes == MIN_OUTCOMES  # the previous version was not modified
+            assert pending_outcomes(conn, registry.load()) == (0, UPDATE_BATCH)
+
+            # Compaction refits on the whole history
+            add_outcomes(conn, 150, rng, start=MIN_OUTCOMES + UPDATE_BATCH)
+            rebuilt = compact_outcome_model(conn, registry)
+            total = sum(count_outcomes(conn).values())
+            assert rebuilt['reason'] == 'compaction' and rebuilt['outcomes'] == total
+
+            model = registry.load()['model']
+            frame = read_outcomes(conn)
+            proba = model.predict_proba(frame)
+            assert proba.shape == (len(frame), 1) and ((proba >= 0) & (proba <= 1)).all()
+            good = proba[frame['skill_match_percentage'] >= 50].mean()
+            poor = proba[frame['skill_match_percentage'] < 50].mean()
+            assert good > poor, (good, poor)
+        engine.dispose()
+    print(f"[PASS] Published after {MIN_OUTCOMES} outcomes, then per {UPDATE_BATCH}; "
+          f"P(completed) {good:.2f} for good matches vs {poor:.2f}")
+
+
+def test_engine_scores_with_outcome_model():
+    print("\n=== Testing the assignment engine with an outcome model ===")
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        engine = create_engine('sqlite://')
+        with engine.begin() as conn:
+            create_outcomes_table(conn)
+            add_outcomes(conn, 200, rng)
+            compact_outcome_model(conn, registry)
+        engine.dispose()
+
+        employees = [{'emp_id': 'E1', 'name': 'One', 'skills': ['Python', 'SQL'], 'experience': 5,
+                      'success_rate': 80.0, 'tasks_completed': 3},
+                     {'emp_id': 'E2', 'name': 'Two', 'skills': ['Docker'], 'experience': 1,
+                      'success_rate': 40.0, 'tasks_completed': 1}]
+        tasks = [{'task_id': 'T1', 'project_type': 'data_engineering', 'skills': ['Python', 'SQL'],
+                  'complexity': 'Medium', 'priority': 'High'}]
+        assignments = assign_tasks_ml(tasks, employees, registry.load())
+        assert assignments['T1']['emp_id'] == 'E1'
+        # Scored with the model (0.7 custom + 0.3 P(completed)), not the fallback weights
+        assert assignments['T1']['score'] != assign_tasks_ml(tasks, employees, None)['T1']['score']
+    print("[PASS] Outcome model plugs into assign_tasks_ml")
+
+
+def test_forwarded_outcomes():
+    print("\n=== Testing outcome rows forwarded to the task service ===")
+    rng = random.Random(3)
+    main_engine, service_engine = create_engine('sqlite://'), create_engine('sqlite://')
+    with main_engine.begin() as conn:
+        create_outcomes_table(conn)
+        add_outcomes(conn, 5, rng)
+        ids, rows = unforwarded_outcomes(conn, limit=3)
+        assert ids == [1, 2, 3] and isinstance(rows[0]['recorded_at'], str) and 'id' not in rows[0]
+
+    with service_engine.begin() as conn:
+        create_outcomes_table(conn)
+        assert record_forwarded_outcomes(conn, rows) == 3
+        # The same batch again (its response was lost) adds nothing
+        assert record_forwarded_outcomes(conn, rows) == 0
+        assert sum(count_outcomes(conn).values()) == 3
+        assert read_outcomes(conn)['skill_match_percentage'].tolist() == [row['skill_match_percentage'] for row in rows]
+
+    with main_engine.begin() as conn:
+        mark_forwarded(conn, ids)
+        assert unforwarded_outcomes(conn)[0] == [4, 5]
+    print("[PASS] Pending rows sent once, duplicates skipped by the service")
+
+
+def test_approve_task_records_outcomes():
+    print("\n=== Testing /approve_task records outcomes ===")
+    import main
+    from main import app, db, Employee, Task
+
+    developer_id, manager_id = f'{PREFIX}DEV', f'{PREFIX}PM'
+
+    def cleanup():
+        db.session.rollback()
+        db.session.execute(text("DELETE FROM assignment_outcomes WHERE task_id LIKE :p"), {'p': f'{PREFIX}%'})
+        Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+        db.session.execute(text("DELETE FROM employee_workload WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+        db.session.execute(text("DELETE FROM employee_skills WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+        Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+        db.session.commit()
+
+    with app.app_context():
+        cleanup()
+        try:
+            developer = Employee(emp_id=developer_id, name='Outcome Dev', email='outc_dev@example.com',
+                                 role='developer', experience=4, tasks_completed=2, success_rate=50.0)
+            developer.set_password('x')
+            developer.set_skills_list(['HTML', 'CSS', 'Go'])
+            db.session.add(developer)
+            for i in range(2):
+                db.session.add(Task(task_id=f'{PREFIX}TASK{i}', title=f'Outcome task {i}',
+                                    project_type='website_development', complexity='High', priority='Low',
+                                    status='submitted', assigned_to=developer_id))
+            db.session.commit()
+
+            # The task service: records what it is sent
+            service_engine = create_engine('sqlite://')
+            with service_engine.begin() as conn:
+                create_outcomes_table(conn)
+
+            class Accepted:
+                status_code = 200
+
+            def post(url, json=None, headers=None, timeout=None):
+                assert url.endswith('/task-service/outcomes') and timeout
+                with service_engine.begin() as conn:
+                    record_forwarded_outcomes(conn, json['outcomes'])
+                return Accepted()
+
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['emp_id'] = manager_id
+                sess['role'] = 'project manager'
+            original_post, main.requests.post = main.requests.post, post
+            try:
+                for i, action in enumerate(['approve', 'reject']):
+                    response = client.post('/approve_task', json={'task_id': f'{PREFIX}TASK{i}', 'action': action})
+                    assert response.status_code == 200, response.data
+            finally:
+                main.requests.post = original_post
+
+            rows = db.session.execute(text(
+                "SELECT task_id, emp_id, complexity, priority, skill_match_percentage, experience, "
+                "tasks_completed, outcome, source FROM assignment_outcomes "
+                "WHERE task_id LIKE :p ORDER BY id"), {'p': f'{PREFIX}%'}).fetchall()
+            assert [(row.task_id, row.outcome) for row in rows] == [
+                (f'{PREFIX}TASK0', COMPLETED), (f'{PREFIX}TASK1', REJECTED)]
+            first, second = rows
+            assert (first.emp_id, first.complexity, first.priority, first.source) == (developer_id, 2, 0, 'main')
+            assert first.experience == 4 and 0 < first.skill_match_percentage < 100
+            # Metrics as they were before each review
+            assert first.tasks_completed == 2 and second.tasks_completed == 3
+
+            # Both rows reached the task service and are marked as accepted
+            with service_engine.connect() as conn:
+                forwarded = conn.execute(text("SELECT task_id, outcome, source FROM assignment_outcomes "
+                                              "WHERE task_id LIKE :p ORDER BY id"), {'p': f'{PREFIX}%'}).fetchall()
+            assert [tuple(row) for row in forwarded] == [(f'{PREFIX}TASK0', COMPLETED, 'main'),
+                                                         (f'{PREFIX}TASK1', REJECTED, 'main')]
+            assert db.session.execute(text("SELECT COUNT(*) FROM assignment_outcomes WHERE task_id LIKE :p "
+                                           "AND forwarded_at IS NULL"), {'p': f'{PREFIX}%'}).scalar() == 0
+        finally:
+            cleanup()
+    print("[PASS] Approval and rejection each stored a training row and forwarded it")
+
+
+if __name__ == '__main__':
+    test_incremental_updates_and_compaction()
+    test_engine_scores_with_outcome_model()
+    test_forwarded_outcomes()
+    test_approve_task_records_outcomes()
+    print("\nAll outcome model tests passed")
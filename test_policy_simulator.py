@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for the assignment policy simulator (policy_simulator.py): exact
+queueing on a hand-built stream, the cap, workload penalty and queue
+order changing the outcome, loading the stream from a tasks table
+(recorded and estimated durations, rework from rejected outcomes), and a
+process pool sweep giving the same metrics as a serial one.
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, text
+
+from policy_simulator import (DEFAULT_POLICY, TaskStream, load_stream, make_policy, policy_grid,
+                              simulate, sweep)
+
+START = datetime(2025, 3, 3, 9, 0)
+
+
+def task(task_id, hours_in, work_hours, review_hours=1, skills=None, priority='Medium', rework=0):
+    """Task created hours_in after START that took work_hours to submit and review_hours to approve"""
+    created = START + timedelta(hours=hours_in)
+    return {'task_id': task_id, 'created_at': created, 'assigned_at': created,
+            'submitted_at': created + timedelta(hours=work_hours),
+            'completion_date': created + timedelta(hours=work_hours + review_hours),
+            'skills': skills or ['Python'], 'priority': priority, 'complexity': 'Medium', 'rework': rework}
+
+
+def developer(emp_id, skills=('Python',), experience=5, success_rate=80.0):
+    return {'emp_id': emp_id, 'skills': list(skills), 'experience': experience, 'success_rate': success_rate}
+
+
+def test_hand_built_stream():
+    print("\n=== Testing the simulator on a hand-built stream ===")
+    stream = TaskStream([task('T1', 0, 10), task('T2', 1, 10), task('T3', 2, 4)], [developer('D1')])
+    assert stream.estimated_work == stream.estimated_review == 0
+
+    # One slot: T2 waits for T1's submission (10h), T3 for T2's (20h)
+    result = simulate(stream, {'max_active': 1})
+    assert result['completed'] == 3 and result['unassigned'] == 0
+    assert result['queue_wait_hours']['max'] == 18.0            # T3: created at 2h, assigned at 20h
+    assert result['completion_latency_hours']['max'] == 23.0    # T3: 20h + 4h work + 1h review - 2h
+    assert result['span_days'] == round(25 / 24, 2)
+    assert result['utilization']['mean'] == round(24 / 25, 4)
+
+    # Three slots: nothing queues, but the developer still works one task at a time
+    result = simulate(stream)
+    assert result['queue_wait_hours']['max'] == 0.0
+    assert result['completion_latency_hours']['max'] == 23.0
+
+    # Rework: a rejected review sends the task back to the developer
+    stream = TaskStream([task('T1', 0, 10, rework=1)], [developer('D1')])
+    assert simulate(stream)['completion_latency_hours']['max'] == 22.0
+
+    # Nobody qualifies: the task is never assigned
+    stream = TaskStream([task('T1', 0, 10, skills=['Go'])], [developer('D1')])
+    result = simulate(stream, {'min_skill_match': 50})
+    assert result['unassigned'] == 1 and result['completed'] == 0
+    assert simulate(stream)['completed'] == 1
+    print("[PASS] Queue wait, latency, utilization and rework follow the event order")
+
+
+def test_policy_changes_outcome():
+    print("\n=== Testing policies against each other ===")
+    # D1 scores best for everything; the cap decides how much D2 gets
+    developers = [developer('D1', experience=10, success_rate=100.0), developer('D2', experience=1, success_rate=10.0)]
+    tasks = [task(f'T{i}', i * 0.5, 8) for i in range(6)]
+    stream = TaskStream(tasks, developers)
+    capped = simulate(stream, {'max_active': 1})
+    uncapped = simulate(stream, {'max_active': 6})
+    assert capped['utilization']['idle_developers'] == 0
+    assert uncapped['utilization']['idle_developers'] == 1
+    assert capped['completion_latency_hours']['max'] < uncapped['completion_latency_hours']['max']
+
+    # High priority tasks jump the queue when queue_order is 'priority'
+    tasks = [task('T1', 0, 10), task('T2', 1, 10, priority='Low'), task('T3', 2, 10, priority='High')]
+    stream = TaskStream(tasks, [developer('D1')])
+    fifo = simulate(stream, {'max_active': 1})
+    by_priority = simulate(stream, {'max_active': 1, 'queue_order': 'priority'})
+    assert fifo['queue_wait_hours']['max'] == 18.0           # T3 after T2
+    assert by_priority['queue_wait_hours']['max'] == 19.0    # T2 after T3
+
+    # D1 keeps a free slot (1h tasks every 2h) and gets everything until the
+    # penalty for more than 3 tasks in the window makes D2 (0.73) score higher
+    tasks = [task(f'T{i}', i * 2, 1) for i in range(8)]
+    stream = TaskStream(tasks, developers)
+    assert simulate(stream, {'workload_penalty': 1})['utilization']['idle_developers'] == 1
+    assert simulate(stream, {'workload_penalty': 0.8})['utilization']['idle_developers'] == 1   # 0.8 > 0.73
+    penalized = simulate(stream, {'workload_penalty': 0.5})
+    assert penalized['utilization']['idle_developers'] == 0
+    assert penalized != simulate(stream, {'workload_penalty': 1})
+    # Only the window's assignments count: with 6 hours D1 never has more than 3
+    assert simulate(stream, {'workload_penalty': 0.5, 'penalty_window_hours': 6})['utilization']['idle_developers'] == 1
+
+    assert make_policy() == DEFAULT_POLICY
+    for bad in ({'max_active': 0}, {'queue_order': 'random'}, {'unknown': 1}, {'skill_weight': -1},
+                {'penalty_window_hours': 0}):
+        try:
+            make_policy(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} accepted")
+    assert len(policy_grid(['skill_weight=0.5,0.7', 'max_active=2,3,4'])) == 6
+    print("[PASS] The cap and the workload penalty spread work; priority order reorders the queue; "
+          "bad parameters rejected")
+
+
+def test_load_stream_from_tasks_table():
+    print("\n=== Testing load_stream on a tasks table ===")
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE tasks (task_id TEXT, project_type TEXT, complexity TEXT, priority TEXT, "
+                          "created_at DATETIME, assigned_at DATETIME, start_date DATETIME, "
+                          "submitted_at DATETIME, completion_date DATETIME)"))
+        conn.execute(text("CREATE TABLE employees (emp_id TEXT, role TEXT, skills TEXT, experience INTEGER, "
+                          "success_rate FLOAT)"))
+        conn.execute(text("CREATE TABLE assignment_outcomes (task_id TEXT, outcome INTEGER)"))
+        rows = [
+            # 6h of work (start_date after the assignment), 2h review
+            ('T1', 'api_development', 'Medium', '2025-03-03 09:00:00', '2025-03-03 10:00:00',
+             '2025-03-03 12:00:00', '2025-03-03 18:00:00', '2025-03-03 20:00:00'),
+            # Planned start_date before the assignment: work counts from assigned_at
+            ('T2', 'devops', 'Medium', '2025-03-04 09:00:00', '2025-03-04 09:00:00',
+             '2025-03-01 00:00:00', '2025-03-04 19:00:00', None),
+            # Still open: estimated from the Medium median
+            ('T3', 'api_development', 'Medium', '2025-03-05 09:00:00', None, None, None, None),
+        ]
+        for row in rows:
+            conn.execute(text("INSERT INTO tasks VALUES (:id, :type, :complexity, 'High', :created, :assigned, "
+                              ":start, :submitted, :completed)"),
+                         dict(zip(['id', 'type', 'complexity', 'created', 'assigned', 'start', 'submitted',
+                                   'completed'], row)))
+        conn.execute(text("INSERT INTO employees VALUES ('E1', 'developer', '[\"Flask\", \"Docker\"]', 4, 70), "
+                          "('E2', 'manager', '[]', 9, 90)"))
+        conn.execute(text("INSERT INTO assignment_outcomes VALUES ('T1', 0), ('T1', 1), ('T2', 1)"))
+
+    stream = load_stream(engine)
+    assert stream.task_ids == ['T1', 'T2', 'T3'] and stream.emp_ids == ['E1']
+    assert list(stream.work / 3600) == [6.0, 10.0, 8.0]
+    assert list(stream.review / 3600) == [2.0, 2.0, 2.0]
+    assert (stream.estimated_work, stream.estimated_review) == (1, 2)
+    assert stream.rework == [1, 0, 0]
+    assert round(float(stream.match_percentages(0)[0]), 2) == round(100 / 9, 2)
+    assert stream.match_percentage(1, 0) == 10.0
+
+    assert load_stream(engine, until='2025-03-04').task_ids == ['T1']
+    assert simulate(stream)['completed'] == 3
+    engine.dispose()
+    print("[PASS] Recorded durations, median estimates, rework rounds and developers loaded")
+
+
+def synthetic_stream(n_tasks, n_developers, days, rng):
+    skills = ['Python', 'SQL', 'Docker', 'React', 'Go', 'AWS', 'Flask', 'Kotlin', 'Spark', 'Unity']
+    developers = [developer(f'D{i}', rng.sample(skills, rng.randint(1, 4)), rng.randint(0, 10),
+                            rng.uniform(20, 100)) for i in range(n_developers)]
+    tasks = [task(f'T{i}', rng.uniform(0, days * 24), rng.expovariate(1 / 30), rng.expovariate(1 / 6),
+                  rng.sample(skills, rng.randint(1, 3)), rng.choice(['Low', 'Medium', 'High']),
+                  int(rng.random() < 0.1))
+             for i in range(n_tasks)]
+    return TaskStream(tasks, developers)
+
+
+def test_parallel_sweep():
+    print("\n=== Testing a process pool sweep ===")
+    stream = synthetic_stream(2000, 60, 90, random.Random(11))
+    policies = policy_grid(['skill_weight=0.5,0.9', 'max_active=2,3', 'min_skill_match=0,30',
+                            'mismatch_slowdown=0,0.5'])
+    started = time.perf_counter()
+    serial = sweep(stream, policies, workers=1)
+    elapsed = time.perf_counter() - started
+    assert sweep(stream, policies, workers=2) == serial
+    assert [result['policy'] for result in serial] == [make_policy(policy) for policy in policies]
+    assert len({result['metrics']['completion_latency_hours']['p95'] for result in serial}) > 1
+    print(f"[PASS] {len(policies)} policies over {len(stream)} tasks: {elapsed / len(policies) * 1000:.0f} ms each; "
+          f"pool results identical")
+
+
+if __name__ == '__main__':
+    test_hand_built_stream()
+    test_policy_changes_outcome()
+    test_load_stream_from_tasks_table()
+    test_parallel_sweep()
+    print("\nAll policy simulator tests passed")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for read-only connection routing (db_routing.py).
+
+Checks that @read_only_route views run their queries on the read-only engine,
+that the read-only engine refuses writes, and that snapshot mode serves a
+copy that only changes when it is refreshed.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from db_routing import ReadRouter
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def test_read_only_routes_use_read_engine():
+    print("\n=== Testing read-only routes use the read engine ===")
+    from main import app, db
+    router = app.extensions['read_router']
+    if not router.enabled:
+        print("[SKIP] SQLITE_READ_ROUTING=off")
+        return
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['emp_id'] = 'PM001'
+        sess['role'] = 'project manager'
+
+    with app.app_context():
+        primary = db.engine
+        read_engine = router.get_engine()
+    with count_statements(primary) as primary_statements, count_statements(read_engine) as read_statements:
+        response = client.get('/task_management')
+    assert response.status_code == 200
+    assert read_statements, "no queries on the read engine"
+    assert not primary_statements, primary_statements
+    print(f"[PASS] {len(read_statements)} statements on the read engine, none on the primary")
+
+def make_database():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE tasks (task_id TEXT PRIMARY KEY, status TEXT)")
+    conn.execute("INSERT INTO tasks VALUES ('TASK001', 'assigned')")
+    conn.commit()
+    conn.close()
+    return path
+
+def remove_database(path):
+    for suffix in ('', '-wal', '-shm', '.tmp'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+def test_read_engine_refuses_writes():
+    print("\n=== Testing read-only engine refuses writes ===")
+    path = make_database()
+    router = ReadRouter(path, mode='readonly')
+    try:
+        with router.get_engine().connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM tasks")).scalar() == 1
+            try:
+                conn.execute(text("UPDATE tasks SET status = 'completed'"))
+                raise AssertionError("write succeeded on the read-only engine")
+            except OperationalError as e:
+                print(f"[PASS] Write rejected: {e.orig}")
+    finally:
+        router.dispose()
+        remove_database(path)
+
+def test_snapshot_mode_refreshes():
+    print("\n=== Testing snapshot mode ===")
+    path = make_database()
+    router = ReadRouter(path, mode='snapshot', snapshot_interval=3600)
+    try:
+        count_sql = text("SELECT count(*) FROM tasks")
+        with router.get_engine().connect() as conn:
+            assert conn.execute(count_sql).scalar() == 1
+
+        primary = sqlite3.connect(path)
+        primary.execute("INSERT INTO tasks VALUES ('TASK002', 'assigned')")
+        primary.commit()
+        primary.close()
+
+        # Interval not reached: still the old copy
+        with router.get_engine().connect() as conn:
+            assert conn.execute(count_sql).scalar() == 1
+
+        router.refresh_snapshot()
+        with router.get_engine().connect() as conn:
+            assert conn.execute(count_sql).scalar() == 2
+        print("[PASS] Snapshot is stable between refreshes and current after one")
+    finally:
+        router.dispose()
+        remove_database(router.snapshot_path)
+        remove_database(path)
+
+if __name__ == "__main__":
+    test_read_only_routes_use_read_engine()
+    test_read_engine_refuses_writes()
+    test_snapshot_mode_refreshes()
+    print("\nAll read routing tests passed")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for the recommendation cache (recommendation_cache.py): LRU eviction
+and stats, repeat recommendations served without ranking queries, and
+invalidation when an employee's skills or a task's status change.
+"""
+
+import os
+import sys
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from recommendation_cache import RecommendationCache, task_signature
+from test_listing_query_counts import count_queries
+
+PREFIX = 'RCACHE_'
+SKILL = f'{PREFIX}Haskell'
+
+
+def test_lru_eviction_and_stats():
+    print("\n=== Testing recommendation cache LRU and stats ===")
+    cache = RecommendationCache(max_entries=2)
+    a = task_signature({'skills': ['React.js', 'Python'], 'complexity': 'Low', 'priority': 'High'}, 3)
+    b = task_signature({'skills': ['python', 'react'], 'complexity': 'Low', 'priority': 'High'}, 3)
+    assert a == b  # skill order and aliases do not matter
+    c = task_signature({'skills': ['Go'], 'complexity': 'Low', 'priority': 'High'}, 3)
+    d = task_signature({'skills': ['Go'], 'complexity': 'Low', 'priority': 'High'}, 1)
+
+    versions = (1, 1)
+    assert cache.get(a, versions) is None
+    cache.put(a, versions, ['A'])
+    cache.put(c, versions, ['C'])
+    assert cache.get(a, versions) == ['A']  # a is now most recently used
+    cache.put(d, versions, ['D'])
+    assert cache.get(c, versions) is None and cache.get(a, versions) == ['A']
+    assert cache.stats()['evictions'] == 1 and len(cache) == 2
+
+    # Newer versions drop everything; a read of older versions is not cached
+    assert cache.get(a, (1, 2)) is None and len(cache) == 0
+    cache.put(a, (1, 1), ['stale'])
+    assert len(cache) == 0 and cache.get(a, (1, 1)) is None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (2, 4, 2)
+    assert stats['hit_rate'] == round(2 / 6, 4)
+    assert (stats['roster_version'], stats['workload_version']) == (1, 2)
+
+    disabled = RecommendationCache(max_entries=0)
+    disabled.put(a, versions, ['A'])
+    assert disabled.get(a, versions) is None
+    print("[PASS] Least recently used entry evicted; older versions never served")
+
+
+def test_cached_recommendations_and_invalidation():
+    print("\n=== Testing cached recommendations and invalidation ===")
+    from main import (app, db, Employee, Task, RECOMMENDATION_CACHE,
+                      get_task_assignment_recommendations)
+
+    developer_id, other_id = f'{PREFIX}DEV0', f'{PREFIX}DEV1'
+    task_data = {'skills': [SKILL], 'complexity': 'Medium', 'priority': 'High'}
+
+    def cleanup():
+        db.session.rollback()
+        Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+        for table in ('employee_workload', 'employee_skills'):
+            db.session.execute(db.text(f"DELETE FROM {table} WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+        Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+        db.session.execute(db.text("DELETE FROM skills WHERE name_folded LIKE :p"), {'p': f'{PREFIX.lower()}%'})
+        db.session.commit()
+
+    def recommended():
+        db.session.expunge_all()
+        return [item['emp_id'] for item in get_task_assignment_recommendations(task_data, 5)]
+
+    with app.app_context():
+        cleanup()
+        try:
+            for i, emp_id in enumerate((developer_id, other_id)):
+                developer = Employee(emp_id=emp_id, name=f'Cache Dev {i}', email=f'rcache_dev{i}@example.com',
+                                     role='developer', experience=5 - i, success_rate=0.0)
+                developer.set_password('x')
+                developer.set_skills_list([SKILL])
+                db.session.add(developer)
+            db.session.commit()
+
+            assert recommended() == [developer_id, other_id]
+            hits = RECOMMENDATION_CACHE.hits
+            with count_queries() as statements:
+                first = get_task_assignment_recommendations(task_data, 5)
+            assert RECOMMENDATION_CACHE.hits == hits + 1
+            assert len(statements) == 1, statements  # only the version counters
+            first[0]['name'] = 'changed by caller'
+            assert get_task_assignment_recommendations(task_data, 5)[0]['name'] == 'Cache Dev 0'
+
+            # Skill change -> roster version bump -> recomputed
+            developer = db.session.get(Employee, developer_id)
+            developer.set_skills_list(['Cobol'])
+            db.session.commit()
+            misses = RECOMMENDATION_CACHE.misses
+            assert recommended() == [other_id]
+            assert RECOMMENDATION_CACHE.misses == misses + 1
+
+            # A task reaching the active-task limit -> workload version bump
+            for i in range(3):
+                db.session.add(Task(task_id=f'{PREFIX}TASK{i}', title=f'Cache task {i}',
+                                    project_type='website_development', status='completed',
+                                    assigned_to=other_id))
+            db.session.commit()
+            assert recommended() == [other_id]
+            for task in Task.query.filter(Task.task_id.like(f'{PREFIX}%')).all():
+                task.status = 'in_progress'
+            db.session.commit()
+            assert recommended() == []
+
+            # Bulk updates skip the flush hook but still invalidate
+            assert recommended() == []
+            Employee.query.filter_by(emp_id=other_id).update({'experience': 0}, synchronize_session=False)
+            db.session.commit()
+            misses = RECOMMENDATION_CACHE.misses
+            assert recommended() == []
+            assert RECOMMENDATION_CACHE.misses == misses + 1
+        finally:
+            cleanup()
+    print("[PASS] Repeat served from cache; skill and task status writes invalidate")
+
+
+def test_roster_write_in_another_process():
+    print("\n=== Testing a roster write committed by another worker ===")
+    from main import app, db, Employee, SKILL_INDEX, get_task_assignment_recommendations
+
+    developer_id, hired_id = f'{PREFIX}DEV0', f'{PREFIX}HIRED'
+    task_data = {'skills': [SKILL], 'complexity': 'Low', 'priority': 'Low'}
+
+    def cleanup():
+        db.session.rollback()
+        for table in ('employee_workload', 'employee_skills'):
+            db.session.execute(db.text(f"DELETE FROM {table} WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+        Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+        db.session.execute(db.text("DELETE FROM skills WHERE name_folded LIKE :p"), {'p': f'{PREFIX.lower()}%'})
+        db.session.commit()
+
+    def recommended():
+        db.session.expunge_all()
+        return [item['emp_id'] for item in get_task_assignment_recommendations(task_data, 5)]
+
+    # Another worker process hires a developer through main.py's own models and hooks
+    hire = (
+        "import sys; sys.path.insert(0, sys.argv[1]); "
+        "from main import app, db, Employee; "
+        "ctx = app.app_context(); ctx.push(); "
+        "dev = Employee(emp_id=sys.argv[2], name='Hired Dev', email='rcache_hired@example.com', "
+        "role='developer', experience=9, success_rate=90.0); "
+        "dev.set_password('x'); dev.set_skills_list([sys.argv[3]]); "
+        "db.session.add(dev); db.session.commit()"
+    )
+
+    with app.app_context():
+        cleanup()
+        try:
+            developer = Employee(emp_id=developer_id, name='Cache Dev 0', email='rcache_dev0@example.com',
+                                 role='developer', experience=1, success_rate=0.0)
+            developer.set_password('x')
+            developer.set_skills_list([SKILL])
+            db.session.add(developer)
+            db.session.commit()
+            assert recommended() == [developer_id]
+            builds = SKILL_INDEX._built_at
+
+            subprocess.run([sys.executable, '-c', hire, os.path.dirname(os.path.abspath(__file__)),
+                            hired_id, SKILL], check=True, capture_output=True)
+            assert recommended() == [hired_id, developer_id]
+            assert SKILL_INDEX._built_at == builds, "picked up by a rebuild, not the roster sync"
+        finally:
+            cleanup()
+    print("[PASS] Developer hired in another process recommended without an index rebuild")
+
+
+def test_stats_endpoint():
+    print("\n=== Testing /api/recommendation_cache/stats ===")
+    from main import app
+
+    client = app.test_client()
+    assert client.get('/api/recommendation_cache/stats').status_code == 403
+    with client.session_transaction() as sess:
+        sess['emp_id'] = f'{PREFIX}PM'
+        sess['role'] = 'project manager'
+    response = client.get('/api/recommendation_cache/stats')
+    assert response.status_code == 200
+    stats = response.json['stats']
+    assert {'entries', 'max_entries', 'hits', 'misses', 'hit_rate', 'evictions'} <= set(stats)
+    print("[PASS] Stats exposed to project managers")
+
+
+if __name__ == '__main__':
+    test_lru_eviction_and_stats()
+    test_cached_recommendations_and_invalidation()
+    test_roster_write_in_another_process()
+    test_stats_endpoint()
+    print("\nAll recommendation cache tests passed")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Query-count and ranking tests for the task assignment recommender.
+
+The recommender must read active-task counts for all candidates at once, so
+the number of SQL statements for one recommendation does not grow with the
+number of candidate developers. Also checks that the 3-active-task limit is
+still applied from those counts, and that the top-K ranking (and its score
+breakdown) agrees with the single-result recommendation.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from main import (app, db, Employee, Task, get_task_assignment_recommendation,
+                  get_task_assignment_recommendations)
+from test_listing_query_counts import count_queries
+
+PREFIX = 'RECQ_'
+SKILL = f'{PREFIX}Elixir'
+
+def cleanup():
+    db.session.rollback()
+    Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    for table in ('employee_workload', 'employee_skills'):
+        db.session.execute(db.text(f"DELETE FROM {table} WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+    Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.execute(db.text("DELETE FROM skills WHERE name_folded LIKE :p"), {'p': f'{PREFIX.lower()}%'})
+    db.session.commit()
+
+@contextmanager
+def developers(count):
+    """count developers with SKILL; developer 0 is the most experienced"""
+    with app.app_context():
+        cleanup()
+        try:
+            for i in range(count):
+                developer = Employee(emp_id=f'{PREFIX}DEV{i:03d}', name=f'Rec Dev {i}',
+                                     email=f'recq_dev{i}@example.com', role='developer',
+                                     experience=5 if i == 0 else 1, success_rate=0.0)
+                developer.set_password('x')
+                developer.set_skills_list([SKILL])
+                db.session.add(developer)
+            db.session.commit()
+            yield
+        finally:
+            cleanup()
+
+def recommendation_statements():
+    get_task_assignment_recommendation({'skills': [SKILL]})  # warm the skill index
+    db.session.expunge_all()
+    with count_queries() as statements:
+        recommendation = get_task_assignment_recommendation({'skills': [SKILL]})
+    return recommendation, len(statements)
+
+def test_statement_count_independent_of_candidates():
+    print("\n=== Testing recommendation statement count ===")
+    with developers(3):
+        small_rec, small = recommendation_statements()
+    with developers(40):
+        large_rec, large = recommendation_statements()
+    print(f"  3 candidates: {small} statements, 40 candidates: {large} statements")
+    assert small_rec['emp_id'] == large_rec['emp_id'] == f'{PREFIX}DEV000'
+    assert large == small, (small, large)
+    print("[PASS] Constant number of statements")
+
+def test_active_task_limit_applied():
+    print("\n=== Testing 3 active task limit ===")
+    with developers(2):
+        for i in range(3):
+            db.session.add(Task(task_id=f'{PREFIX}TASK{i}', title='Busy', project_type='website_development',
+                                status='in_progress' if i else 'assigned', assigned_to=f'{PREFIX}DEV000'))
+        db.session.commit()
+        recommendation = get_task_assignment_recommendation({'skills': [SKILL]})
+        assert recommendation['emp_id'] == f'{PREFIX}DEV001', recommendation
+        assert recommendation['active_tasks'] == 0
+        print(f"[PASS] Busy developer skipped, recommended {recommendation['emp_id']}")
+
+def test_top_k_ranking():
+    print("\n=== Testing top-K recommendations ===")
+    with developers(6):
+        # Experience 0..5 (capped experience score), DEV002 and DEV003 tie
+        for i, experience in enumerate([5, 1, 3, 3, 0, 2]):
+            db.session.get(Employee, f'{PREFIX}DEV{i:03d}').experience = experience
+        db.session.add(Task(task_id=f'{PREFIX}TASK0', title='Busy', project_type='website_development',
+                            status='assigned', assigned_to=f'{PREFIX}DEV003'))
+        db.session.commit()
+
+        ranked = get_task_assignment_recommendations({'skills': [SKILL]}, k=3)
+        assert [r['emp_id'] for r in ranked] == [f'{PREFIX}DEV000', f'{PREFIX}DEV002', f'{PREFIX}DEV003']
+        assert [r['rank'] for r in ranked] == [1, 2, 3]
+        assert ranked[1]['breakdown'] == {'skill_match': 100.0, 'experience_score': 30,
+                                          'success_score': 0.0, 'active_tasks': 0}
+        assert ranked[2]['active_tasks'] == ranked[2]['breakdown']['active_tasks'] == 1
+        assert ranked[0]['match_score'] == '150.0'
+
+        everyone = get_task_assignment_recommendations({'skills': [SKILL]}, k=50)
+        assert len(everyone) == 6
+        assert [float(r['match_score']) for r in everyone] == sorted(
+            (float(r['match_score']) for r in everyone), reverse=True)
+
+        single = get_task_assignment_recommendation({'skills': [SKILL]})
+        assert single == ranked[0]
+        assert get_task_assignment_recommendations({'skills': [f'{PREFIX}Nothing']}) == []
+        print("[PASS] Ranked best first with breakdowns; k=1 matches the single recommendation")
+
+def test_top_k_endpoint():
+    print("\n=== Testing /api/get_assignment_recommendations ===")
+    with developers(4):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['emp_id'] = 'PM001'
+            sess['role'] = 'project manager'
+        response = client.post('/api/get_assignment_recommendations', json={'skills': [SKILL], 'k': 2})
+        data = response.get_json()
+        assert response.status_code == 200 and data['success'] and data['k'] == 2
+        assert len(data['recommendations']) == 2
+        assert data['recommendations'][0]['emp_id'] == f'{PREFIX}DEV000'
+        assert set(data['recommendations'][0]['breakdown']) == {
+            'skill_match', 'experience_score', 'success_score', 'active_tasks'}
+
+        assert client.post('/api/get_assignment_recommendations', json={'skills': [SKILL], 'k': 'x'}).status_code == 400
+        assert app.test_client().post('/api/get_assignment_recommendations', json={}).status_code == 403
+        print("[PASS] Endpoint returns k ranked candidates")
+
+if __name__ == "__main__":
+    test_statement_count_independent_of_candidates()
+    test_active_task_limit_applied()
+    test_top_k_ranking()
+    test_top_k_endpoint()
+    print("\nAll recommendation query tests passed")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the column projections in serializers.py.
+
+Seeds one task with an assignee and checks that projected rows serialize to
+the same payloads the views built by hand, that list projections do not
+select Text columns they never render, and that a missing assignee falls
+back to 'Unknown'.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from sqlalchemy import select
+from main import app, db, Employee, Task, TASK_PROJECTIONS, EMPLOYEE_PROJECTIONS
+
+PREFIX = 'SER_'
+
+def cleanup():
+    db.session.rollback()
+    Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    for table in ('employee_workload', 'employee_skills'):
+        db.session.execute(db.text(f"DELETE FROM {table} WHERE emp_id LIKE :p"), {'p': f'{PREFIX}%'})
+    Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.commit()
+
+@contextmanager
+def seeded():
+    with app.app_context():
+        cleanup()
+        try:
+            developer = Employee(emp_id=f'{PREFIX}DEV', name='Serializer Dev', email='ser_dev@example.com',
+                                 role='developer', experience=4)
+            developer.set_password('x')
+            developer.set_skills_list(['Python', 'SQL'])
+            db.session.add(developer)
+            db.session.add(Task(task_id=f'{PREFIX}TASK1', title='Serializer task', description='Body',
+                                project_type='website_development', status='submitted',
+                                assigned_to=f'{PREFIX}DEV', due_date=datetime(2026, 1, 2, 3, 4, 5),
+                                submitted_at=datetime(2026, 1, 1), spec_zip_path='specs/a.zip'))
+            db.session.add(Task(task_id=f'{PREFIX}TASK2', title='Orphan task',
+                                project_type='website_development', status='submitted',
+                                assigned_to=f'{PREFIX}GONE'))
+            db.session.commit()
+            yield
+        finally:
+            cleanup()
+
+def project(name, task_id):
+    projection = TASK_PROJECTIONS[name]
+    return projection.serialize_row(projection.query(db.session).filter(Task.task_id == task_id).one())
+
+def test_api_projection_matches_to_dict():
+    print("\n=== Testing api projection matches Task.to_dict ===")
+    with seeded():
+        task = db.session.get(Task, f'{PREFIX}TASK1')
+        assert project('api', f'{PREFIX}TASK1') == task.to_dict()
+        assert task.to_dict()['has_spec_file'] is True
+        assert task.to_dict()['due_date'] == '2026-01-02T03:04:05'
+        print("[PASS] Row and entity payloads are identical")
+
+def test_review_projection_joins_assignee():
+    print("\n=== Testing assignee name join ===")
+    with seeded():
+        row = project('review_api', f'{PREFIX}TASK1')
+        assert row['assigned_to_name'] == 'Serializer Dev'
+        assert row['submitted_at'] == '2026-01-01T00:00:00'
+        assert project('review_api', f'{PREFIX}TASK2')['assigned_to_name'] == 'Unknown'
+        print(f"[PASS] {row['assigned_to_name']} / Unknown")
+
+def test_list_projections_skip_unrendered_text():
+    print("\n=== Testing list projections skip unrendered Text columns ===")
+    for name in ('management_list', 'review_list'):
+        sql = str(select(*TASK_PROJECTIONS[name].columns()))
+        assert 'tasks.description' not in sql and 'tasks.feedback' not in sql, (name, sql)
+    with seeded():
+        row = project('management_list', f'{PREFIX}TASK1')
+        # Sort key is selected for pagination but not part of the payload
+        assert 'created_at' not in row and row['task_id'] == f'{PREFIX}TASK1'
+    print("[PASS] description / feedback not selected")
+
+def test_employee_assignee_projection():
+    print("\n=== Testing employee assignee projection ===")
+    with seeded():
+        projection = EMPLOYEE_PROJECTIONS['assignee']
+        row = projection.query(db.session).filter(Employee.emp_id == f'{PREFIX}DEV').one()
+        assignee = projection.serialize_row(row)
+        assert assignee == {'emp_id': f'{PREFIX}DEV', 'name': 'Serializer Dev', 'email': 'ser_dev@example.com',
+                            'role': 'developer', 'experience': 4, 'skills': ['Python', 'SQL']}
+        print(f"[PASS] {assignee}")
+
+if __name__ == "__main__":
+    test_api_projection_matches_to_dict()
+    test_review_projection_joins_assignee()
+    test_list_projections_skip_unrendered_text()
+    test_employee_assignee_projection()
+    print("\nAll serializer tests passed")
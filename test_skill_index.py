@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory skill index (skill_index.py) and how main.py keeps
+it current: committed employee changes are applied incrementally, rolled
+back ones are not.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from skill_index import SkillIndex
+
+PREFIX = 'SKIDX_'
+
+def test_match_and_incremental_updates():
+    print("\n=== Testing SkillIndex matching and updates ===")
+    index = SkillIndex(max_age=0)
+    index.build([('DEV1', ['Python', 'SQL']), ('DEV2', ['python']), ('DEV3', ['Java'])])
+
+    assert index.match(['PYTHON', 'sql']) == {'DEV1': 100.0, 'DEV2': 50.0}
+    assert index.match(['Python', 'SQL', 'Go']) == {'DEV1': (2 / 3) * 100}
+    assert index.match([]) == {'DEV1': 50, 'DEV2': 50, 'DEV3': 50}
+
+    index.update('DEV3', 'developer', ['Go', 'SQL'])
+    index.update('DEV2', 'project manager', ['Python'])
+    index.remove('DEV1')
+    assert index.match(['Python', 'SQL', 'Go']) == {'DEV3': (2 / 3) * 100}
+    assert index.developers() == ['DEV3']
+    print("[PASS] Postings follow updates, promotions and removals")
+
+def test_stale_index_rebuilds():
+    print("\n=== Testing max_age rebuild ===")
+    index = SkillIndex(max_age=0)
+    loads = []
+    index.ensure_built(lambda: loads.append(1) or [('DEV1', ['Python'])])
+    index.ensure_built(lambda: loads.append(1) or [('DEV1', ['Python'])])
+    assert len(loads) == 1
+
+    index.max_age = 1e-9
+    index.ensure_built(lambda: loads.append(1) or [('DEV9', ['Rust'])])
+    assert len(loads) == 2 and index.developers() == ['DEV9']
+    print("[PASS] Built once, rebuilt when stale")
+
+def test_main_applies_committed_changes_only():
+    print("\n=== Testing main.py feeds committed employee changes ===")
+    from main import app, db, Employee, SKILL_INDEX, get_skill_match_candidates
+
+    skill = f'{PREFIX}Haskell'
+    emp_id = f'{PREFIX}DEV'
+    with app.app_context():
+        try:
+            get_skill_match_candidates([skill])  # builds the index
+            builds = SKILL_INDEX._built_at
+
+            developer = Employee(emp_id=emp_id, name='Index Dev', email='skidx_dev@example.com', role='developer')
+            developer.set_password('x')
+            developer.set_skills_list([skill])
+            db.session.add(developer)
+            db.session.flush()
+            db.session.rollback()
+            assert emp_id not in SKILL_INDEX.match([skill])
+
+            developer = Employee(emp_id=emp_id, name='Index Dev', email='skidx_dev@example.com', role='developer')
+            developer.set_password('x')
+            developer.set_skills_list([skill])
+            db.session.add(developer)
+            db.session.commit()
+            assert [dev.emp_id for dev, _ in get_skill_match_candidates([skill])] == [emp_id]
+
+            developer = db.session.get(Employee, emp_id)
+            developer.set_skills_list(['Python'])
+            db.session.commit()
+            assert get_skill_match_candidates([skill]) == []
+
+            db.session.delete(developer)
+            db.session.commit()
+            assert emp_id not in SKILL_INDEX.developers()
+            assert SKILL_INDEX._built_at == builds, "index was rebuilt instead of updated"
+            print("[PASS] Insert, update and delete applied without a rebuild")
+        finally:
+            db.session.rollback()
+            Employee.query.filter_by(emp_id=emp_id).delete()
+            db.session.execute(db.text("DELETE FROM employee_skills WHERE emp_id = :e"), {'e': emp_id})
+            db.session.execute(db.text("DELETE FROM skills WHERE name_folded LIKE :p"), {'p': f'{PREFIX.lower()}%'})
+            db.session.commit()
+
+if __name__ == "__main__":
+    test_match_and_incremental_updates()
+    test_stale_index_rebuilds()
+    test_main_applies_committed_changes_only()
+    print("\nAll skill index tests passed")
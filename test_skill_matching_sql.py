@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the normalized skills tables and SQL-side skill matching.
+
+Seeds developers with distinctive (prefixed) skill names, then checks that
+set_skills_list keeps employee_skills in sync, that matching is
+case-insensitive, that the 50% minimum is applied and that loading the
+candidates is a single statement.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from main import app, db, Employee, Skill, EmployeeSkill, get_skill_match_candidates
+from test_listing_query_counts import count_queries
+
+PREFIX = 'SKM_'
+
+def seed_developers():
+    """DEV0 knows a, b, c; DEV1 knows a; DEV2 knows b, c (mixed case); MGR0 knows everything"""
+    skill_sets = {
+        f'{PREFIX}DEV0': [f'{PREFIX}Alpha', f'{PREFIX}Beta', f'{PREFIX}Gamma'],
+        f'{PREFIX}DEV1': [f'{PREFIX}Alpha'],
+        f'{PREFIX}DEV2': [f'{PREFIX}BETA', f'{PREFIX}gamma'],
+        f'{PREFIX}MGR0': [f'{PREFIX}Alpha', f'{PREFIX}Beta', f'{PREFIX}Gamma'],
+    }
+    for emp_id, skills in skill_sets.items():
+        employee = Employee(emp_id=emp_id, name=f'Skill Match {emp_id}', email=f'{emp_id.lower()}@example.com',
+                            role='project manager' if 'MGR' in emp_id else 'developer')
+        employee.set_password('x')
+        employee.set_skills_list(skills)
+        db.session.add(employee)
+    db.session.commit()
+
+def cleanup():
+    db.session.rollback()
+    EmployeeSkill.query.filter(EmployeeSkill.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    Skill.query.filter(Skill.name_folded.like(f'{PREFIX.lower()}%')).delete(synchronize_session=False)
+    Employee.query.filter(Employee.emp_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.commit()
+
+@contextmanager
+def seeded():
+    """App context with the prefixed developers seeded, removed afterwards"""
+    with app.app_context():
+        cleanup()
+        try:
+            seed_developers()
+            yield
+        finally:
+            cleanup()
+
+def candidate_map(required_skills):
+    return {dev.emp_id: match for dev, match in get_skill_match_candidates(required_skills)
+            if dev.emp_id.startswith(PREFIX)}
+
+def test_set_skills_list_syncs_links():
+    print("\n=== Testing set_skills_list keeps employee_skills in sync ===")
+    with seeded():
+        dev2 = db.session.get(Employee, f'{PREFIX}DEV2')
+        folded = sorted(link.skill.name_folded for link in dev2.skill_links)
+        assert folded == [f'{PREFIX.lower()}beta', f'{PREFIX.lower()}gamma'], folded
+
+        # Same skill in a different case reuses the existing row
+        assert Skill.query.filter(Skill.name_folded.like(f'{PREFIX.lower()}%')).count() == 3
+
+        dev2.set_skills_list([f'{PREFIX}Alpha'])
+        db.session.commit()
+        links = EmployeeSkill.query.filter_by(emp_id=f'{PREFIX}DEV2').all()
+        assert [link.skill.name_folded for link in links] == [f'{PREFIX.lower()}alpha']
+
+        dev2.set_skills_list([f'{PREFIX}BETA', f'{PREFIX}gamma'])
+        db.session.commit()
+        print("[PASS] Links replaced on update, skills de-duplicated by case fold")
+
+def test_case_insensitive_threshold():
+    print("\n=== Testing case-insensitive 50% skill threshold ===")
+    with seeded():
+        matches = candidate_map([f'{PREFIX}alpha', f'{PREFIX}BETA'])
+        # DEV0 2/2, DEV1 1/2, DEV2 1/2; the project manager is never a candidate
+        assert matches == {f'{PREFIX}DEV0': 100.0, f'{PREFIX}DEV1': 50.0, f'{PREFIX}DEV2': 50.0}, matches
+
+        matches = candidate_map([f'{PREFIX}Alpha', f'{PREFIX}Beta', f'{PREFIX}Gamma'])
+        # DEV1 has 1/3 (below 50%) and is dropped
+        assert set(matches) == {f'{PREFIX}DEV0', f'{PREFIX}DEV2'}, matches
+        print(f"[PASS] Candidates: {matches}")
+
+def test_no_skills_gives_default_match():
+    print("\n=== Testing default match when no skills are required ===")
+    with seeded():
+        matches = candidate_map([])
+        assert set(matches) == {f'{PREFIX}DEV0', f'{PREFIX}DEV1', f'{PREFIX}DEV2'}
+        assert set(matches.values()) == {50}
+        print("[PASS] Every developer gets the default 50% match")
+
+def test_single_statement():
+    print("\n=== Testing candidate filter is one SQL statement ===")
+    with seeded():
+        # Warm the in-memory skill index; after that only the developer rows are read
+        get_skill_match_candidates([f'{PREFIX}Alpha'])
+        db.session.expunge_all()
+        with count_queries() as statements:
+            get_skill_match_candidates([f'{PREFIX}Alpha', f'{PREFIX}Beta', 'Python'])
+        assert len(statements) == 1, statements
+        print("[PASS] 1 statement")
+
+if __name__ == "__main__":
+    test_set_skills_list_syncs_links()
+    test_case_insensitive_threshold()
+    test_no_skills_gives_default_match()
+    test_single_statement()
+    print("\nAll skill matching tests passed")
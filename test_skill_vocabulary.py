@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared skill vocabulary (skill_vocabulary.py): canonical keys
+and aliases, integer ids and bitmasks, and the matchers that now compare
+ids -- the skill index, the batch engine and the skills table migration.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from sqlalchemy import text
+from skill_vocabulary import SKILL_ALIASES, SkillVocabulary, canonical_skill, ids_of, mask_of
+from skill_index import SkillIndex
+from assignment_engine import assign_tasks_ml
+from migrations import upgrade
+from test_migrations import make_scratch_engine
+
+def test_canonical_keys_and_ids():
+    print("\n=== Testing canonical keys, ids and bitmasks ===")
+    assert canonical_skill('  React.JS ') == canonical_skill('react') == 'react'
+    assert canonical_skill('Machine   Learning') == 'machine learning'
+    assert canonical_skill('') is None and canonical_skill(None) is None
+    # Canonical keys are fixed points, so re-keying twice changes nothing
+    assert not set(SKILL_ALIASES.values()) & set(SKILL_ALIASES)
+
+    vocabulary = SkillVocabulary()
+    assert vocabulary.ids(['Python', 'SQL', 'python', 'ReactJS', 'React', '']) == (0, 1, 2)
+    assert vocabulary.name(2) == 'ReactJS' and vocabulary.canonical(2) == 'react'
+    assert vocabulary.lookup('React.js') == 2 and vocabulary.lookup('Go') is None
+    assert vocabulary.ids(['Go', 'sql'], add=False) == (1,) and len(vocabulary) == 3
+
+    mask = vocabulary.mask(['React', 'Python'])
+    assert mask == mask_of((0, 2)) == 0b101 and ids_of(mask) == (0, 2) and ids_of(0) == ()
+    # Unknown required skills still count in the denominator
+    assert vocabulary.match_percentage(['python', 'react.js', 'Go'], mask) == (2 / 3) * 100
+    assert vocabulary.match_percentage([], mask) == 0.0
+    print("[PASS] Aliases share one id; bitmasks round-trip")
+
+def test_matchers_use_aliases():
+    print("\n=== Testing skill index and batch engine with aliases ===")
+    index = SkillIndex(max_age=0, vocabulary=SkillVocabulary())
+    index.build([('DEV1', ['React.js', 'Node']), ('DEV2', ['react']), ('DEV3', ['Vue'])])
+    assert index.match(['REACT', 'node.js']) == {'DEV1': 100.0, 'DEV2': 50.0}
+    assert index.skills_of('DEV1') == index.vocabulary.mask(['react', 'nodejs'])
+    index.remove('DEV1')
+    assert index.match(['Node.js']) == {}
+
+    employees = [{'emp_id': 'E1', 'name': 'One', 'skills': ['ReactJS', 'JS'], 'experience': 2,
+                  'success_rate': 50.0, 'tasks_completed': 1},
+                 {'emp_id': 'E2', 'name': 'Two', 'skills': ['Python'], 'experience': 9,
+                  'success_rate': 90.0, 'tasks_completed': 8}]
+    tasks = [{'task_id': 'T1', 'skills': ['React', 'JavaScript'], 'complexity': 'Low', 'priority': 'Low'}]
+    assignment = assign_tasks_ml(tasks, employees, None)['T1']
+    assert assignment['emp_id'] == 'E1' and assignment['skill_match_percentage'] == '100.0%'
+    print("[PASS] 'React.js' and 'react' match the same developers")
+
+def test_migration_merges_alias_rows():
+    print("\n=== Testing canonical_skill_keys migration ===")
+    engine, path = make_scratch_engine()
+    try:
+        upgrade(engine, target=7, verbose=False)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO skills (id, name, name_folded) VALUES "
+                              "(1, 'React', 'react'), (2, 'React.js', 'react.js'), (3, 'k8s', 'k8s')"))
+            conn.execute(text("INSERT INTO employee_skills (emp_id, skill_id) VALUES "
+                              "('DEV1', 1), ('DEV1', 2), ('DEV2', 2), ('DEV3', 3)"))
+        assert upgrade(engine, target=8, verbose=False) == [8]
+        with engine.connect() as conn:
+            skills = conn.execute(text("SELECT id, name, name_folded FROM skills ORDER BY id")).fetchall()
+            links = conn.execute(text("SELECT emp_id, skill_id FROM employee_skills ORDER BY emp_id")).fetchall()
+        assert [tuple(row) for row in skills] == [(1, 'React', 'react'), (3, 'k8s', 'kubernetes')]
+        assert [tuple(row) for row in links] == [('DEV1', 1), ('DEV2', 1), ('DEV3', 3)]
+    finally:
+        engine.dispose()
+        os.remove(path)
+    print("[PASS] Alias rows merged and links moved")
+
+def test_add_and_remove_skill_by_alias():
+    print("\n=== Testing /api/add_skill and /api/remove_skill with aliases ===")
+    from main import app, db, Employee
+
+    emp_id = 'SKVOC_DEV'
+    with app.app_context():
+        try:
+            developer = Employee(emp_id=emp_id, name='Vocabulary Dev', email='skvoc_dev@example.com',
+                                 role='developer')
+            developer.set_password('x')
+            developer.set_skills_list(['React'])
+            db.session.add(developer)
+            db.session.commit()
+
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['emp_id'] = emp_id
+                sess['role'] = 'developer'
+            response = client.post('/api/add_skill', json={'skill': 'react.js'})
+            assert response.status_code == 400 and response.json['error'] == 'Skill already exists'
+            response = client.post('/api/remove_skill', json={'skill': 'ReactJS'})
+            assert response.status_code == 200, response.data
+
+            db.session.expire_all()
+            assert db.session.get(Employee, emp_id).get_skills_list() == []
+        finally:
+            db.session.rollback()
+            Employee.query.filter_by(emp_id=emp_id).delete()
+            db.session.execute(db.text("DELETE FROM employee_skills WHERE emp_id = :e"), {'e': emp_id})
+            db.session.commit()
+    print("[PASS] Alias of an existing skill is a duplicate and removes it")
+
+if __name__ == '__main__':
+    test_canonical_keys_and_ids()
+    test_matchers_use_aliases()
+    test_migration_merges_alias_rows()
+    test_add_and_remove_skill_by_alias()
+    print("\nAll skill vocabulary tests passed")
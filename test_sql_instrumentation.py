@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for per-request SQL instrumentation (sql_instrumentation.py).
+
+Checks statement shape normalization, the Server-Timing header on a real
+main.py route, and the repeated-statement (N+1) warning on a small
+stand-alone app.
+"""
+
+import os
+import sys
+import logging
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sql_instrumentation import init_sql_instrumentation, statement_shape
+
+def test_statement_shape():
+    print("\n=== Testing statement shape normalization ===")
+    a = statement_shape("SELECT * FROM employees WHERE emp_id = 'DEV001' AND age > 30")
+    b = statement_shape("SELECT *  FROM employees\n WHERE emp_id = 'DEV002' AND age > 41")
+    assert a == b == "SELECT * FROM employees WHERE emp_id = ? AND age > ?", a
+    assert statement_shape("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == statement_shape("SELECT 1 FROM t WHERE id IN (?)")
+    print(f"[PASS] {a}")
+
+def test_server_timing_header_on_main_routes():
+    print("\n=== Testing Server-Timing header on main.py ===")
+    from main import app
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['emp_id'] = 'PM001'
+        sess['role'] = 'project manager'
+    response = client.get('/task_management')
+    header = response.headers.get('Server-Timing')
+    assert header and header.startswith('db;dur='), header
+    assert 'queries' in header and 'db-slowest;dur=' in header
+    print(f"[PASS] Server-Timing: {header}")
+
+def make_app(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    init_sql_instrumentation(app)
+    engine = create_engine('sqlite://')
+
+    @app.route('/lookups/<int:n>')
+    def lookups(n):
+        with engine.connect() as conn:
+            for i in range(n):
+                conn.execute(text(f"SELECT {i} AS value")).scalar()
+        return 'ok'
+
+    return app
+
+class ListHandler(logging.Handler):
+    def __init__(self, records, level):
+        super().__init__(level)
+        self.records = records
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+
+def capture_warnings(app):
+    records = []
+    app.logger.addHandler(ListHandler(records, logging.WARNING))
+    return records
+
+def test_repeated_statement_warning():
+    print("\n=== Testing repeated statement warning ===")
+    app = make_app(SQL_WARN_REPEATED=True, SQL_REPEAT_WARN_THRESHOLD=5)
+    warnings = capture_warnings(app)
+    client = app.test_client()
+
+    response = client.get('/lookups/5')
+    assert 'desc="5 queries"' in response.headers['Server-Timing']
+    assert not warnings, warnings
+
+    client.get('/lookups/6')
+    assert len(warnings) == 1 and 'ran 6 times' in warnings[0], warnings
+    print(f"[PASS] {warnings[0]}")
+
+def test_warning_off_outside_debug():
+    print("\n=== Testing repeated statement warning is off by default ===")
+    app = make_app(SQL_REPEAT_WARN_THRESHOLD=5)
+    warnings = capture_warnings(app)
+    app.test_client().get('/lookups/20')
+    assert not warnings, warnings
+    print("[PASS] No warning when not in debug mode")
+
+def test_stats_logged_outside_debug():
+    print("\n=== Testing per-request stats log line ===")
+    lines = []
+    handler = ListHandler(lines, logging.NOTSET)
+    logging.getLogger('sql_stats').addHandler(handler)
+    try:
+        app = make_app(SQL_STATS_LOG_LEVEL='INFO')
+        assert not app.debug and not app.logger.isEnabledFor(logging.INFO)
+        app.test_client().get('/lookups/3')
+        assert len(lines) == 1 and '"query_count": 3' in lines[0], lines
+
+        make_app(SQL_STATS_LOG_LEVEL='WARNING').test_client().get('/lookups/3')
+        assert len(lines) == 1, lines
+    finally:
+        logging.getLogger('sql_stats').removeHandler(handler)
+        logging.getLogger('sql_stats').setLevel(logging.INFO)
+    print(f"[PASS] {lines[0]}")
+
+if __name__ == "__main__":
+    test_statement_shape()
+    test_server_timing_header_on_main_routes()
+    test_repeated_statement_warning()
+    test_warning_off_outside_debug()
+    test_stats_logged_outside_debug()
+    print("\nAll SQL instrumentation tests passed")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test keyset (cursor) pagination of the task listing endpoints
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_engine import use_scratch_database
+
+use_scratch_database()   # before main is imported: keep the tracked task_manager.db untouched
+
+from main import app, db, Employee, Task
+
+PREFIX = 'PAGE_'
+DEV_ID = f'{PREFIX}DEV'
+
+def seed_tasks(count):
+    """Create tasks with duplicate and missing created_at values"""
+    base = datetime(2025, 1, 1)
+    developer = Employee(emp_id=DEV_ID, name='Pagination Dev', email='pagination.dev@example.com', role='developer')
+    developer.set_password('x')
+    db.session.add(developer)
+    for i in range(count):
+        # Every 3 tasks share a timestamp; every 10th task is undated
+        created_at = None if i % 10 == 0 else base + timedelta(minutes=i // 3)
+        db.session.add(Task(task_id=f'{PREFIX}{i:04d}', title=f'Page task {i}', project_type='website_development',
+                            status='assigned', assigned_to=DEV_ID, created_at=created_at))
+    db.session.commit()
+
+def cleanup():
+    Task.query.filter(Task.task_id.like(f'{PREFIX}%')).delete(synchronize_session=False)
+    db.session.execute(db.text("DELETE FROM employee_workload WHERE emp_id = :e"), {'e': DEV_ID})
+    Employee.query.filter_by(emp_id=DEV_ID).delete(synchronize_session=False)
+    db.session.commit()
+
+def expected_order():
+    tasks = Task.query.filter_by(assigned_to=DEV_ID).all()
+    dated = sorted([t for t in tasks if t.created_at], key=lambda t: (t.created_at, t.task_id), reverse=True)
+    undated = sorted([t for t in tasks if not t.created_at], key=lambda t: t.task_id, reverse=True)
+    return [t.task_id for t in dated + undated]
+
+def test_api_pages_cover_every_task_once():
+    print("=== Testing /api/task-service/tasks keyset pages ===")
+    client = app.test_client()
+    try:
+        with app.app_context():
+            cleanup()
+            seed_tasks(130)
+            expected = expected_order()
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {'emp_id': DEV_ID, 'limit': 25}
+            if cursor:
+                params['cursor'] = cursor
+            data = client.get('/api/task-service/tasks', query_string=params).get_json()
+            assert data['success'], data
+            assert data['count'] <= 25
+            seen.extend(task['task_id'] for task in data['tasks'])
+            pages += 1
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        print(f"Fetched {len(seen)} tasks in {pages} pages")
+        assert seen == expected
+        print("[PASS] Pages are complete, ordered and non-overlapping")
+    finally:
+        with app.app_context():
+            cleanup()
+
+def test_invalid_cursor_rejected():
+    print("\n=== Testing invalid cursor ===")
+    client = app.test_client()
+    response = client.get('/api/task-service/tasks', query_string={'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
+    print("[PASS] Malformed cursor returns 400")
+
+def test_my_tasks_load_more():
+    print("\n=== Testing /my_tasks load more ===")
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['emp_id'] = DEV_ID
+        sess['role'] = 'developer'
+    try:
+        with app.app_context():
+            cleanup()
+            seed_tasks(30)
+        html = client.get('/my_tasks', query_string={'limit': 20}).get_data(as_text=True)
+        assert 'id="loadMoreTasks"' in html
+        html = client.get('/my_tasks', query_string={'limit': 40}).get_data(as_text=True)
+        assert 'id="loadMoreTasks"' not in html
+        print("[PASS] Load more button shown only when another page exists")
+    finally:
+        with app.app_context():
+            cleanup()
+
+if __name__ == "__main__":
+    test_api_pages_cover_every_task_once()
+    test_invalid_cursor_rejected()
+    test_my_tasks_load_more()
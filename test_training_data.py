@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized synthetic training history (training_data.py):
+the incidence-matrix version must produce exactly the rows, in the same
+order, that the previous nested iterrows() loop in build_assignment_model
+produced.
+"""
+
+import os
+import sys
+import random
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from training_data import FEATURE_COLUMNS, HISTORY_COLUMNS, synthetic_history
+
+SKILLS = ['Python', 'SQL', 'Docker', 'React', 'AWS', 'Spark', 'NLP', 'CSS', 'Kubernetes', 'ETL']
+LEVELS = ['Low', 'Medium', 'High']
+
+
+def reference_history(employees_df, tasks_df):
+    """The previous loop from build_assignment_model, kept for comparison"""
+    historical_assignments = []
+    for _, task in tasks_df.iterrows():
+        task_skills = set(task['skills'])
+        for idx, emp_row in employees_df.iterrows():
+            emp_skills = set(emp_row['skills'])
+            skill_match = len(task_skills.intersection(emp_skills)) / len(task_skills) if task_skills else 0
+            if skill_match == 0:
+                continue
+            historical_assignments.append({
+                "task_id": task['task_id'],
+                "emp_id": emp_row['emp_id'],
+                "project_type": task['project_type'],
+                "complexity": 0 if task['complexity'] == "Low" else 1 if task['complexity'] == "Medium" else 2,
+                "priority": 0 if task['priority'] == "Low" else 1 if task['priority'] == "Medium" else 2,
+                "skill_match_percentage": skill_match * 100,
+                "experience": emp_row.get('experience', 0),
+                "success_rate": emp_row.get('success_rate', 0.0),
+                "tasks_completed": emp_row.get('tasks_completed', 0)
+            })
+    return pd.DataFrame(historical_assignments)
+
+
+def make_fixture(seed, employee_count=60, task_count=25):
+    rng = random.Random(seed)
+    employees = []
+    for i in range(employee_count):
+        employee = {'emp_id': f'EMP{i:03d}', 'skills': rng.sample(SKILLS, rng.randint(0, 4)),
+                    'experience': rng.randint(0, 15), 'success_rate': rng.choice([0.0, 60.0, 95.0]),
+                    'tasks_completed': rng.randint(0, 40)}
+        if i % 17 == 5:
+            del employee['experience']   # missing key -> NaN in the DataFrame
+        employees.append(employee)
+    employees.append(dict(employees[3]))  # duplicate employee row
+    employees_df = pd.DataFrame(employees)
+
+    tasks = [{'task_id': f'TASK{1000 + i}', 'project_type': rng.choice(['web', 'data', 'ops']),
+              'skills': rng.sample(SKILLS, rng.randint(1, 4)),
+              'complexity': rng.choice(LEVELS), 'priority': rng.choice(LEVELS)}
+             for i in range(task_count)]
+    tasks.append({'task_id': 'TASK9999', 'project_type': 'ml', 'skills': ['Python', 'Rust'],
+                  'complexity': 'High', 'priority': 'Low'})  # skill no employee has
+    return employees_df, pd.DataFrame(tasks)
+
+
+def test_matches_reference():
+    print("\n=== Testing vectorized history against the iterrows loop ===")
+    for seed in range(5):
+        employees_df, tasks_df = make_fixture(seed)
+        expected = reference_history(employees_df, tasks_df)
+        actual = synthetic_history(employees_df, tasks_df)
+        assert list(actual.columns) == HISTORY_COLUMNS
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected[HISTORY_COLUMNS],
+                                      check_dtype=False)
+        assert np.isnan(actual['experience'].astype(float)).any()
+    print(f"[PASS] Same rows and order for 5 fixtures ({len(actual)} rows in the last)")
+
+
+def test_edge_cases():
+    print("\n=== Testing history edge cases ===")
+    employees_df, tasks_df = make_fixture(1)
+    no_skills = employees_df.assign(skills=[[] for _ in range(len(employees_df))])
+    assert synthetic_history(no_skills, tasks_df).empty
+    assert synthetic_history(employees_df, tasks_df.iloc[:0]).empty
+
+    # Attribute columns missing entirely fall back to the defaults
+    bare = employees_df[['emp_id', 'skills']]
+    history = synthetic_history(bare, tasks_df)
+    assert (history['experience'] == 0).all() and (history['success_rate'] == 0.0).all()
+    assert list(history[FEATURE_COLUMNS].columns) == FEATURE_COLUMNS
+    print("[PASS] Empty inputs and missing columns handled")
+
+
+if __name__ == '__main__':
+    test_matches_reference()
+    test_edge_cases()
+    print("\nAll training data tests passed")
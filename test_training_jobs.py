@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for background model training (training_jobs.py): one job at a time,
+status/progress reporting, failures recorded on the job, and the previous
+model kept live in the registry until the new version is published, and
+job state shared between workers through a state directory.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model_registry import ModelRegistry
+from training_jobs import TrainingJobs
+
+def test_single_flight_and_status():
+    print("\n=== Testing single-flight training job ===")
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        registry.publish({'model': 'old', 'feature_columns': []})
+        release, running = threading.Event(), threading.Event()
+        calls = []
+
+        def train(report):
+            calls.append(1)
+            report('training', 0.5)
+            running.set()
+            release.wait(5)
+            return registry.publish({'model': 'new', 'feature_columns': []})['version']
+
+        jobs = TrainingJobs()
+        job, started = jobs.submit(train, reason='api')
+        again, started_again = jobs.submit(train, reason='no_model')
+        assert started and not started_again and again is job
+
+        # Still serving the old model while training runs
+        assert running.wait(5)
+        status = job.to_dict()
+        assert status['status'] == 'running' and status['progress'] == 0.5
+        assert status['duration_seconds'] is not None and status['finished_at'] is None
+        assert registry.load()['model'] == 'old'
+
+        release.set()
+        assert job.wait(5)
+        status = jobs.get(job.job_id).to_dict()
+        assert status['status'] == 'succeeded' and status['progress'] == 1.0
+        assert status['version'] == registry.current_version()
+        assert registry.load()['model'] == 'new' and calls == [1]
+        assert jobs.active_job() is None
+
+        # A finished job does not block the next one
+        next_job, started = jobs.submit(lambda report: 'v2')
+        assert started and next_job.wait(5) and next_job.version == 'v2'
+        print(f"[PASS] One training for two submits, took {status['duration_seconds']}s")
+
+def test_single_flight_per_kind():
+    print("\n=== Testing single-flight per job kind ===")
+    release, order = threading.Event(), []
+
+    def learn(report):
+        release.wait(5)
+        order.append('outcomes')
+        return 'v-outcomes'
+
+    def train(report):
+        order.append('train')
+        return 'v-train'
+
+    jobs = TrainingJobs()
+    update, _ = jobs.submit(learn, reason='outcomes', kind='outcomes')
+    retrain, started = jobs.submit(train, reason='api', kind='train')
+    # A retrain is not answered with the running outcome update: it gets its own job, queued behind it
+    assert started and retrain is not update
+    assert retrain.to_dict()['kind'] == 'train' and update.to_dict()['kind'] == 'outcomes'
+    assert jobs.active_job('outcomes') is update and jobs.active_job('train') is retrain
+    assert jobs.submit(train, kind='train') == (retrain, False)
+
+    release.set()
+    assert retrain.wait(5) and update.wait(5)
+    assert order == ['outcomes', 'train'] and retrain.version == 'v-train'
+    print("[PASS] Each kind has its own job; a second kind queues behind the first")
+
+def test_failed_job():
+    print("\n=== Testing failed training job ===")
+    jobs = TrainingJobs()
+
+    def train(report):
+        report('fetching_employees', 0.05)
+        raise RuntimeError("Could not fetch employees data")
+
+    job, _ = jobs.submit(train)
+    assert job.wait(5)
+    status = job.to_dict()
+    assert status['status'] == 'failed' and status['stage'] == 'fetching_employees'
+    assert status['error'] == "Could not fetch employees data" and status['version'] is None
+    assert jobs.get('missing') is None
+    print("[PASS] Failure recorded on the job")
+
+def test_shared_state_between_workers():
+    print("\n=== Testing job state shared through a state directory ===")
+    with tempfile.TemporaryDirectory() as state_dir:
+        # Two TrainingJobs on one directory stand in for two worker processes
+        first, second = TrainingJobs(state_dir), TrainingJobs(state_dir)
+        release, running = threading.Event(), threading.Event()
+        calls = []
+
+        def train(report):
+            calls.append(1)
+            report('training', 0.5)
+            running.set()
+            release.wait(5)
+            return 'v-shared'
+
+        job, started = first.submit(train, reason='api')
+        assert started and running.wait(5)
+        other, started_other = second.submit(train, reason='no_model')
+        assert not started_other and other.job_id == job.job_id and other is not job
+        assert second.get(job.job_id).to_dict()['progress'] == 0.5
+        assert second.submit(lambda report: 'v-outcomes', kind='outcomes')[1]
+
+        assert not other.wait(0.1)
+        release.set()
+        assert other.wait(5) and other.status == 'succeeded' and other.version == 'v-shared'
+        assert second.get(job.job_id).to_dict()['duration_seconds'] == job.duration_seconds()
+        assert calls == [1] and second.active_job() is None
+
+        # A job left running by a worker that exited does not block the kind
+        with open(os.path.join(state_dir, 'stale.json'), 'w') as f:
+            json.dump(dict(job.to_dict(), job_id='stale', status='running', pid=2 ** 22 + 1), f)
+        with open(os.path.join(state_dir, 'train.active'), 'w') as f:
+            f.write('stale')
+        assert second.get('stale').status == 'failed' and second.active_job() is None
+        next_job, started = second.submit(lambda report: 'v-next')
+        assert started and next_job.wait(5)
+        assert second.get('missing') is None and second.get('../train') is None
+    print("[PASS] A second worker sees the running job, waits for it and does not train again")
+
+if __name__ == '__main__':
+    test_single_flight_and_status()
+    test_single_flight_per_kind()
+    test_failed_job()
+    test_shared_state_between_workers()
+    print("\nAll training job tests passed")
@@ -0,0 +1,139 @@
+# training_data.py
+"""
+Synthetic assignment history for training the task assignment model.
+
+Every (task, employee) pair that shares at least one skill becomes one
+training row whose label is the employee. Skills are compared by their
+skill_vocabulary ids, and pairs are found with 0/1 skill incidence
+matrices: tasks (T x S) times employees transposed (S x E) gives the
+shared-skill count for every pair at once, and the feature columns are
+gathered from per-employee arrays with the nonzero pair indices. Rows come
+out task-major in employee order, the same order the previous nested
+iterrows() loop produced, so train_test_split(random_state=42) picks the
+same training rows.
+
+build_assignment_model fits the service's RandomForest on that history; it
+lives here so it can be trained and benchmarked without the service app.
+"""
+
+import os
+
+import numpy as np
+
+from skill_vocabulary import VOCABULARY
+
+FEATURE_COLUMNS = ['complexity', 'priority', 'skill_match_percentage',
+                   'experience', 'success_rate', 'tasks_completed']
+HISTORY_COLUMNS = ['task_id', 'emp_id', 'project_type'] + FEATURE_COLUMNS
+LEVEL_CODES = {'Low': 0, 'Medium': 1}  # anything else is High (2)
+
+# Cores used to fit the RandomForest (-1 = all)
+MODEL_TRAINING_JOBS = int(os.environ.get('MODEL_TRAINING_JOBS', -1))
+MODEL_TREES = 100
+
+
+def level_codes(values):
+    return np.array([LEVEL_CODES.get(value, 2) for value in values], dtype=np.int64)
+
+
+def skill_incidence(skill_sets, columns):
+    """0/1 matrix (len(skill_sets) x len(columns)) of skill id sets; ids outside columns are ignored"""
+    rows, cols = [], []
+    for row, skill_ids in enumerate(skill_sets):
+        for skill_id in skill_ids:
+            col = columns.get(skill_id)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    matrix = np.zeros((len(skill_sets), len(columns)), dtype=np.float32)
+    matrix[rows, cols] = 1.0
+    return matrix
+
+
+def employee_column(employees_df, name, default):
+    if name in employees_df.columns:
+        return employees_df[name].to_numpy()
+    return np.full(len(employees_df), default)
+
+
+def synthetic_history(employees_df, tasks_df):
+    """One row per (task, employee) pair with a skill in common (HISTORY_COLUMNS)"""
+    import pandas as pd
+    employee_skills = [VOCABULARY.ids(skills) if isinstance(skills, list) else ()
+                       for skills in employees_df['skills']]
+    columns = {}
+    for skill_ids in employee_skills:
+        for skill_id in skill_ids:
+            columns.setdefault(skill_id, len(columns))
+    task_skills = [VOCABULARY.ids(skills, add=False) for skills in tasks_df['skills']]
+
+    if not columns or not task_skills:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+    # Shared-skill counts for every pair; exact in float32 (counts are small)
+    shared = skill_incidence(task_skills, columns) @ skill_incidence(employee_skills, columns).T
+    task_rows, emp_rows = np.nonzero(shared)
+    # Distinct required skills, including ones no employee has
+    task_sizes = np.array([len(VOCABULARY.keys(skills)) for skills in tasks_df['skills']], dtype=np.float64)
+    skill_match = shared[task_rows, emp_rows].astype(np.float64) / task_sizes[task_rows]
+
+    return pd.DataFrame({
+        'task_id': tasks_df['task_id'].to_numpy()[task_rows],
+        'emp_id': employees_df['emp_id'].to_numpy()[emp_rows],
+        'project_type': tasks_df['project_type'].to_numpy()[task_rows],
+        'complexity': level_codes(tasks_df['complexity'])[task_rows],
+        'priority': level_codes(tasks_df['priority'])[task_rows],
+        'skill_match_percentage': skill_match * 100,
+        'experience': employee_column(employees_df, 'experience', 0)[emp_rows],
+        'success_rate': employee_column(employees_df, 'success_rate', 0.0)[emp_rows],
+        'tasks_completed': employee_column(employees_df, 'tasks_completed', 0)[emp_rows],
+    }, columns=HISTORY_COLUMNS)
+
+
+def build_assignment_model(employees, tasks_df, trees=MODEL_TREES, n_jobs=None):
+    """Build the ML model for task assignment (n_jobs defaults to MODEL_TRAINING_JOBS)"""
+    import pandas as pd
+    # Process employees
+    if not employees:
+        return {'model': None, 'feature_columns': []}
+        
+    # Convert to DataFrame or ensure it's a DataFrame
+    if isinstance(employees, list):
+        employees_df = pd.DataFrame(employees)
+    else:
+        employees_df = employees
+    
+    # Convert skills to string lists if they're not already
+    employees_df['skills'] = employees_df['skills'].apply(
+        lambda x: x if isinstance(x, list) else []
+    )
+    
+    # Generate synthetic historical assignments (skill incidence matrices)
+    historical_df = synthetic_history(employees_df, tasks_df)
+    
+    if historical_df.empty:
+        print("Error: No valid assignments generated")
+        return {'model': None, 'feature_columns': []}
+        
+    # Prepare features and target
+    feature_cols = list(FEATURE_COLUMNS)
+    
+    X = historical_df[feature_cols]
+    y = historical_df["emp_id"]
+    
+    # Imported here so that importing this module does not load scikit-learn
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+    
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    
+    # Train model
+    model = RandomForestClassifier(n_estimators=trees, random_state=42,
+                                   n_jobs=MODEL_TRAINING_JOBS if n_jobs is None else n_jobs)
+    model.fit(X_train, y_train)
+    
+    return {
+        'model': model,
+        'feature_columns': feature_cols
+    }
@@ -0,0 +1,266 @@
+# training_jobs.py
+"""
+Background model training with single-flight semantics.
+
+``TrainingJobs.submit(train, kind=...)`` runs train(report) on a one-thread
+executor and returns a TrainingJob right away. While a job of that kind is
+queued or running, further submits of the same kind return that job instead
+of starting another, so a burst of retrain calls (or of requests that find
+no model) trains the model once. A job of another kind is never handed out
+in its place: it gets its own job, queued behind the running one. train
+reports progress through report(stage, fraction) and returns the published
+model version; an exception marks the job failed.
+
+Requests keep using the model that is live in the registry until train
+publishes a new version, so serving never waits on a running job unless it
+explicitly calls job.wait(). Finished jobs are kept (newest
+MAX_FINISHED_JOBS) so their status can still be read.
+
+Without a state_dir jobs are tracked per process. With one, every job is
+also written to state_dir/<job_id>.json, and the job currently holding a
+kind is recorded in state_dir/<kind>.active under an fcntl lock, so several
+worker processes sharing the directory see each other's jobs (get() returns
+a read-only snapshot of another worker's job) and still train once per
+kind. A job whose worker process is gone no longer counts as active.
+"""
+
+import os
+import json
+import time
+import uuid
+import fcntl
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_FINISHED_JOBS = 20
+# How often wait() re-reads the state file of another worker's job
+SNAPSHOT_POLL_SECONDS = 0.2
+
+
+class TrainingJob:
+    """Status of one training run"""
+
+    def __init__(self, reason=None, kind='train'):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.reason = reason
+        self.status = 'queued'        # queued, running, succeeded, failed
+        self.stage = 'queued'
+        self.progress = 0.0
+        self.version = None
+        self.error = None
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self._started = None
+        self._duration = None
+        self.pid = os.getpid()
+        self._done = threading.Event()
+        self._save = None             # set by TrainingJobs when job state is shared
+        self._path = None             # state file of a snapshot of another worker's job
+
+    @classmethod
+    def snapshot(cls, path):
+        """Read-only copy of the job stored at path; None if it is missing or unreadable"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        job = cls(data.get('reason'), data.get('kind', 'train'))
+        for key in ('job_id', 'status', 'stage', 'progress', 'version', 'error', 'pid'):
+            setattr(job, key, data.get(key))
+        for key in ('created_at', 'started_at', 'finished_at'):
+            setattr(job, key, datetime.fromisoformat(data[key]) if data.get(key) else None)
+        job._duration = data.get('duration_seconds')
+        job._path = path
+        if job.active and not _process_alive(job.pid):
+            job.status = 'failed'
+            job.error = 'Worker process exited before the job finished'
+        if not job.active:
+            job._done.set()
+        return job
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    def report(self, stage, fraction=None):
+        self.stage = stage
+        if fraction is not None:
+            self.progress = max(0.0, min(1.0, float(fraction)))
+        if self._save is not None:
+            self._save(self)
+
+    def wait(self, timeout=None):
+        """Block until the job finished (or timeout); returns True if it did.
+
+        A snapshot of another worker's job polls its state file.
+        """
+        if self._path is None:
+            return self._done.wait(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            latest = TrainingJob.snapshot(self._path)
+            if latest is not None:
+                self.__dict__.update({key: value for key, value in latest.__dict__.items()
+                                      if key != '_done'})
+            if latest is None or not self.active:
+                self._done.set()
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(SNAPSHOT_POLL_SECONDS)
+
+    def duration_seconds(self):
+        if self._started is None:
+            return self._duration
+        if self._duration is not None:
+            return self._duration
+        return round(time.monotonic() - self._started, 3)
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'reason': self.reason,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress, 3),
+            'version': self.version,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds()
+        }
+
+
+def _process_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class TrainingJobs:
+    """One background training at a time (single-flight per kind), plus recent jobs"""
+
+    def __init__(self, state_dir=None):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-training')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._active = {}     # kind -> latest job of that kind
+        self.state_dir = state_dir
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def submit(self, train, reason=None, kind='train'):
+        """Start train(report) in the background; returns (job, started).
+
+        started is False when an earlier job of the same kind is still
+        queued or running (in any worker sharing state_dir); that job is
+        returned instead and train is not called.
+        """
+        with self._lock, self._kind_lock(kind):
+            active = self.active_job(kind)
+            if active is not None:
+                return active, False
+            job = TrainingJob(reason, kind)
+            self._jobs[job.job_id] = job
+            self._active[kind] = job
+            if self.state_dir:
+                job._save = self._save
+                self._save(job)
+                self._write_file(self._active_path(kind), job.job_id)
+            self._prune()
+        self._executor.submit(self._run, job, train)
+        return job, True
+
+    def _run(self, job, train):
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        job._started = time.monotonic()
+        job.report('starting', 0.0)
+        try:
+            job.version = train(job.report)
+            job.stage, job.progress = 'done', 1.0
+            status = 'succeeded'
+        except Exception as e:
+            print(f"Model training job {job.job_id} failed: {str(e)}")
+            job.error = str(e)
+            status = 'failed'
+        # Everything else is filled in before the status says finished
+        job.finished_at = datetime.utcnow()
+        job._duration = round(time.monotonic() - job._started, 3)
+        job.status = status
+        if job._save is not None:
+            job._save(job)
+        job._done.set()
+
+    def get(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None and self.state_dir and job_id.isalnum():
+            job = TrainingJob.snapshot(self._job_path(job_id))
+        return job
+
+    def active_job(self, kind='train'):
+        job = self._active.get(kind)
+        if job is not None and job.active:
+            return job
+        if not self.state_dir:
+            return None
+        try:
+            with open(self._active_path(kind)) as f:
+                job_id = f.read().strip()
+        except OSError:
+            return None
+        job = self.get(job_id) if job_id else None
+        return job if job is not None and job.active else None
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if not job.active]
+        for job in sorted(finished, key=lambda job: job.created_at)[:-MAX_FINISHED_JOBS]:
+            del self._jobs[job.job_id]
+            if self.state_dir:
+                try:
+                    os.remove(self._job_path(job.job_id))
+                except OSError:
+                    pass
+
+    def _job_path(self, job_id):
+        return os.path.join(self.state_dir, f'{job_id}.json')
+
+    def _active_path(self, kind):
+        return os.path.join(self.state_dir, f'{kind}.active')
+
+    @contextmanager
+    def _kind_lock(self, kind):
+        """Exclusive lock across processes for submitting a job of this kind"""
+        if not self.state_dir:
+            yield
+            return
+        with open(os.path.join(self.state_dir, f'{kind}.lock'), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _save(self, job):
+        data = job.to_dict()
+        data['pid'] = job.pid
+        self._write_file(self._job_path(job.job_id), json.dumps(data))
+
+    def _write_file(self, path, content):
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
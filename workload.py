@@ -0,0 +1,147 @@
+# workload.py
+"""
+Denormalized per-employee task counters (the ``employee_workload`` table).
+
+The dashboard and the recommender need "how many tasks does this developer
+have in each status" on every request. Instead of COUNT queries over tasks,
+main.py keeps one row per employee up to date from a before_flush hook, so
+the counters change in the same transaction as the task status itself.
+``reconcile_workload`` rebuilds them from the tasks table and reports drift,
+e.g. after rows were changed with raw SQL or bulk updates.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import text
+
+# Task status -> counter column. Other statuses are not counted.
+WORKLOAD_COLUMNS = {
+    'assigned': 'assigned_count',
+    'in_progress': 'in_progress_count',
+    'submitted': 'submitted_count',
+    'completed': 'completed_count',
+}
+
+# Statuses that count towards the 3-active-task limit
+ACTIVE_STATUSES = ('assigned', 'in_progress')
+
+
+def empty_workload():
+    return {status: 0 for status in WORKLOAD_COLUMNS}
+
+
+def create_workload_table(conn):
+    """Create the employee_workload table if it does not exist"""
+    conn.execute(text('''
+        CREATE TABLE IF NOT EXISTS employee_workload (
+            emp_id VARCHAR(50) PRIMARY KEY,
+            assigned_count INTEGER NOT NULL DEFAULT 0,
+            in_progress_count INTEGER NOT NULL DEFAULT 0,
+            submitted_count INTEGER NOT NULL DEFAULT 0,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME,
+            FOREIGN KEY (emp_id) REFERENCES employees (emp_id)
+        )
+    '''))
+
+
+def count_workload_from_tasks(conn, emp_id=None):
+    """Return {emp_id: {status: count}} computed from the tasks table"""
+    sql = (
+        "SELECT t.assigned_to, t.status, count(*) FROM tasks t "
+        "JOIN employees e ON e.emp_id = t.assigned_to "
+        "WHERE t.status IN ('assigned', 'in_progress', 'submitted', 'completed')"
+    )
+    params = {}
+    if emp_id is not None:
+        sql += " AND t.assigned_to = :emp_id"
+        params['emp_id'] = emp_id
+    sql += " GROUP BY t.assigned_to, t.status"
+
+    workload = {}
+    for assigned_to, status, count in conn.execute(text(sql), params):
+        workload.setdefault(assigned_to, empty_workload())[status] = count
+    return workload
+
+
+def read_workload(conn, emp_id=None):
+    """Return {emp_id: {status: count}} as stored in employee_workload"""
+    columns = ', '.join(WORKLOAD_COLUMNS.values())
+    sql = f"SELECT emp_id, {columns} FROM employee_workload"
+    params = {}
+    if emp_id is not None:
+        sql += " WHERE emp_id = :emp_id"
+        params['emp_id'] = emp_id
+
+    return {
+        row[0]: dict(zip(WORKLOAD_COLUMNS, row[1:]))
+        for row in conn.execute(text(sql), params)
+    }
+
+
+def get_workload(conn, emp_id):
+    """Stored counters for one employee (all zero if the employee has no row)"""
+    return read_workload(conn, emp_id).get(emp_id, empty_workload())
+
+
+def apply_workload_deltas(conn, deltas):
+    """Add {emp_id: {status: delta}} to the stored counters.
+
+    Increments are done in SQL (col = col + :delta) so concurrent
+    transactions never overwrite each other's changes.
+    """
+    now = datetime.utcnow()
+    for emp_id, changes in deltas.items():
+        changes = {status: delta for status, delta in changes.items()
+                   if status in WORKLOAD_COLUMNS and delta}
+        if not emp_id or not changes:
+            continue
+
+        conn.execute(
+            text("INSERT INTO employee_workload (emp_id, updated_at) VALUES (:emp_id, :now) "
+                 "ON CONFLICT (emp_id) DO NOTHING"),
+            {'emp_id': emp_id, 'now': now}
+        )
+        assignments = ', '.join(
+            f"{WORKLOAD_COLUMNS[status]} = {WORKLOAD_COLUMNS[status]} + :{status}" for status in changes
+        )
+        conn.execute(
+            text(f"UPDATE employee_workload SET {assignments}, updated_at = :now WHERE emp_id = :emp_id"),
+            dict(changes, emp_id=emp_id, now=now)
+        )
+
+
+def reconcile_workload(conn, emp_id=None, apply=True):
+    """Rebuild counters from the tasks table; return the drift that was found.
+
+    Each drift entry is {'emp_id', 'status', 'stored', 'actual'}. With
+    apply=False the table is left untouched (report only).
+    """
+    actual = count_workload_from_tasks(conn, emp_id)
+    stored = read_workload(conn, emp_id)
+
+    drift = []
+    for employee in sorted(set(actual) | set(stored)):
+        actual_counts = actual.get(employee, empty_workload())
+        stored_counts = stored.get(employee, empty_workload())
+        for status in WORKLOAD_COLUMNS:
+            if actual_counts[status] != stored_counts[status]:
+                drift.append({'emp_id': employee, 'status': status,
+                              'stored': stored_counts[status], 'actual': actual_counts[status]})
+
+    if apply:
+        if emp_id is None:
+            conn.execute(text("DELETE FROM employee_workload"))
+        else:
+            conn.execute(text("DELETE FROM employee_workload WHERE emp_id = :emp_id"), {'emp_id': emp_id})
+        now = datetime.utcnow()
+        rows = [dict(counts, emp_id=employee, now=now) for employee, counts in actual.items()]
+        if rows:
+            conn.execute(
+                text("INSERT INTO employee_workload (emp_id, assigned_count, in_progress_count, "
+                     "submitted_count, completed_count, updated_at) "
+                     "VALUES (:emp_id, :assigned, :in_progress, :submitted, :completed, :now)"),
+                rows
+            )
+
+    return drift